@@ -65,6 +65,7 @@ import app.domains.xactimate.models
 
 # Analytics
 import app.domains.analytics.models
+import app.domains.dashboard.models
 
 # Material detection (conditional)
 try:
@@ -0,0 +1,59 @@
+"""Add dashboard daily rollups table
+
+Revision ID: 6a8ea39b6f61
+Revises: b662310f1380
+Create Date: 2026-10-18 21:05:12.481377
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '6a8ea39b6f61'
+down_revision = 'b662310f1380'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Check if dashboard_daily_rollups table exists (idempotent migration)
+    result = conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = 'dashboard_daily_rollups')"
+    ))
+    rollups_exists = result.scalar()
+
+    if not rollups_exists:
+        op.create_table(
+            'dashboard_daily_rollups',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('company_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('rollup_date', sa.Date(), nullable=False),
+            sa.Column('metric', sa.String(50), nullable=False),
+            sa.Column('status', sa.String(50), nullable=False, server_default=''),
+            sa.Column('document_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('total_amount', sa.DECIMAL(15, 2), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime()),
+            sa.UniqueConstraint(
+                'company_id', 'rollup_date', 'metric', 'status',
+                name='uq_dashboard_rollup_key'
+            )
+        )
+        op.create_index(
+            'ix_dashboard_rollup_metric_date',
+            'dashboard_daily_rollups',
+            ['metric', 'rollup_date']
+        )
+
+    # Rollups start empty. Dashboards keep scanning documents until a full
+    # rebuild has been recorded; backfill with:
+    #   python rebuild_dashboard_rollups.py
+    # or POST /api/dashboard/rollups/rebuild
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dashboard_rollup_metric_date', table_name='dashboard_daily_rollups')
+    op.drop_table('dashboard_daily_rollups')
@@ -0,0 +1,55 @@
+"""Add credit and payment dashboard indexes
+
+Revision ID: c4e91d2a7b58
+Revises: 6a8ea39b6f61
+Create Date: 2026-10-18 22:14:37.902518
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c4e91d2a7b58'
+down_revision = '6a8ea39b6f61'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, covering columns)
+DASHBOARD_INDEXES = [
+    ('ix_customer_credits_company_status', 'customer_credits',
+     ['company_id', 'status', 'issued_date', 'expiry_date'], ['amount']),
+    ('ix_discount_rules_company_active', 'discount_rules',
+     ['company_id', 'is_active'], []),
+    ('ix_applied_discounts_rule_date', 'applied_discounts',
+     ['discount_rule_id', 'applied_date'], ['discount_amount', 'discount_code_used']),
+    ('ix_payments_company_status_date', 'payments',
+     ['company_id', 'status', 'payment_date'], ['amount', 'payment_method']),
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Helper function to safely create index (idempotent migration)
+    def safe_create_index(index_name, table_name, columns, include):
+        result = conn.execute(sa.text(
+            "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
+            "WHERE table_name = :table_name)"
+        ), {"table_name": table_name})
+        if not result.scalar():
+            return
+        result = conn.execute(sa.text(
+            "SELECT EXISTS (SELECT 1 FROM pg_indexes "
+            "WHERE indexname = :index_name AND tablename = :table_name)"
+        ), {"index_name": index_name, "table_name": table_name})
+        if not result.scalar():
+            op.create_index(index_name, table_name, columns, postgresql_include=include)
+
+    for index_name, table_name, columns, include in DASHBOARD_INDEXES:
+        safe_create_index(index_name, table_name, columns, include)
+
+
+def downgrade() -> None:
+    for index_name, table_name, _, _ in reversed(DASHBOARD_INDEXES):
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
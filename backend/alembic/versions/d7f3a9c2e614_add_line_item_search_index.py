@@ -0,0 +1,72 @@
+"""Add line item full-text search index
+
+Revision ID: d7f3a9c2e614
+Revises: c4e91d2a7b58
+Create Date: 2026-10-18 23:02:51.117403
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd7f3a9c2e614'
+down_revision = 'c4e91d2a7b58'
+branch_labels = None
+depends_on = None
+
+
+# Codes rank above descriptions, descriptions above the work description.
+# The 'simple' configuration keeps item codes and trade abbreviations intact.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(cat, '') || ' ' || coalesce(item, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(includes, '')), 'C')"
+)
+
+# (index name, index definition)
+SEARCH_INDEXES = [
+    ('ix_line_items_search_vector',
+     "CREATE INDEX ix_line_items_search_vector ON line_items USING gin (search_vector)"),
+    ('ix_line_items_item_trgm',
+     "CREATE INDEX ix_line_items_item_trgm ON line_items USING gin (item gin_trgm_ops)"),
+    ('ix_line_items_description_trgm',
+     "CREATE INDEX ix_line_items_description_trgm ON line_items USING gin (description gin_trgm_ops)"),
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Check if line_items table exists (idempotent migration)
+    result = conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = 'line_items')"
+    ))
+    if not result.scalar():
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    result = conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'line_items' AND column_name = 'search_vector')"
+    ))
+    if not result.scalar():
+        op.execute(
+            "ALTER TABLE line_items ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+        )
+
+    for index_name, definition in SEARCH_INDEXES:
+        result = conn.execute(sa.text(
+            "SELECT EXISTS (SELECT 1 FROM pg_indexes "
+            "WHERE indexname = :index_name AND tablename = 'line_items')"
+        ), {"index_name": index_name})
+        if not result.scalar():
+            op.execute(definition)
+
+
+def downgrade() -> None:
+    for index_name, _ in reversed(SEARCH_INDEXES):
+        op.drop_index(index_name, table_name='line_items', if_exists=True)
+    op.execute("ALTER TABLE line_items DROP COLUMN IF EXISTS search_vector")
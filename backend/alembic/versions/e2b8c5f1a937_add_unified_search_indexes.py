@@ -0,0 +1,52 @@
+"""Add unified search indexes for xactimate items
+
+Revision ID: e2b8c5f1a937
+Revises: d7f3a9c2e614
+Create Date: 2026-10-18 23:48:09.530127
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e2b8c5f1a937'
+down_revision = 'd7f3a9c2e614'
+branch_labels = None
+depends_on = None
+
+
+# (index name, index definition)
+UNIFIED_SEARCH_INDEXES = [
+    ('idx_xactimate_items_cat_item',
+     "CREATE INDEX idx_xactimate_items_cat_item ON xactimate_items (category_code, item_code)"),
+    ('ix_xactimate_items_description_trgm',
+     "CREATE INDEX ix_xactimate_items_description_trgm ON xactimate_items "
+     "USING gin (description gin_trgm_ops)"),
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Check if xactimate_items table exists (idempotent migration)
+    result = conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = 'xactimate_items')"
+    ))
+    if not result.scalar():
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for index_name, definition in UNIFIED_SEARCH_INDEXES:
+        result = conn.execute(sa.text(
+            "SELECT EXISTS (SELECT 1 FROM pg_indexes "
+            "WHERE indexname = :index_name AND tablename = 'xactimate_items')"
+        ), {"index_name": index_name})
+        if not result.scalar():
+            op.execute(definition)
+
+
+def downgrade() -> None:
+    for index_name, _ in reversed(UNIFIED_SEARCH_INDEXES):
+        op.drop_index(index_name, table_name='xactimate_items', if_exists=True)
@@ -0,0 +1,42 @@
+"""Add xactimate item code/period index
+
+Revision ID: f5a1d8e3c092
+Revises: e2b8c5f1a937
+Create Date: 2026-10-19 00:21:44.618290
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f5a1d8e3c092'
+down_revision = 'e2b8c5f1a937'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Check if xactimate_items table exists (idempotent migration)
+    result = conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = 'xactimate_items')"
+    ))
+    if not result.scalar():
+        return
+
+    result = conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_indexes "
+        "WHERE indexname = 'idx_xactimate_items_code_period' AND tablename = 'xactimate_items')"
+    ))
+    if not result.scalar():
+        # Matches DISTINCT ON (item_code) ... ORDER BY item_code, price_year DESC, price_month DESC
+        op.execute(
+            "CREATE INDEX idx_xactimate_items_code_period ON xactimate_items "
+            "(item_code, price_year DESC, price_month DESC)"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_xactimate_items_code_period', table_name='xactimate_items', if_exists=True)
@@ -3,9 +3,13 @@ Base repository implementations for different database providers.
 """
 
 from typing import Any, Dict, List, Optional, Type, TypeVar, Tuple, Set
+from collections import OrderedDict
 from datetime import datetime
 import logging
 import json
+import math
+import threading
+import time
 from decimal import Decimal
 
 from app.core.interfaces import Repository, DatabaseSession, DatabaseException, QueryError
@@ -16,6 +20,101 @@ ID = TypeVar('ID')
 
 logger = logging.getLogger(__name__)
 
+# Pagination count modes, chosen per request
+COUNT_EXACT = "exact"          # COUNT(*) next to the page query
+COUNT_ESTIMATED = "estimated"  # Planner estimate on PostgreSQL, cached COUNT(*) elsewhere
+COUNT_NONE = "none"            # No total; has_more from one extra row
+COUNT_MODE_PATTERN = "^(exact|estimated|none)$"
+
+# Estimated counts that fall back to COUNT(*) are reused for this long
+ESTIMATED_COUNT_TTL = 60
+_ESTIMATED_COUNT_CACHE_SIZE = 512
+_estimated_counts: "OrderedDict[Tuple[str, str], Tuple[float, int]]" = OrderedDict()
+_estimated_counts_lock = threading.Lock()
+
+
+def _cached_count(query) -> int:
+    """COUNT(*) for a query, cached per statement and parameters for ESTIMATED_COUNT_TTL"""
+    compiled = query.statement.compile(bind=query.session.get_bind())
+    key = (str(compiled), repr(sorted(compiled.params.items(), key=lambda item: item[0])))
+    now = time.monotonic()
+    with _estimated_counts_lock:
+        cached = _estimated_counts.get(key)
+        if cached and now - cached[0] < ESTIMATED_COUNT_TTL:
+            return cached[1]
+
+    total = query.count()
+    with _estimated_counts_lock:
+        _estimated_counts[key] = (now, total)
+        _estimated_counts.move_to_end(key)
+        while len(_estimated_counts) > _ESTIMATED_COUNT_CACHE_SIZE:
+            _estimated_counts.popitem(last=False)
+    return total
+
+
+def estimate_count(query) -> int:
+    """
+    Approximate row count of a query.
+
+    PostgreSQL answers from the planner (EXPLAIN row estimate, which is
+    reltuples-based for unfiltered scans) without reading the rows. Other
+    databases, or a failing EXPLAIN, fall back to a COUNT(*) cached for
+    ESTIMATED_COUNT_TTL seconds.
+    """
+    query = query.order_by(None)
+    session = query.session
+    if session.get_bind().dialect.name == "postgresql":
+        compiled = query.statement.compile(bind=session.get_bind())
+        try:
+            plan = session.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+            ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            logger.warning(f"Planner row estimate failed, using cached count: {e}")
+    return _cached_count(query)
+
+
+def paginate_query(query, page: int, page_size: int,
+                   count_mode: str = COUNT_EXACT) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Fetch one page of an ORM query.
+
+    One extra row is fetched to tell whether another page exists, so
+    'has_more' is always exact. The total depends on count_mode; it is
+    exact without any count whenever the page turns out to be the last.
+
+    Returns:
+        (items, page info) where page info has total (None in 'none'
+        mode), total_pages, has_more and total_estimated
+    """
+    offset = (page - 1) * page_size
+    rows = query.offset(offset).limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    items = rows[:page_size]
+
+    total: Optional[int] = None
+    estimated = False
+    if not has_more and (items or offset == 0):
+        # Last page: the rows seen are all there is
+        total = offset + len(items)
+    elif count_mode == COUNT_EXACT:
+        total = query.order_by(None).count()
+    elif count_mode == COUNT_ESTIMATED:
+        # Never report fewer rows than this request has already seen
+        seen = offset + len(items) + (1 if has_more else 0) if items else 0
+        total = max(estimate_count(query), seen)
+        estimated = True
+
+    return items, {
+        "total": total,
+        "total_pages": math.ceil(total / page_size) if total is not None else None,
+        "has_more": has_more,
+        "total_estimated": estimated
+    }
+
 
 class BaseRepository(Repository[T, ID]):
     """Base repository with common functionality"""
@@ -226,6 +325,55 @@ class SQLAlchemyRepository(BaseRepository[T, ID]):
             self.db_session.rollback()
             raise DatabaseException(f"Failed to create {self.table_name}", e)
     
+    def bulk_insert(self, rows: List[Dict[str, Any]], model_class: Optional[Type[Any]] = None) -> List[str]:
+        """
+        Insert many rows in a single executemany statement.
+        
+        IDs are generated client-side, so no per-row flush is needed to learn them.
+        ORM events and relationship cascades do not run; rows must contain plain
+        column values. Runs in the current transaction - the caller commits.
+        
+        Args:
+            rows: Column dictionaries to insert
+            model_class: Model to insert into (defaults to this repository's model)
+        
+        Returns:
+            IDs of the inserted rows, in input order
+        """
+        if not rows:
+            return []
+        
+        from sqlalchemy import insert, inspect as sa_inspect
+        from app.core.database_types import generate_uuid
+        
+        model = model_class or self.model_class
+        column_keys = set(sa_inspect(model).column_attrs.keys())
+        
+        records = []
+        for row in rows:
+            unknown = set(row) - column_keys
+            if unknown:
+                raise DatabaseException(
+                    f"Unknown columns for {model.__tablename__}: {', '.join(sorted(unknown))}"
+                )
+            record = dict(row)
+            if not record.get('id'):
+                record['id'] = generate_uuid()
+            records.append(record)
+        
+        # SQLAlchemy batches consecutive rows with the same keys, so keep rows
+        # with the same column set together (insert order is irrelevant, IDs are known)
+        batched = sorted(records, key=lambda record: sorted(record))
+
+        try:
+            self.db_session.execute(insert(model), batched)
+        except Exception as e:
+            logger.error(f"Error bulk inserting into {model.__tablename__}: {e}")
+            raise DatabaseException(f"Failed to bulk insert {model.__tablename__}", e)
+        
+        logger.info(f"Bulk inserted {len(records)} rows into {model.__tablename__}")
+        return [str(record['id']) for record in records]
+
     def get_by_id(self, entity_id: ID) -> Optional[T]:
         """Get entity by ID using SQLAlchemy"""
         try:
@@ -379,18 +527,29 @@ class SQLAlchemyRepository(BaseRepository[T, ID]):
             logger.error(f"Error checking existence of {self.table_name} {entity_id}: {e}")
             raise DatabaseException(f"Failed to check existence of {self.table_name}", e)
     
+    def paginate(self, query, page: int, page_size: int,
+                 count_mode: str = COUNT_EXACT) -> Tuple[List[Any], Dict[str, Any]]:
+        """Fetch one page of a query (see paginate_query)"""
+        return paginate_query(query, page, page_size, count_mode)
+
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count entities with optional filters using SQLAlchemy"""
         try:
-            query = self.db_session.query(self.model_class)
+            from sqlalchemy import func
+            
+            # SELECT COUNT(*) directly instead of counting a wrapped SELECT of every column
+            query = self.db_session.query(func.count()).select_from(self.model_class)
             
             # Apply filters
             if filters:
                 for key, value in filters.items():
                     if hasattr(self.model_class, key):
-                        query = query.filter(getattr(self.model_class, key) == value)
+                        if isinstance(value, list):
+                            query = query.filter(getattr(self.model_class, key).in_(value))
+                        else:
+                            query = query.filter(getattr(self.model_class, key) == value)
             
-            return query.count()
+            return query.scalar() or 0
             
         except Exception as e:
             logger.error(f"Error counting {self.table_name}: {e}")
@@ -2,7 +2,7 @@
 Base service classes providing business logic layer with repository abstraction.
 """
 
-from typing import Any, Dict, List, Optional, TypeVar, Generic
+from typing import Any, Dict, Iterable, List, Optional, TypeVar, Generic
 from abc import ABC, abstractmethod
 import logging
 from datetime import datetime
@@ -15,6 +15,9 @@ ID = TypeVar('ID')
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of IDs sent in a single IN (...) clause
+BATCH_LOOKUP_CHUNK_SIZE = 500
+
 
 class BaseService(Generic[T, ID], ServiceInterface):
     """
@@ -92,6 +95,36 @@ class BaseService(Generic[T, ID], ServiceInterface):
             # Return None instead of raising to allow graceful handling
             return None
     
+    def get_by_ids(self, entity_ids: Iterable[ID]) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve many entities with batched IN queries instead of one query per ID.
+
+        Args:
+            entity_ids: IDs to resolve (None values and duplicates are ignored)
+
+        Returns:
+            Dictionary mapping string ID to entity dictionary; missing IDs are absent
+        """
+        unique_ids = list(dict.fromkeys(str(entity_id) for entity_id in entity_ids if entity_id))
+        if not unique_ids:
+            return {}
+
+        try:
+            session = self.database.get_readonly_session()
+            try:
+                repository = self._get_repository_instance(session)
+                resolved = {}
+                for start in range(0, len(unique_ids), BATCH_LOOKUP_CHUNK_SIZE):
+                    chunk = unique_ids[start:start + BATCH_LOOKUP_CHUNK_SIZE]
+                    for entity in repository.get_all(filters={'id': chunk}):
+                        resolved[str(entity['id'])] = entity
+                return resolved
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Error batch getting {self.__class__.__name__} entities: {e}")
+            raise
+    
     def create(self, entity_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new entity.
@@ -0,0 +1,423 @@
+"""
+Bulk import utilities
+
+Streaming CSV/JSONL readers, chunked validation with per-row error
+reporting, and an upsert writer for large imports such as monthly price
+lists.
+
+Rows are read and validated in chunks, so memory stays bounded by the chunk
+size. Valid rows are written with the fastest path the database offers:
+
+- PostgreSQL: rows are streamed with ``COPY`` into a temporary staging
+  table, then merged with one ``UPDATE ... FROM`` and one
+  ``INSERT ... SELECT ... WHERE NOT EXISTS`` at the end, or at each
+  ``flush`` (the target tables have no unique constraint on the natural
+  key, so ``ON CONFLICT`` has no arbiter)
+- Other databases: each chunk is matched against existing rows with one
+  ``IN`` query and written with executemany inserts and primary-key updates
+
+Within one import the last row for a key wins.
+"""
+
+import codecs
+import csv
+import enum
+import io
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table, insert, inspect as sa_inspect, select, text, update
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+
+# Rows validated and written per round trip
+IMPORT_CHUNK_SIZE = 2000
+
+# Row errors kept in a report; the count is always exact
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFormatError(ValueError):
+    """The uploaded file cannot be read as the requested format"""
+    pass
+
+
+@dataclass
+class ImportReport:
+    """Outcome of a bulk import"""
+    total_rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row: int, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'errors': messages})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_rows': self.total_rows,
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'failed': self.failed,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+            'errors_truncated': self.failed > len(self.errors)
+        }
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None,
+                  requested: Optional[str] = None) -> str:
+    """Pick CSV or JSONL from an explicit choice, the file name or the content type"""
+    if requested:
+        requested = requested.lower()
+        if requested not in (FORMAT_CSV, FORMAT_JSONL):
+            raise ImportFormatError(f"Unsupported import format: {requested}")
+        return requested
+
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson")) or "ndjson" in (content_type or "") \
+            or "jsonl" in (content_type or ""):
+        return FORMAT_JSONL
+    if name.endswith(".csv") or "csv" in (content_type or ""):
+        return FORMAT_CSV
+    raise ImportFormatError("Cannot tell the import format; upload a .csv or .jsonl file")
+
+
+def iter_records(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Read records lazily from a binary stream.
+
+    Yields:
+        (row number, record) pairs. Row numbers are file line numbers (the
+        CSV header is line 1). A record that cannot be parsed is yielded as
+        an ImportFormatError instead of a dict.
+    """
+    reader = codecs.getreader("utf-8-sig")(stream)
+
+    if fmt == FORMAT_CSV:
+        rows = csv.DictReader(reader)
+        if not rows.fieldnames:
+            return
+        for record in rows:
+            if None in record:
+                yield rows.line_num, ImportFormatError("Row has more values than the header")
+                continue
+            # Empty cells mean "not provided", so schema defaults apply
+            yield rows.line_num, {
+                key.strip(): value.strip()
+                for key, value in record.items() if key and value and value.strip()
+            }
+        return
+
+    for line_number, line in enumerate(reader, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ImportFormatError(f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(record, dict):
+            yield line_number, ImportFormatError("Each line must be a JSON object")
+            continue
+        yield line_number, record
+
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    messages = []
+    for detail in error.errors():
+        location = ".".join(str(part) for part in detail.get('loc', ()))
+        messages.append(f"{location}: {detail['msg']}" if location else detail['msg'])
+    return messages
+
+
+def iter_valid_chunks(records: Iterator[Tuple[int, Any]], schema: Type[BaseModel],
+                      report: ImportReport,
+                      chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[List[Tuple[int, BaseModel]]]:
+    """
+    Validate records against a schema, recording failures in the report.
+
+    Yields:
+        Chunks of (row number, validated model) pairs
+    """
+    chunk: List[Tuple[int, BaseModel]] = []
+    for row_number, record in records:
+        report.total_rows += 1
+        if isinstance(record, Exception):
+            report.add_error(row_number, [str(record)])
+            continue
+        try:
+            chunk.append((row_number, schema.model_validate(record)))
+        except ValidationError as e:
+            report.add_error(row_number, _validation_messages(e))
+            continue
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _normalize_key(values: Any) -> Tuple:
+    """Natural key tuple comparable between input rows and loaded rows (UUIDs load as strings)"""
+    return tuple(str(value) if isinstance(value, uuid.UUID) else value for value in values)
+
+
+def _copy_literal(value: Any) -> str:
+    """Format one value for COPY ... (FORMAT csv): unquoted empty is NULL"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy stores Enum columns by member name
+        return value.name
+    if isinstance(value, (int, float)):
+        return str(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class BulkUpserter:
+    """
+    Insert-or-update rows of one table by a natural key.
+
+    Call ``write`` with chunks of column dictionaries and ``finish`` once at
+    the end. Everything runs in the session's transaction; the caller
+    commits.
+    """
+
+    def __init__(self, session: Session, model: Type[Any], key_columns: Sequence[str],
+                 columns: Sequence[str], nullable_keys: Sequence[str] = (),
+                 generated_id: Optional[Callable[[], Any]] = None,
+                 insert_values: Optional[Dict[str, Any]] = None,
+                 on_written: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None):
+        """
+        Args:
+            session: Database session
+            model: Target ORM model
+            key_columns: Columns identifying a row
+            columns: Columns written by the import (keys included)
+            nullable_keys: Key columns that may be NULL in imported rows;
+                they are matched null-safely, the others with plain equality
+            generated_id: Callable producing primary keys for new rows when
+                the key is not generated by the database
+            insert_values: Constant column values set on inserted rows only
+                (e.g. created_by)
+            on_written: Called with 'insert' or 'update' and the written rows
+                (imported columns plus the primary key) after each write, in
+                batches of at most IMPORT_CHUNK_SIZE rows
+        """
+        self.session = session
+        self.model = model
+        self.table: Table = model.__table__
+        self.key_columns = list(key_columns)
+        self.columns = list(dict.fromkeys([*key_columns, *columns]))
+        self.value_columns = [column for column in self.columns if column not in self.key_columns]
+        self.nullable_keys = set(nullable_keys)
+        self.generated_id = generated_id
+        self.insert_values = dict(insert_values or {})
+        self.on_written = on_written
+        self.inserted = 0
+        self.updated = 0
+
+        self.dialect = self.session.get_bind().dialect.name
+        self._staging: Optional[str] = None
+        self._staged_rows = 0
+        # Existing rows are looked up by a key that is never NULL in the import
+        self._lookup_column = next(
+            name for name in self.key_columns if name not in self.nullable_keys
+        )
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        """Stage or write one chunk of rows"""
+        if not rows:
+            return
+        if self.dialect == "postgresql":
+            self._copy_to_staging(rows)
+        else:
+            self._write_chunk(rows)
+
+    def flush(self) -> None:
+        """Write the rows staged so far, so resolve_ids can see them"""
+        if self._staging:
+            self._merge_staging()
+
+    def finish(self) -> Tuple[int, int]:
+        """
+        Complete the import.
+
+        Returns:
+            (inserted, updated) row counts
+        """
+        self.flush()
+        return self.inserted, self.updated
+
+    def _report_written(self, action: str, result: Any) -> None:
+        """Pass RETURNING rows to on_written in bounded batches"""
+        for batch in result.mappings().partitions(IMPORT_CHUNK_SIZE):
+            self.on_written(action, [dict(row) for row in batch])
+
+    # PostgreSQL: COPY into a staging table, merge once
+
+    def _copy_to_staging(self, rows: List[Dict[str, Any]]) -> None:
+        columns = self._staged_columns()
+        connection = self.session.connection()
+        if self._staging is None:
+            self._staging = f"import_stage_{self.table.name}"
+            connection.execute(text(f"DROP TABLE IF EXISTS {self._staging}"))
+            connection.execute(text(
+                f"CREATE TEMP TABLE {self._staging} ON COMMIT DROP AS "
+                f"SELECT {', '.join(columns)} FROM {self.table.name} WITH NO DATA"
+            ))
+            connection.execute(text(f"ALTER TABLE {self._staging} ADD COLUMN import_row bigint"))
+
+        buffer = io.StringIO()
+        for row in rows:
+            self._staged_rows += 1
+            values = [
+                self.generated_id() if column == "id" and self.generated_id else row.get(column)
+                for column in columns
+            ]
+            values.append(self._staged_rows)
+            buffer.write(",".join(_copy_literal(value) for value in values))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {self._staging} ({', '.join(columns)}, import_row) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+    def _staged_columns(self) -> List[str]:
+        return (["id"] if self.generated_id else []) + self.columns
+
+    def _key_match(self, left: str, right: str) -> str:
+        conditions = []
+        for name in self.key_columns:
+            if name in self.nullable_keys:
+                conditions.append(
+                    f"({left}.{name} = {right}.{name} OR ({left}.{name} IS NULL AND {right}.{name} IS NULL))"
+                )
+            else:
+                conditions.append(f"{left}.{name} = {right}.{name}")
+        return " AND ".join(conditions)
+
+    def _merge_staging(self) -> None:
+        staging, target = self._staging, self.table.name
+        keys = ", ".join(self.key_columns)
+        latest = (
+            f"SELECT DISTINCT ON ({keys}) * FROM {staging} "
+            f"ORDER BY {keys}, import_row DESC"
+        )
+        connection = self.session.connection()
+        returned = [sa_inspect(self.model).primary_key[0].name, *self.columns]
+
+        assignments = [f"{name} = latest.{name}" for name in self.value_columns]
+        if "updated_at" in self.table.c and "updated_at" not in self.value_columns:
+            assignments.append("updated_at = now()")
+        if assignments:
+            result = connection.execute(text(
+                f"WITH latest AS ({latest}) "
+                f"UPDATE {target} AS t SET {', '.join(assignments)} "
+                f"FROM latest WHERE {self._key_match('t', 'latest')}"
+                + (f" RETURNING {', '.join(f't.{name}' for name in returned)}" if self.on_written else "")
+            ))
+            self.updated += max(result.rowcount, 0)
+            if self.on_written:
+                self._report_written("update", result)
+
+        # Plain SQL skips Python-side column defaults; pass the scalar ones along
+        staged = self._staged_columns()
+        defaults = {
+            column.name: column.default.arg for column in self.table.columns
+            if column.name not in staged and column.default is not None and column.default.is_scalar
+        }
+        defaults.update(self.insert_values)
+        columns = ", ".join([*staged, *defaults])
+        selected = ", ".join([*staged, *(f":default_{name}" for name in defaults)])
+        result = connection.execute(text(
+            f"INSERT INTO {target} ({columns}) "
+            f"SELECT {selected} FROM ({latest}) AS latest "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {target} AS t WHERE {self._key_match('t', 'latest')})"
+            + (f" RETURNING {', '.join(returned)}" if self.on_written else "")
+        ), {f"default_{name}": value for name, value in defaults.items()})
+        self.inserted += max(result.rowcount, 0)
+        if self.on_written:
+            self._report_written("insert", result)
+        connection.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        self._staging = None
+
+    # Other databases: match each chunk, executemany inserts and updates
+
+    def _write_chunk(self, rows: List[Dict[str, Any]]) -> None:
+        by_key: Dict[Tuple, Dict[str, Any]] = {}
+        for row in rows:
+            by_key[_normalize_key(row.get(name) for name in self.key_columns)] = row
+
+        primary_key = sa_inspect(self.model).primary_key[0]
+        key_attributes = [getattr(self.model, name) for name in self.key_columns]
+        lookup_values = {key[self.key_columns.index(self._lookup_column)] for key in by_key}
+        existing: Dict[Tuple, List[Any]] = {}
+        statement = select(primary_key, *key_attributes)\
+            .where(getattr(self.model, self._lookup_column).in_(lookup_values))
+        for found in self.session.execute(statement):
+            existing.setdefault(_normalize_key(found[1:]), []).append(found[0])
+
+        inserts, updates = [], []
+        for key, row in by_key.items():
+            values = {name: row.get(name) for name in self.columns}
+            if key in existing:
+                for row_id in existing[key]:
+                    updates.append(dict(values, **{primary_key.key: row_id}))
+            else:
+                if self.generated_id:
+                    values[primary_key.key] = self.generated_id()
+                inserts.append(dict(values, **self.insert_values))
+
+        if updates:
+            if "updated_at" in self.table.c and "updated_at" not in self.columns:
+                now = datetime.now(timezone.utc)
+                for values in updates:
+                    values["updated_at"] = now
+            self.session.execute(update(self.model), updates)
+            self.updated += len(updates)
+            if self.on_written:
+                self.on_written("update", updates)
+        if inserts:
+            self.session.execute(insert(self.model), inserts)
+            self.inserted += len(inserts)
+            if self.on_written:
+                self.on_written("insert", inserts)
+
+    def resolve_ids(self, keys: List[Tuple]) -> Dict[Tuple, Any]:
+        """Primary keys of the rows with the given natural keys (after finish)"""
+        primary_key = sa_inspect(self.model).primary_key[0]
+        key_attributes = [getattr(self.model, name) for name in self.key_columns]
+        position = self.key_columns.index(self._lookup_column)
+        wanted = {_normalize_key(key) for key in keys}
+        ids: Dict[Tuple, Any] = {}
+        lookup_values = sorted({key[position] for key in wanted}, key=str)
+        for start in range(0, len(lookup_values), IMPORT_CHUNK_SIZE):
+            statement = select(primary_key, *key_attributes).where(
+                getattr(self.model, self._lookup_column).in_(lookup_values[start:start + IMPORT_CHUNK_SIZE])
+            )
+            for found in self.session.execute(statement):
+                key = _normalize_key(found[1:])
+                if key in wanted:
+                    ids[key] = found[0]
+        return ids
@@ -0,0 +1,184 @@
+"""
+Document totals calculation
+
+One calculator for invoice, estimate and receipt totals. It takes every line
+of a document together with its O&P, tax, discount and credit settings and
+returns per-line and document totals in a single pass.
+
+Document figures are computed from unrounded line amounts and each is rounded
+half-up to cents once, at the end. Document-level O&P, discount and tax are
+allocated back to the lines in cents, so each of those line columns adds up
+to its document figure exactly.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+CENT = Decimal('0.01')
+ZERO = Decimal('0')
+HUNDRED = Decimal('100')
+
+TAX_METHOD_PERCENTAGE = 'percentage'
+TAX_METHOD_SPECIFIC = 'specific'
+
+
+def to_decimal(value: Any, default: Decimal = ZERO) -> Decimal:
+    """Convert a number, string or None to Decimal without float artifacts"""
+    if value is None or value == '':
+        return default
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def round_money(value: Decimal) -> Decimal:
+    """Round to cents, half-up"""
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def line_amount(item: Dict[str, Any]) -> Decimal:
+    """Amount of one line (quantity x rate) rounded to cents"""
+    return round_money(to_decimal(item.get('quantity'), Decimal('1')) * to_decimal(item.get('rate')))
+
+
+def allocate(total: Decimal, weights: Sequence[Decimal]) -> List[Decimal]:
+    """
+    Split a rounded total across weights in cents.
+
+    Shares are taken from the rounded cumulative proportion, so they always
+    sum to total exactly. Zero weights everywhere split the total evenly.
+    """
+    if not weights:
+        return []
+    weight_sum = sum(weights, ZERO)
+    if weight_sum == 0:
+        weights = [Decimal('1')] * len(weights)
+        weight_sum = Decimal(len(weights))
+
+    shares = []
+    running_weight = ZERO
+    allocated = ZERO
+    for weight in weights:
+        running_weight += weight
+        cumulative = round_money(total * running_weight / weight_sum)
+        shares.append(cumulative - allocated)
+        allocated = cumulative
+    return shares
+
+
+def calculate_document_totals(items: Iterable[Dict[str, Any]],
+                              op_percent: Any = 0,
+                              tax_method: Optional[str] = TAX_METHOD_PERCENTAGE,
+                              tax_rate: Any = 0,
+                              tax_amount: Any = 0,
+                              discount_amount: Any = 0,
+                              credit_amount: Any = 0,
+                              discount_reduces_tax_base: bool = True,
+                              include_item_tax: bool = True) -> Dict[str, Any]:
+    """
+    Calculate line and document totals for a whole document.
+
+    Args:
+        items: Lines with 'quantity' (default 1) and 'rate'. Optional keys:
+            'taxable' (default True), 'taxable_rate' (the part of the rate
+            subject to tax, e.g. material only; defaults to rate),
+            'tax_rate' (item-level tax percent, added to the document tax)
+            and 'depreciation_rate' (percent).
+        op_percent: Overhead & profit percentage applied to the items subtotal
+        tax_method: 'percentage' (tax_rate on the taxable base); any other
+            method, including 'specific', uses the fixed tax_amount
+        tax_rate: Tax percentage for the percentage method
+        tax_amount: Tax amount for methods other than 'percentage'
+        discount_amount: Document discount, spread over lines by amount
+        credit_amount: Customer credits applied; reduces amount_due only
+        discount_reduces_tax_base: Subtract the taxable share of the
+            discount before applying the tax rate
+        include_item_tax: Add item-level 'tax_rate' tax on top of the
+            document tax. Invoice and estimate documents tax at document
+            level only and pass False.
+
+    Returns:
+        Dictionary of Decimal totals (items_subtotal, op_amount, subtotal,
+        taxable_amount, tax_amount (document plus item-level tax),
+        item_tax_amount, discount_amount, depreciation_amount, total_amount,
+        credit_amount, amount_due) with a 'lines' list holding the same
+        breakdown per line.
+    """
+    op_rate = to_decimal(op_percent) / HUNDRED
+    discount = to_decimal(discount_amount)
+
+    lines = []
+    raw_amounts = []
+    raw_taxables = []
+    raw_item_tax = ZERO
+    raw_depreciation = ZERO
+    for item in items:
+        quantity = to_decimal(item.get('quantity'), Decimal('1'))
+        rate = to_decimal(item.get('rate'))
+        amount = quantity * rate
+        if item.get('taxable', True):
+            taxable = quantity * to_decimal(item.get('taxable_rate'), rate)
+        else:
+            taxable = ZERO
+        item_tax = taxable * to_decimal(item.get('tax_rate')) / HUNDRED if include_item_tax else ZERO
+        depreciation = amount * to_decimal(item.get('depreciation_rate')) / HUNDRED
+
+        raw_amounts.append(amount)
+        raw_taxables.append(taxable)
+        raw_item_tax += item_tax
+        raw_depreciation += depreciation
+        lines.append({
+            'quantity': quantity,
+            'rate': rate,
+            'amount': round_money(amount),
+            'taxable_amount': round_money(taxable),
+            'item_tax_amount': round_money(item_tax),
+            'depreciation_amount': round_money(depreciation),
+        })
+
+    items_subtotal = sum(raw_amounts, ZERO)
+    taxable_subtotal = sum(raw_taxables, ZERO)
+    op_amount = items_subtotal * op_rate
+
+    # Taxable base: taxable lines plus their share of O&P, less their share of the discount
+    taxable_base = taxable_subtotal * (1 + op_rate)
+    if discount_reduces_tax_base and discount and items_subtotal > 0:
+        taxable_base -= discount * taxable_subtotal / items_subtotal
+    taxable_base = max(taxable_base, ZERO)
+
+    if tax_method == TAX_METHOD_PERCENTAGE:
+        document_tax = taxable_base * to_decimal(tax_rate) / HUNDRED
+    else:
+        document_tax = to_decimal(tax_amount)
+
+    total_amount = round_money(items_subtotal + op_amount + document_tax + raw_item_tax - discount)
+    credits = round_money(to_decimal(credit_amount))
+
+    # Document-level figures allocated to the lines in cents
+    rounded_op = round_money(op_amount)
+    rounded_discount = round_money(discount)
+    rounded_document_tax = round_money(document_tax)
+    taxable_weights = raw_taxables if any(raw_taxables) else raw_amounts
+    line_op = allocate(rounded_op, raw_amounts)
+    line_discount = allocate(rounded_discount, raw_amounts)
+    line_tax = allocate(rounded_document_tax, taxable_weights)
+    for line, op_share, discount_share, tax_share in zip(lines, line_op, line_discount, line_tax):
+        line['op_amount'] = op_share
+        line['discount_amount'] = discount_share
+        line['tax_amount'] = tax_share + line['item_tax_amount']
+        line['total_amount'] = line['amount'] + op_share + line['tax_amount'] - discount_share
+
+    return {
+        'lines': lines,
+        'items_subtotal': round_money(items_subtotal),
+        'op_amount': rounded_op,
+        'subtotal': round_money(items_subtotal + op_amount),
+        'taxable_amount': round_money(taxable_base),
+        'tax_amount': round_money(document_tax + raw_item_tax),
+        'item_tax_amount': round_money(raw_item_tax),
+        'discount_amount': rounded_discount,
+        'depreciation_amount': round_money(raw_depreciation),
+        'total_amount': total_amount,
+        'credit_amount': credits,
+        'amount_due': total_amount - credits,
+    }
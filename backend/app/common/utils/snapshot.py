@@ -0,0 +1,102 @@
+"""
+Fingerprinted in-memory snapshots
+
+Small, read-mostly tables (categories, item mappings) are served from one
+immutable snapshot per process instead of being queried per request. A
+snapshot is dropped when the table is written through its endpoints in this
+process. Writes made by other worker processes are noticed through a cheap
+fingerprint query (row count and latest change time) run at most once every
+``REVALIDATE_SECONDS``; the snapshot is rebuilt only when the fingerprint
+has changed.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Generic, Optional, Tuple, TypeVar
+
+from sqlalchemy import func, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+# How long a snapshot is trusted before its fingerprint is checked again
+REVALIDATE_SECONDS = 60
+
+T = TypeVar("T")
+
+
+def table_fingerprint(db: Session, model: Any) -> Tuple[Any, ...]:
+    """
+    Cheap summary of a table that changes on every content write.
+
+    The model needs created_at and updated_at columns. Writes that leave
+    updated_at unchanged do not show up.
+    """
+    primary_key = sa_inspect(model).primary_key[0]
+    count, last_change = db.query(
+        func.count(primary_key),
+        func.max(func.coalesce(model.updated_at, model.created_at))
+    ).one()
+    return (count, str(last_change) if last_change is not None else None)
+
+
+class FingerprintedSnapshot(Generic[T]):
+    """
+    Process-wide snapshot built by a loader and revalidated by fingerprint.
+
+    Args:
+        fingerprint: Returns the current fingerprint of the source tables
+        build: Builds a snapshot from a session and its version number;
+            versions increase with every rebuild in the process
+        revalidate_seconds: How long a snapshot is served without checking
+            the fingerprint
+    """
+
+    def __init__(self, fingerprint: Callable[[Session], Tuple[Any, ...]],
+                 build: Callable[[Session, int], T],
+                 revalidate_seconds: float = REVALIDATE_SECONDS):
+        self._read_fingerprint = fingerprint
+        self._build = build
+        self.revalidate_seconds = revalidate_seconds
+        self._snapshot: Optional[T] = None
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+        self._checked_at = 0.0
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> Optional[T]:
+        if self._snapshot is not None and time.monotonic() - self._checked_at < self.revalidate_seconds:
+            return self._snapshot
+        return None
+
+    def get(self, db: Session) -> T:
+        """
+        Get the current snapshot, building it on first use and rebuilding it
+        when another process has changed the source tables.
+        """
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._fresh()
+            if snapshot is not None:
+                return snapshot
+
+            fingerprint = self._read_fingerprint(db)
+            if self._snapshot is None or fingerprint != self._fingerprint:
+                self._version += 1
+                self._snapshot = self._build(db, self._version)
+                self._fingerprint = fingerprint
+            # Unchanged or rebuilt: restart the revalidation window
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def refresh(self, db: Session) -> T:
+        """Rebuild the snapshot after a write in this process"""
+        self.invalidate()
+        return self.get(db)
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next read rebuilds it"""
+        with self._lock:
+            self._snapshot = None
+            self._fingerprint = None
@@ -0,0 +1,162 @@
+"""
+Streaming tabular export utilities
+
+CSV and Excel writers that consume rows lazily and yield the file in chunks,
+so exports keep a bounded memory footprint regardless of row count. Pair them
+with a server-side cursor (``yield_per``) and a ``StreamingResponse``.
+
+Closing a stream closes its rows iterator, so a generator holding a database
+session can release it in its ``finally`` even when the client disconnects
+mid-download. Starlette does not close sync iterators itself; close the
+stream in the response's background task.
+"""
+
+import csv
+import io
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+# Rows buffered before a CSV chunk is yielded
+CSV_ROWS_PER_CHUNK = 500
+
+# Byte size of the chunks yielded for Excel files
+XLSX_CHUNK_SIZE = 64 * 1024
+
+# Excel workbooks are spooled in memory up to this size, then moved to disk
+XLSX_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Bounds for Excel column widths
+MIN_COLUMN_WIDTH = 12
+MAX_COLUMN_WIDTH = 50
+
+CSV_MEDIA_TYPE = "text/csv"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def iter_csv(headers: Sequence[str], rows: Iterable[Sequence[Any]],
+             rows_per_chunk: int = CSV_ROWS_PER_CHUNK) -> Iterator[str]:
+    """
+    Stream rows as CSV text.
+
+    Args:
+        headers: Header row
+        rows: Data rows (consumed lazily)
+        rows_per_chunk: Number of rows written before a chunk is yielded
+
+    Yields:
+        CSV text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+
+    try:
+        pending = 0
+        for row in rows:
+            writer.writerow(['' if value is None else value for value in row])
+            pending += 1
+            if pending >= rows_per_chunk:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+                pending = 0
+
+        remaining = buffer.getvalue()
+        if remaining:
+            yield remaining
+    finally:
+        close_rows(rows)
+
+
+def iter_xlsx(headers: Sequence[str], rows: Iterable[Sequence[Any]],
+              sheet_title: str = "Export",
+              column_widths: Optional[Sequence[int]] = None,
+              chunk_size: int = XLSX_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Stream rows as an Excel workbook.
+
+    Rows are written with openpyxl's write-only mode, which flushes them to
+    disk instead of keeping a cell grid in memory. An .xlsx file is a zip
+    archive that is only valid once finalized, so the workbook is saved to a
+    spooled temporary file and then yielded in chunks.
+
+    Args:
+        headers: Header row (styled bold on a blue fill)
+        rows: Data rows (consumed lazily)
+        sheet_title: Worksheet title
+        column_widths: Optional column widths; defaults to the header length
+        chunk_size: Size of the yielded byte chunks
+
+    Yields:
+        Excel file bytes in chunks
+    """
+    # Checked eagerly so callers can report a missing dependency before streaming starts
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        raise ImportError("openpyxl package required for Excel export")
+
+    return _generate_xlsx(headers, rows, sheet_title, column_widths, chunk_size)
+
+
+def _generate_xlsx(headers: Sequence[str], rows: Iterable[Sequence[Any]],
+                   sheet_title: str, column_widths: Optional[Sequence[int]],
+                   chunk_size: int) -> Iterator[bytes]:
+    """Generator behind iter_xlsx"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF")
+    header_alignment = Alignment(horizontal="center", vertical="center")
+
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+
+    # Write-only sheets cannot be revisited, so widths are fixed up front
+    # instead of being sized from the data
+    if column_widths is None:
+        column_widths = [max(len(str(header)) + 2, MIN_COLUMN_WIDTH) for header in headers]
+    for col_num, width in enumerate(column_widths, 1):
+        ws.column_dimensions[get_column_letter(col_num)].width = min(width, MAX_COLUMN_WIDTH)
+
+    ws.append(header_cells)
+    try:
+        for row in rows:
+            ws.append([_excel_value(value) for value in row])
+    finally:
+        close_rows(rows)
+
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_SIZE) as output:
+        wb.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def close_rows(rows: Iterable[Any]) -> None:
+    """Close a rows iterator that supports it (generators), releasing what it holds"""
+    close = getattr(rows, "close", None)
+    if close is not None:
+        close()
+
+
+def _excel_value(value: Any) -> Any:
+    """Convert values Excel cannot store (timezone-aware datetimes) to a supported form"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -183,6 +183,19 @@ class Settings(BaseSettings):
     GDRIVE_SERVICE_ACCOUNT_FILE: Optional[str] = os.getenv("GDRIVE_SERVICE_ACCOUNT_FILE")
     GDRIVE_ROOT_FOLDER_ID: Optional[str] = os.getenv("GDRIVE_ROOT_FOLDER_ID")
 
+    # Pack calculation item-name match cache (entries per process; optionally shared via Redis)
+    PACK_MATCH_CACHE_SIZE: int = int(os.getenv("PACK_MATCH_CACHE_SIZE", "10000"))
+    PACK_MATCH_CACHE_SHARED: bool = os.getenv("PACK_MATCH_CACHE_SHARED", "false").lower() == "true"
+
+    # Item mapping usage counts are buffered and written in batches this often (seconds)
+    PACK_USAGE_FLUSH_SECONDS: float = float(os.getenv("PACK_USAGE_FLUSH_SECONDS", "30"))
+
+    # Computed pack calculation results kept per process, keyed by input hash (0 disables)
+    PACK_RESULT_CACHE_SIZE: int = int(os.getenv("PACK_RESULT_CACHE_SIZE", "256"))
+
+    # Learned item matches from user corrections are compacted to the database this often (seconds)
+    PACK_LEARNING_COMPACT_SECONDS: float = float(os.getenv("PACK_LEARNING_COMPACT_SECONDS", "60"))
+
     # Redis Cache Settings
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
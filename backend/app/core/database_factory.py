@@ -131,6 +131,16 @@ class SQLAlchemySession(DatabaseSession):
             raise DatabaseException("Session is closed")
         return self._session.execute(statement, params=parameters, execution_options=execution_options)
 
+    def get_bind(self):
+        """Engine (or connection) the session executes against"""
+        return self._session.get_bind()
+
+    def connection(self):
+        """Connection of the current transaction"""
+        if self._closed:
+            raise DatabaseException("Session is closed")
+        return self._session.connection()
+
     @property
     def is_closed(self) -> bool:
         """Check if session is closed"""
@@ -348,6 +358,7 @@ class SQLiteDatabase(DatabaseProvider):
             import app.domains.credit.models
             import app.domains.staff.models
             import app.domains.file.models  # File management 모델 추가
+            import app.domains.dashboard.models  # Dashboard rollups
             from sqlalchemy import inspect
             
             # Check if tables already exist
@@ -363,6 +374,10 @@ class SQLiteDatabase(DatabaseProvider):
                 # Create only missing tables
                 Base.metadata.create_all(bind=self.engine, checkfirst=True)
                 logger.debug("Checked and created any missing tables")
+
+            # Full-text index for line item search (FTS5 virtual table + sync triggers)
+            from app.domains.line_items.search import ensure_sqlite_search_index
+            ensure_sqlite_search_index(self.engine)
         except Exception as e:
             logger.error(f"Failed to initialize SQLite database: {e}")
             raise ConfigurationError("Failed to initialize database", e)
@@ -470,6 +485,7 @@ class PostgreSQLDatabase(DatabaseProvider):
             import app.domains.line_items.category_models  # Line Item Categories 모델 추가
             import app.domains.file.models  # File management 모델 추가
             import app.domains.analytics.models  # Analytics models (API usage logs)
+            import app.domains.dashboard.models  # Dashboard rollups
             from sqlalchemy import inspect
             
             # Check if tables already exist
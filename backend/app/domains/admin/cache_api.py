@@ -16,6 +16,10 @@ from app.domains.auth.dependencies import get_current_user, require_admin
 from app.domains.staff.models import Staff
 from app.core.cache import CacheService, get_cache
 from app.domains.line_items.cache_service import get_category_cache_service
+from app.domains.line_items.category_snapshot import invalidate_category_snapshot
+from app.domains.pack_calculation.match_cache import item_match_cache
+from app.domains.pack_calculation.result_cache import calculation_result_cache
+from app.domains.pack_calculation.learned_overlay import learned_overlay
 from app.core.config import settings
 
 router = APIRouter(prefix="/api/admin/cache", tags=["Admin - Cache"])
@@ -48,6 +52,9 @@ async def get_cache_metrics(
             "redis": redis_metrics,
             "categories": categories_info,
             "performance": category_metrics,
+            "pack_item_matching": item_match_cache.stats(),
+            "pack_calculation_results": calculation_result_cache.stats(),
+            "pack_learned_matches": learned_overlay.stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -79,6 +86,10 @@ async def clear_cache(
         if pattern == "*" or "categor" in pattern.lower():
             category_service = get_category_cache_service(cache)
             await category_service.invalidate_category_caches()
+            invalidate_category_snapshot()
+        if pattern == "*" or "pack" in pattern.lower():
+            item_match_cache.clear()
+            calculation_result_cache.clear()
         
         return {
             "deleted": deleted,
@@ -2,6 +2,7 @@
 Credit and discount API endpoints
 """
 
+import json
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Optional
 from uuid import UUID
@@ -15,14 +16,19 @@ from .schemas import (
     DiscountRuleResponse, DiscountRulesResponse,
     AppliedDiscount, AppliedDiscountCreate, AppliedDiscountUpdate,
     AppliedDiscountResponse, AppliedDiscountsResponse,
-    CustomerCreditFilter, DiscountRuleFilter
+    CustomerCreditFilter, DiscountRuleFilter,
+    CreditApplicationBatch, CreditApplicationBatchResponse
 )
 from .service import CreditService
 from .models import CreditType, DiscountType, CreditStatus
 from app.core.database_factory import get_database
+from app.core.cache import get_cache
 
 router = APIRouter()
 
+# Dashboard statistics are recomputed at most this often per company
+DASHBOARD_STATS_CACHE_TTL = 60
+
 
 def get_credit_service():
     """Dependency to get credit service"""
@@ -130,12 +136,13 @@ async def update_customer_credit(
 async def use_customer_credit(
     credit_id: UUID,
     amount_to_use: Decimal = Query(..., description="Amount to use from credit"),
+    staff_id: UUID = Query(..., description="Staff processing the payment"),
     work_order_id: Optional[UUID] = Query(None, description="Work order ID"),
     service: CreditService = Depends(get_credit_service)
 ):
     """Use customer credit for payment"""
     try:
-        updated_credit = service.use_customer_credit(credit_id, amount_to_use, work_order_id)
+        updated_credit = service.use_customer_credit(credit_id, amount_to_use, staff_id, work_order_id)
         
         if not updated_credit:
             raise HTTPException(status_code=404, detail="Customer credit not found or insufficient balance")
@@ -151,6 +158,36 @@ async def use_customer_credit(
         raise HTTPException(status_code=500, detail=f"Error using customer credit: {str(e)}")
 
 
+@router.post("/apply-batch", response_model=CreditApplicationBatchResponse)
+async def apply_credits_batch(
+    batch: CreditApplicationBatch,
+    service: CreditService = Depends(get_credit_service)
+):
+    """Apply customer credits to many work orders in one transaction (all or nothing)"""
+    try:
+        result = service.apply_credits(
+            [application.dict() for application in batch.applications],
+            batch.processed_by_staff_id
+        )
+        
+        if result is None:
+            raise HTTPException(status_code=404, detail="Customer credit not found")
+        
+        return CreditApplicationBatchResponse(
+            credits=result['credits'],
+            transactions=result['transactions'],
+            total_applied=result['total_applied'],
+            message=f"${result['total_applied']} applied across {len(result['transactions'])} work orders"
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error applying customer credits: {str(e)}")
+
+
 # Discount Rule endpoints
 @router.get("/discount-rules/", response_model=DiscountRulesResponse)
 async def get_discount_rules(
@@ -277,11 +314,20 @@ async def get_credit_statuses():
 @router.get("/dashboard/stats")
 async def get_credit_dashboard_stats(
     company_id: Optional[UUID] = Query(None, description="Filter by company ID"),
+    refresh: bool = Query(False, description="Bypass the short-lived stats cache"),
     service: CreditService = Depends(get_credit_service)
 ):
     """Get credit and discount dashboard statistics"""
     try:
+        cache = get_cache()
+        cache_key = f"credits:dashboard:{company_id or 'all'}"
+        if not refresh:
+            cached = await cache.get(cache_key)
+            if cached:
+                return json.loads(cached)
+
         stats = service.get_credit_dashboard_stats(company_id)
+        await cache.set(cache_key, json.dumps(stats), DASHBOARD_STATS_CACHE_TTL)
         return stats
         
     except Exception as e:
@@ -2,7 +2,7 @@
 Credit and discount database models
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Enum, Numeric
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Enum, Numeric, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -45,7 +45,12 @@ class CreditStatus(str, enum.Enum):
 class CustomerCredit(Base):
     """Customer credit model for tracking customer credits"""
     __tablename__ = "customer_credits"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Dashboard aggregates: filter by company/status/date, read amounts from the index
+        Index('ix_customer_credits_company_status', 'company_id', 'status', 'issued_date', 'expiry_date',
+              postgresql_include=['amount']),
+        {'extend_existing': True}
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
@@ -109,7 +114,10 @@ class CustomerCredit(Base):
 class DiscountRule(Base):
     """Discount rule model for defining discount policies"""
     __tablename__ = "discount_rules"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_discount_rules_company_active', 'company_id', 'is_active'),
+        {'extend_existing': True}
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
@@ -170,7 +178,11 @@ class DiscountRule(Base):
 class AppliedDiscount(Base):
     """Applied discount model for tracking discount usage"""
     __tablename__ = "applied_discounts"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_applied_discounts_rule_date', 'discount_rule_id', 'applied_date',
+              postgresql_include=['discount_amount', 'discount_code_used']),
+        {'extend_existing': True}
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
@@ -0,0 +1,377 @@
+"""
+Credit domain repository implementations for different database providers.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from decimal import Decimal
+import logging
+import uuid
+
+from app.common.base_repository import SQLAlchemyRepository, SupabaseRepository
+from app.core.interfaces import DatabaseSession
+from .models import CustomerCredit, CreditTransaction, CreditStatus, DiscountRule, AppliedDiscount
+
+logger = logging.getLogger(__name__)
+
+# Active credits expiring within this many days count as "expiring soon"
+EXPIRING_SOON_DAYS = 30
+
+# Number of discount codes listed on the dashboard
+POPULAR_DISCOUNT_CODES_LIMIT = 5
+
+
+class InsufficientCreditError(ValueError):
+    """Raised when a credit cannot cover the requested amount"""
+
+
+def generate_transaction_number() -> str:
+    """Generate a unique credit transaction number"""
+    return f"CT-{datetime.now().strftime('%y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
+
+
+def _group_applications(applications: List[Dict[str, Any]]) -> "OrderedDict[str, Decimal]":
+    """Sum requested amounts per credit, keeping first-seen order"""
+    totals: "OrderedDict[str, Decimal]" = OrderedDict()
+    for application in applications:
+        amount = Decimal(str(application['amount']))
+        if amount <= 0:
+            raise ValueError("Credit amount must be greater than zero")
+        credit_id = str(application['credit_id'])
+        totals[credit_id] = totals.get(credit_id, Decimal('0')) + amount
+    return totals
+
+
+def _money(value: Any) -> str:
+    """Format an aggregate amount the way the dashboard reports money"""
+    return f"{Decimal(str(value or 0)):.2f}"
+
+
+def empty_dashboard_stats() -> Dict[str, Any]:
+    """Dashboard statistics for a company without credits or discounts"""
+    return {
+        'total_credits_issued': 0,
+        'total_credit_amount': '0.00',
+        'credits_used': 0,
+        'credits_expired': 0,
+        'active_discount_rules': 0,
+        'total_discounts_applied': 0,
+        'total_discount_amount': '0.00',
+        'this_month_credits': 0,
+        'this_month_discounts': 0,
+        'popular_discount_codes': [],
+        'credit_expiring_soon': 0,
+        'last_updated': datetime.now().isoformat()
+    }
+
+
+def _transaction_rows(applications: List[Dict[str, Any]],
+                      balances: Dict[str, Decimal],
+                      processed_by_staff_id: Any) -> List[Dict[str, Any]]:
+    """
+    Build one 'use' transaction per application. balances holds each credit's
+    balance before the batch and is walked down in application order.
+    """
+    now = datetime.utcnow()
+    running = dict(balances)
+    rows = []
+    for application in applications:
+        credit_id = str(application['credit_id'])
+        amount = Decimal(str(application['amount']))
+        balance_before = running[credit_id]
+        balance_after = balance_before - amount
+        running[credit_id] = balance_after
+        rows.append({
+            'id': uuid.uuid4(),
+            'transaction_number': generate_transaction_number(),
+            'customer_credit_id': uuid.UUID(credit_id),
+            'work_order_id': application.get('work_order_id'),
+            'transaction_type': 'use',
+            'amount': amount,
+            'balance_before': balance_before,
+            'balance_after': balance_after,
+            'transaction_date': now,
+            'processed_by_staff_id': processed_by_staff_id,
+            'created_at': now,
+            'updated_at': now,
+        })
+    return rows
+
+
+class CreditRepositoryMixin:
+    """Mixin with credit-specific methods"""
+
+    def consume_credit(self, credit_id: Any, amount: Decimal,
+                       processed_by_staff_id: Any,
+                       work_order_id: Optional[Any] = None) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Deduct amount from a credit and record the transaction.
+
+        Returns:
+            (updated credit, transaction) or None if the credit does not exist
+
+        Raises:
+            InsufficientCreditError: If the credit is not active or cannot cover the amount
+        """
+        result = self.consume_credits(
+            [{'credit_id': credit_id, 'amount': amount, 'work_order_id': work_order_id}],
+            processed_by_staff_id
+        )
+        if result is None:
+            return None
+        credits, transactions = result
+        return credits[0], transactions[0]
+
+
+class CreditSQLAlchemyRepository(SQLAlchemyRepository, CreditRepositoryMixin):
+    """SQLAlchemy-based credit repository for PostgreSQL/SQLite"""
+
+    def __init__(self, session: DatabaseSession):
+        super().__init__(session, CustomerCredit)
+
+    def consume_credits(self, applications: List[Dict[str, Any]],
+                        processed_by_staff_id: Any) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        Apply many credit deductions in the current transaction.
+
+        Each credit is debited by one conditional UPDATE ... RETURNING that
+        only matches while the credit is active, unexpired and still covers
+        the amount, so concurrent payments cannot overdraw it. Transactions
+        are written with a single bulk insert. The caller commits, or rolls
+        back if any application fails.
+
+        Returns:
+            (updated credits, transactions) or None if a credit does not exist
+
+        Raises:
+            InsufficientCreditError: If any credit cannot cover its total
+        """
+        from sqlalchemy import update, select, func, case, literal, or_
+
+        totals = _group_applications(applications)
+        now = datetime.utcnow()
+        status_type = CustomerCredit.__table__.c.status.type
+
+        updated_credits: Dict[str, CustomerCredit] = {}
+        balances: Dict[str, Decimal] = {}
+
+        for credit_id, amount in totals.items():
+            new_remaining = CustomerCredit.remaining_amount - amount
+            exhausted = new_remaining <= 0
+
+            # SET expressions all see the pre-update row, so the status and
+            # used_date checks use the same remaining_amount as the WHERE clause
+            statement = (
+                update(CustomerCredit)
+                .where(
+                    CustomerCredit.id == uuid.UUID(credit_id),
+                    CustomerCredit.status == CreditStatus.ACTIVE,
+                    CustomerCredit.remaining_amount >= amount,
+                    or_(CustomerCredit.expiry_date.is_(None), CustomerCredit.expiry_date > now)
+                )
+                .values(
+                    remaining_amount=new_remaining,
+                    used_amount=func.coalesce(CustomerCredit.used_amount, 0) + amount,
+                    status=case(
+                        (exhausted, literal(CreditStatus.USED, type_=status_type)),
+                        else_=CustomerCredit.status
+                    ),
+                    used_date=case((exhausted, now), else_=CustomerCredit.used_date),
+                    updated_at=now
+                )
+                .returning(CustomerCredit)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            credit = self.db_session.execute(statement).scalars().first()
+
+            if credit is None:
+                exists = self.db_session.execute(
+                    select(CustomerCredit.id).where(CustomerCredit.id == uuid.UUID(credit_id))
+                ).first()
+                if exists is None:
+                    return None
+                raise InsufficientCreditError(f"Insufficient credit balance for credit {credit_id}")
+
+            updated_credits[credit_id] = credit
+            balances[credit_id] = Decimal(str(credit.remaining_amount)) + amount
+
+        rows = _transaction_rows(applications, balances, processed_by_staff_id)
+        self.bulk_insert(rows, CreditTransaction)
+
+        logger.info(f"Applied {len(rows)} credit deductions across {len(totals)} credits")
+        return (
+            [self._convert_to_dict(credit) for credit in updated_credits.values()],
+            [{k: (str(v) if isinstance(v, uuid.UUID) else v) for k, v in row.items()} for row in rows]
+        )
+
+
+    def get_dashboard_stats(self, company_id: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Compute credit and discount dashboard statistics in the database.
+
+        Every counter comes from conditional aggregates, so the whole
+        dashboard is three queries: one pass over customer_credits, one over
+        applied_discounts (with the active rule count as a scalar subquery)
+        and one GROUP BY for the most used discount codes.
+
+        Args:
+            company_id: Optional company filter
+
+        Returns:
+            Dictionary with the dashboard statistics
+        """
+        from sqlalchemy import select, func, case, and_, or_
+
+        now = datetime.utcnow()
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        expiring_cutoff = now + timedelta(days=EXPIRING_SOON_DAYS)
+        company_uuid = uuid.UUID(str(company_id)) if company_id else None
+
+        def count_where(*conditions):
+            return func.count(case((and_(*conditions), 1)))
+
+        is_active = CustomerCredit.status == CreditStatus.ACTIVE
+        credit_query = select(
+            func.count(CustomerCredit.id),
+            func.coalesce(func.sum(CustomerCredit.amount), 0),
+            count_where(CustomerCredit.status == CreditStatus.USED),
+            count_where(or_(
+                CustomerCredit.status == CreditStatus.EXPIRED,
+                and_(is_active, CustomerCredit.expiry_date <= now)
+            )),
+            count_where(CustomerCredit.issued_date >= month_start),
+            count_where(is_active, CustomerCredit.expiry_date > now,
+                        CustomerCredit.expiry_date <= expiring_cutoff)
+        )
+        if company_uuid:
+            credit_query = credit_query.where(CustomerCredit.company_id == company_uuid)
+        (total_credits, credit_amount, credits_used, credits_expired,
+         this_month_credits, expiring_soon) = self.db_session.execute(credit_query).one()
+
+        # Applied discounts carry no company column; scope them through their rule
+        active_rules = select(func.count(DiscountRule.id)).where(DiscountRule.is_active.is_(True))
+        not_reversed = or_(AppliedDiscount.is_reversed.is_(False), AppliedDiscount.is_reversed.is_(None))
+        discount_query = select(
+            func.count(AppliedDiscount.id),
+            func.coalesce(func.sum(AppliedDiscount.discount_amount), 0),
+            count_where(AppliedDiscount.applied_date >= month_start)
+        ).where(not_reversed)
+        codes_query = (
+            select(
+                AppliedDiscount.discount_code_used,
+                func.count(AppliedDiscount.id).label('usage_count'),
+                func.coalesce(func.sum(AppliedDiscount.discount_amount), 0)
+            )
+            .where(not_reversed, AppliedDiscount.discount_code_used.isnot(None))
+            .group_by(AppliedDiscount.discount_code_used)
+            .order_by(func.count(AppliedDiscount.id).desc(), AppliedDiscount.discount_code_used)
+            .limit(POPULAR_DISCOUNT_CODES_LIMIT)
+        )
+        if company_uuid:
+            active_rules = active_rules.where(DiscountRule.company_id == company_uuid)
+            discount_query = discount_query.join(
+                DiscountRule, AppliedDiscount.discount_rule_id == DiscountRule.id
+            ).where(DiscountRule.company_id == company_uuid)
+            codes_query = codes_query.join(
+                DiscountRule, AppliedDiscount.discount_rule_id == DiscountRule.id
+            ).where(DiscountRule.company_id == company_uuid)
+
+        discount_query = discount_query.add_columns(active_rules.scalar_subquery())
+        (total_discounts, discount_amount, this_month_discounts,
+         active_rule_count) = self.db_session.execute(discount_query).one()
+
+        popular_codes = [
+            {'code': code, 'usage_count': usage_count, 'total_amount': _money(amount)}
+            for code, usage_count, amount in self.db_session.execute(codes_query).all()
+        ]
+
+        return {
+            'total_credits_issued': total_credits,
+            'total_credit_amount': _money(credit_amount),
+            'credits_used': credits_used,
+            'credits_expired': credits_expired,
+            'active_discount_rules': active_rule_count,
+            'total_discounts_applied': total_discounts,
+            'total_discount_amount': _money(discount_amount),
+            'this_month_credits': this_month_credits,
+            'this_month_discounts': this_month_discounts,
+            'popular_discount_codes': popular_codes,
+            'credit_expiring_soon': expiring_soon,
+            'last_updated': datetime.now().isoformat()
+        }
+
+
+class CreditSupabaseRepository(SupabaseRepository, CreditRepositoryMixin):
+    """Supabase-based credit repository"""
+
+    def __init__(self, session: DatabaseSession):
+        super().__init__(session, "customer_credits", CustomerCredit)
+
+    def consume_credits(self, applications: List[Dict[str, Any]],
+                        processed_by_staff_id: Any) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        Apply credit deductions with compare-and-set updates.
+
+        The REST API has no multi-statement transactions, so each update only
+        matches while remaining_amount still equals the value that was read;
+        a concurrent change makes it fail instead of overdrawing the credit.
+        """
+        totals = _group_applications(applications)
+        now = datetime.utcnow()
+
+        updated_credits: Dict[str, Dict[str, Any]] = {}
+        balances: Dict[str, Decimal] = {}
+
+        for credit_id, amount in totals.items():
+            credit = self.get_by_id(credit_id)
+            if not credit:
+                return None
+
+            remaining = Decimal(str(credit.get('remaining_amount') or 0))
+            expiry = credit.get('expiry_date')
+            expired = bool(expiry) and datetime.fromisoformat(str(expiry).replace('Z', '')) <= now
+            if credit.get('status') != CreditStatus.ACTIVE.value or expired or remaining < amount:
+                raise InsufficientCreditError(f"Insufficient credit balance for credit {credit_id}")
+
+            new_remaining = remaining - amount
+            update_data = {
+                'remaining_amount': str(new_remaining),
+                'used_amount': str(Decimal(str(credit.get('used_amount') or 0)) + amount),
+                'updated_at': now.isoformat()
+            }
+            if new_remaining <= 0:
+                update_data['status'] = CreditStatus.USED.value
+                update_data['used_date'] = now.isoformat()
+
+            response = self.client.table(self.table_name).update(update_data) \
+                .eq('id', credit_id).eq('remaining_amount', credit.get('remaining_amount')).execute()
+            if not response.data:
+                raise InsufficientCreditError(f"Credit {credit_id} changed concurrently, please retry")
+
+            updated_credits[credit_id] = response.data[0]
+            balances[credit_id] = remaining
+
+        rows = _transaction_rows(applications, balances, processed_by_staff_id)
+        payload = [
+            {k: (str(v) if isinstance(v, (uuid.UUID, Decimal)) else v.isoformat() if isinstance(v, datetime) else v)
+             for k, v in row.items()}
+            for row in rows
+        ]
+        self.client.table("credit_transactions").insert(payload).execute()
+
+        return list(updated_credits.values()), payload
+
+    def get_dashboard_stats(self, company_id: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Aggregates are not available through the REST API; the dashboard
+        falls back to empty statistics for Supabase.
+        """
+        return empty_dashboard_stats()
+
+
+def get_credit_repository(session: DatabaseSession) -> CreditRepositoryMixin:
+    """Factory function to get appropriate credit repository based on database type"""
+    if hasattr(session, 'query') or hasattr(session, 'execute'):
+        return CreditSQLAlchemyRepository(session)
+    return CreditSupabaseRepository(session)
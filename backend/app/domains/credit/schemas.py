@@ -2,8 +2,8 @@
 Credit and discount Pydantic schemas
 """
 
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
@@ -208,6 +208,39 @@ class AppliedDiscount(AppliedDiscountBase):
         from_attributes = True
 
 
+class CreditTransaction(BaseModel):
+    """Credit transaction schema"""
+    id: UUID
+    transaction_number: str
+    customer_credit_id: UUID
+    work_order_id: Optional[UUID] = None
+    payment_id: Optional[UUID] = None
+    transaction_type: str
+    amount: Decimal
+    balance_before: Decimal
+    balance_after: Decimal
+    transaction_date: datetime
+    processed_by_staff_id: UUID
+    description: Optional[str] = None
+    reference_number: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class CreditApplication(BaseModel):
+    """A single credit-to-work-order application in a batch"""
+    credit_id: UUID
+    amount: Decimal = Field(..., gt=0)
+    work_order_id: Optional[UUID] = None
+
+
+class CreditApplicationBatch(BaseModel):
+    """Batch of credit applications applied atomically"""
+    applications: List[CreditApplication] = Field(..., min_length=1)
+    processed_by_staff_id: UUID
+
+
 # Response schemas
 class CustomerCreditResponse(BaseModel):
     """Response schema for customer credit endpoints"""
@@ -222,6 +255,14 @@ class CustomerCreditsResponse(BaseModel):
     total: int
 
 
+class CreditApplicationBatchResponse(BaseModel):
+    """Response schema for batch credit application"""
+    credits: list[CustomerCredit]
+    transactions: list[CreditTransaction]
+    total_applied: Decimal
+    message: Optional[str] = None
+
+
 class DiscountRuleResponse(BaseModel):
     """Response schema for discount rule endpoints"""
     data: Optional[DiscountRule] = None
@@ -10,6 +10,7 @@ from decimal import Decimal
 
 from app.common.base_service import BaseService
 from .models import CustomerCredit, DiscountRule, CreditStatus
+from .repository import get_credit_repository
 from .schemas import CustomerCreditCreate, DiscountRuleCreate, CustomerCreditFilter, DiscountRuleFilter
 
 logger = logging.getLogger(__name__)
@@ -22,13 +23,11 @@ class CreditService(BaseService[CustomerCredit, UUID]):
     
     def get_repository(self):
         """Get the credit repository"""
-        # This would be implemented when we create the credit repository
-        pass
+        return get_credit_repository
     
     def _get_repository_instance(self, session):
         """Get repository instance with the given session"""
-        # This would be implemented when we create the credit repository
-        pass
+        return get_credit_repository(session)
     
     def generate_credit_number(self) -> str:
         """
@@ -112,49 +111,77 @@ class CreditService(BaseService[CustomerCredit, UUID]):
             raise
     
     def use_customer_credit(self, credit_id: UUID, amount_to_use: Decimal, 
+                           processed_by_staff_id: UUID,
                            work_order_id: Optional[UUID] = None) -> Optional[Dict[str, Any]]:
         """
         Use customer credit for payment
         
+        The balance check and deduction happen in one conditional UPDATE, and the
+        transaction record is written in the same database transaction.
+        
         Args:
             credit_id: Credit UUID
             amount_to_use: Amount to use from credit
+            processed_by_staff_id: Staff recording the usage
             work_order_id: Optional work order ID
             
         Returns:
-            Updated credit or None if not found/insufficient
-        """
-        try:
-            credit = self.get_by_id(credit_id)
-            if not credit:
-                return None
-            
-            remaining_amount = Decimal(str(credit.get('remaining_amount', 0)))
-            if amount_to_use > remaining_amount:
-                raise ValueError("Insufficient credit balance")
-            
-            # Update amounts
-            new_remaining = remaining_amount - amount_to_use
-            new_used = Decimal(str(credit.get('used_amount', 0))) + amount_to_use
-            
-            update_data = {
-                'remaining_amount': new_remaining,
-                'used_amount': new_used,
-                'updated_at': datetime.utcnow()
-            }
-            
-            # Mark as used if fully consumed
-            if new_remaining <= 0:
-                update_data['status'] = CreditStatus.USED
-                update_data['used_date'] = datetime.utcnow()
+            Updated credit or None if not found
             
-            # Create credit transaction record
-            self.create_credit_transaction(credit_id, amount_to_use, work_order_id)
+        Raises:
+            ValueError: If the credit is inactive, expired or has insufficient balance
+        """
+        result = self.apply_credits([
+            {'credit_id': credit_id, 'amount': amount_to_use, 'work_order_id': work_order_id}
+        ], processed_by_staff_id)
+        if result is None:
+            return None
+        return result['credits'][0]
+    
+    def apply_credits(self, applications: List[Dict[str, Any]],
+                      processed_by_staff_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Apply credits to many work orders atomically
+        
+        Args:
+            applications: Dictionaries with credit_id, amount and optional work_order_id.
+                A credit may appear several times; its total must fit its balance.
+            processed_by_staff_id: Staff recording the usage
             
-            return self.update(credit_id, update_data)
+        Returns:
+            Dictionary with updated credits, transactions and total applied,
+            or None if any credit was not found (nothing is applied)
             
+        Raises:
+            ValueError: If any credit cannot cover its amount (nothing is applied)
+        """
+        if not applications:
+            raise ValueError("No credit applications provided")
+        
+        try:
+            session = self.database.get_session()
+            try:
+                repository = self._get_repository_instance(session)
+                result = repository.consume_credits(applications, processed_by_staff_id)
+                if result is None:
+                    session.rollback()
+                    return None
+                
+                session.commit()
+                credits, transactions = result
+                return {
+                    'credits': credits,
+                    'transactions': transactions,
+                    'total_applied': sum((Decimal(str(a['amount'])) for a in applications), Decimal('0'))
+                }
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+                
         except Exception as e:
-            logger.error(f"Error using customer credit: {e}")
+            logger.error(f"Error applying customer credits: {e}")
             raise
     
     def create_credit_transaction(self, credit_id: UUID, amount: Decimal, 
@@ -361,27 +388,16 @@ class CreditService(BaseService[CustomerCredit, UUID]):
         Returns:
             Dictionary with various statistics
         """
+        session = self.database.get_readonly_session()
         try:
-            # This would calculate real statistics from the database
-            # For now, return mock data
-            return {
-                'total_credits_issued': 0,
-                'total_credit_amount': '0.00',
-                'credits_used': 0,
-                'credits_expired': 0,
-                'active_discount_rules': 0,
-                'total_discounts_applied': 0,
-                'total_discount_amount': '0.00',
-                'this_month_credits': 0,
-                'this_month_discounts': 0,
-                'popular_discount_codes': [],
-                'credit_expiring_soon': 0,
-                'last_updated': datetime.now().isoformat()
-            }
+            repository = self._get_repository_instance(session)
+            return repository.get_dashboard_stats(company_id)
             
         except Exception as e:
             logger.error(f"Error getting credit dashboard stats: {e}")
             raise
+        finally:
+            session.close()
     
     def _validate_create_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate credit creation data"""
@@ -4,7 +4,7 @@ Dashboard API endpoints
 
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, date
 import traceback
 from app.domains.dashboard.schemas import (
     UserDashboardData, ManagerDashboardData, AdminDashboardData,
@@ -284,4 +284,29 @@ async def update_revision_status(
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/rollups/rebuild")
+async def rebuild_dashboard_rollups(
+    start_date: Optional[date] = Query(None, description="First day to rebuild (inclusive)"),
+    end_date: Optional[date] = Query(None, description="Last day to rebuild (inclusive)"),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """Recompute dashboard rollups from source documents (backfill)"""
+    if current_staff.role not in [StaffRole.admin, StaffRole.super_admin]:
+        raise HTTPException(status_code=403, detail="Access denied. Admin role required.")
+    
+    from app.domains.dashboard.rollup_service import DashboardRollupService
+    
+    try:
+        written = DashboardRollupService().rebuild(start_date, end_date)
+        return {
+            "message": "Dashboard rollups rebuilt successfully",
+            "start_date": start_date,
+            "end_date": end_date,
+            "rows_written": written
+        }
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,46 @@
+"""
+Dashboard rollup models
+"""
+
+from sqlalchemy import Column, String, Integer, Date, DateTime, DECIMAL, Index, UniqueConstraint
+from datetime import datetime
+
+from app.core.database_factory import Base
+from app.core.database_types import UUIDType, generate_uuid
+
+
+# Rollup rows need a non-null company key so the unique constraint can be used
+# as an upsert target (NULLs never conflict). Documents without a company land here.
+UNASSIGNED_COMPANY_ID = "00000000-0000-0000-0000-000000000000"
+
+
+class DashboardDailyRollup(Base):
+    """
+    Per-company, per-day document summary kept current by the rollup hooks.
+
+    One row per (company, day, metric, status). Dashboards sum rows over a date
+    range instead of scanning every invoice, estimate and work order.
+    """
+    __tablename__ = "dashboard_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint('company_id', 'rollup_date', 'metric', 'status', name='uq_dashboard_rollup_key'),
+        Index('ix_dashboard_rollup_metric_date', 'metric', 'rollup_date'),
+        {'extend_existing': True}
+    )
+
+    id = Column(UUIDType(), primary_key=True, default=generate_uuid)
+    company_id = Column(UUIDType(), nullable=False, default=UNASSIGNED_COMPANY_ID)
+    rollup_date = Column(Date, nullable=False)
+    metric = Column(String(50), nullable=False)  # invoice_created, invoice_billed, estimate_created, work_order_completed
+    status = Column(String(50), nullable=False, default="")
+
+    document_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(DECIMAL(15, 2), nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return (
+            f"<DashboardDailyRollup(company_id={self.company_id}, date={self.rollup_date}, "
+            f"metric={self.metric}, status={self.status}, count={self.document_count})>"
+        )
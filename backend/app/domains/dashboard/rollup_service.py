@@ -0,0 +1,481 @@
+"""
+Dashboard rollup service
+
+Keeps per-company, per-day summaries of invoices, estimates and work orders in
+``dashboard_daily_rollups`` so dashboard statistics read O(days in range) rows
+instead of loading every document on each request.
+
+Rollups are adjusted by mapper event hooks in the same transaction as the
+document write, which covers every write path (services, repositories and API
+handlers that use the ORM directly). Bulk Core statements bypass the hooks, so
+``rebuild`` recomputes a date range from the source tables for backfills.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import defaultdict
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+import logging
+
+from sqlalchemy import event, func, select, insert, update, delete, inspect as sa_inspect
+from sqlalchemy.orm.base import NO_VALUE
+
+from app.core.database_factory import get_database
+from app.core.database_types import generate_uuid
+from app.core.interfaces import DatabaseProvider
+from app.domains.dashboard.models import DashboardDailyRollup, UNASSIGNED_COMPANY_ID
+from app.domains.invoice.models import Invoice
+from app.domains.estimate.models import Estimate
+from app.domains.work_order.models import WorkOrder, WorkOrderStatus
+
+logger = logging.getLogger(__name__)
+
+# Metrics tracked in the rollup table
+METRIC_INVOICE_CREATED = "invoice_created"    # keyed by invoice created_at
+METRIC_INVOICE_BILLED = "invoice_billed"      # keyed by invoice_date (falls back to created_at)
+METRIC_ESTIMATE_CREATED = "estimate_created"  # keyed by estimate created_at
+METRIC_WORK_ORDER_COMPLETED = "work_order_completed"  # keyed by actual_end_date (falls back to updated_at)
+
+ALL_METRICS = (
+    METRIC_INVOICE_CREATED,
+    METRIC_INVOICE_BILLED,
+    METRIC_ESTIMATE_CREATED,
+    METRIC_WORK_ORDER_COMPLETED,
+)
+
+# Marker row written by a full rebuild. Until one exists the rollups only hold
+# changes made since the table was created, so dashboards keep scanning.
+METRIC_REBUILD_COMPLETED = "rebuild_completed"
+
+# Set once this process has seen the rebuild marker
+_rollups_ready = False
+
+_STASH_KEY = "dashboard_rollup_before"
+
+RollupKey = Tuple[str, date, str, str]
+Contribution = Tuple[RollupKey, Decimal]
+
+
+def _as_date(value: Any) -> Optional[date]:
+    """Normalize datetime/date/ISO string values to a date"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+        except ValueError:
+            return None
+    return None
+
+
+def _as_decimal(value: Any) -> Decimal:
+    """Convert stored amounts (Decimal, float or string) to Decimal"""
+    if value is None or value == '':
+        return Decimal('0')
+    try:
+        return Decimal(str(value))
+    except Exception:
+        return Decimal('0')
+
+
+def _company_key(company_id: Any) -> str:
+    return str(company_id) if company_id else UNASSIGNED_COMPANY_ID
+
+
+def _status_value(status: Any) -> str:
+    if status is None:
+        return ""
+    return str(getattr(status, 'value', status))
+
+
+def _invoice_contributions(values: Dict[str, Any]) -> List[Contribution]:
+    company_id = _company_key(values.get('company_id'))
+    status = _status_value(values.get('status'))
+    amount = _as_decimal(values.get('total_amount'))
+    created = _as_date(values.get('created_at'))
+
+    contributions = []
+    if created:
+        contributions.append(((company_id, created, METRIC_INVOICE_CREATED, status), amount))
+    billed = _as_date(values.get('invoice_date')) or created
+    if billed:
+        contributions.append(((company_id, billed, METRIC_INVOICE_BILLED, status), amount))
+    return contributions
+
+
+def _estimate_contributions(values: Dict[str, Any]) -> List[Contribution]:
+    created = _as_date(values.get('created_at'))
+    if not created:
+        return []
+    key = (
+        _company_key(values.get('company_id')),
+        created,
+        METRIC_ESTIMATE_CREATED,
+        _status_value(values.get('status')),
+    )
+    return [(key, _as_decimal(values.get('total_amount')))]
+
+
+def _work_order_contributions(values: Dict[str, Any]) -> List[Contribution]:
+    status = _status_value(values.get('status'))
+    if status != WorkOrderStatus.COMPLETED.value:
+        return []
+    completed = _as_date(values.get('actual_end_date') or values.get('updated_at'))
+    if not completed:
+        return []
+    key = (_company_key(values.get('company_id')), completed, METRIC_WORK_ORDER_COMPLETED, status)
+    return [(key, Decimal('0'))]
+
+
+# model -> (fields read by the contribution function, contribution function)
+_TRACKED_MODELS = {
+    Invoice: (('company_id', 'status', 'total_amount', 'created_at', 'invoice_date'), _invoice_contributions),
+    Estimate: (('company_id', 'status', 'total_amount', 'created_at'), _estimate_contributions),
+    WorkOrder: (('company_id', 'status', 'actual_end_date', 'updated_at'), _work_order_contributions),
+}
+
+
+def _snapshot(connection, target, fields: Tuple[str, ...], committed: bool) -> Dict[str, Any]:
+    """
+    Read tracked field values from an instance.
+
+    With ``committed=True`` the pre-flush values are returned (for updates and
+    deletes). Attributes that are not loaded, such as server defaults right
+    after an insert, are read from the row within the current transaction.
+    """
+    state = sa_inspect(target)
+    values = {}
+    missing = []
+    for field in fields:
+        if committed and field in state.committed_state:
+            value = state.committed_state[field]
+        else:
+            value = state.dict.get(field, NO_VALUE)
+        if value is NO_VALUE:
+            missing.append(field)
+        else:
+            values[field] = value
+
+    if missing:
+        table = target.__table__
+        row = connection.execute(
+            select(*[table.c[field] for field in missing]).where(table.c.id == target.id)
+        ).first()
+        for field in missing:
+            values[field] = row._mapping[field] if row is not None else None
+
+    return values
+
+
+def _upsert_rollup(connection, key: RollupKey, count: int, amount: Decimal) -> None:
+    """Add count/amount to a rollup row, creating it if needed"""
+    table = DashboardDailyRollup.__table__
+    company_id, rollup_date, metric, status = key
+    now = datetime.utcnow()
+    dialect = connection.dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        stmt = dialect_insert(table).values(
+            id=generate_uuid(),
+            company_id=company_id,
+            rollup_date=rollup_date,
+            metric=metric,
+            status=status,
+            document_count=count,
+            total_amount=amount,
+            updated_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['company_id', 'rollup_date', 'metric', 'status'],
+            set_={
+                'document_count': table.c.document_count + stmt.excluded.document_count,
+                'total_amount': table.c.total_amount + stmt.excluded.total_amount,
+                'updated_at': stmt.excluded.updated_at,
+            }
+        )
+        connection.execute(stmt)
+        return
+
+    result = connection.execute(
+        update(table)
+        .where(
+            table.c.company_id == company_id,
+            table.c.rollup_date == rollup_date,
+            table.c.metric == metric,
+            table.c.status == status
+        )
+        .values(
+            document_count=table.c.document_count + count,
+            total_amount=table.c.total_amount + amount,
+            updated_at=now
+        )
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(
+            id=generate_uuid(),
+            company_id=company_id,
+            rollup_date=rollup_date,
+            metric=metric,
+            status=status,
+            document_count=count,
+            total_amount=amount,
+            updated_at=now
+        ))
+
+
+def apply_rollup_changes(connection, before: List[Contribution], after: List[Contribution]) -> None:
+    """Apply the net difference between two sets of contributions"""
+    deltas: Dict[RollupKey, List] = defaultdict(lambda: [0, Decimal('0')])
+    for key, amount in before:
+        deltas[key][0] -= 1
+        deltas[key][1] -= amount
+    for key, amount in after:
+        deltas[key][0] += 1
+        deltas[key][1] += amount
+
+    for key, (count, amount) in deltas.items():
+        if count == 0 and amount == 0:
+            continue
+        _upsert_rollup(connection, key, count, amount)
+
+
+def _register_rollup_hooks(model, fields: Tuple[str, ...], contributions) -> None:
+    """Attach insert/update/delete hooks that keep rollups current for a model"""
+
+    @event.listens_for(model, 'after_insert')
+    def _after_insert(mapper, connection, target):
+        apply_rollup_changes(connection, [], contributions(_snapshot(connection, target, fields, committed=False)))
+
+    @event.listens_for(model, 'before_update')
+    def _before_update(mapper, connection, target):
+        sa_inspect(target).info[_STASH_KEY] = contributions(
+            _snapshot(connection, target, fields, committed=True)
+        )
+
+    @event.listens_for(model, 'after_update')
+    def _after_update(mapper, connection, target):
+        before = sa_inspect(target).info.pop(_STASH_KEY, [])
+        after = contributions(_snapshot(connection, target, fields, committed=False))
+        apply_rollup_changes(connection, before, after)
+
+    @event.listens_for(model, 'before_delete')
+    def _before_delete(mapper, connection, target):
+        sa_inspect(target).info[_STASH_KEY] = contributions(
+            _snapshot(connection, target, fields, committed=True)
+        )
+
+    @event.listens_for(model, 'after_delete')
+    def _after_delete(mapper, connection, target):
+        apply_rollup_changes(connection, sa_inspect(target).info.pop(_STASH_KEY, []), [])
+
+
+for _model, (_fields, _contributions) in _TRACKED_MODELS.items():
+    _register_rollup_hooks(_model, _fields, _contributions)
+
+
+class DashboardRollupService:
+    """Reads and rebuilds dashboard rollups"""
+
+    def __init__(self, database: DatabaseProvider = None):
+        self.database = database or get_database()
+
+    @property
+    def enabled(self) -> bool:
+        """Rollups are maintained only for SQLAlchemy-backed databases"""
+        return hasattr(self.database, 'engine')
+
+    @property
+    def ready(self) -> bool:
+        """Rollups are enabled and have been backfilled by a full rebuild"""
+        global _rollups_ready
+        if _rollups_ready or not self.enabled:
+            return _rollups_ready
+
+        table = DashboardDailyRollup.__table__
+        try:
+            with self.database.get_readonly_session() as session:
+                marker = session.execute(
+                    select(table.c.id).where(table.c.metric == METRIC_REBUILD_COMPLETED).limit(1)
+                ).first()
+        except Exception as e:
+            logger.warning(f"Could not check dashboard rollup state: {e}")
+            return False
+
+        _rollups_ready = marker is not None
+        return _rollups_ready
+
+    def get_totals(self,
+                   metric: str,
+                   start_date: date,
+                   end_date: Optional[date] = None,
+                   company_id: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Sum a metric over a date range, grouped by status.
+
+        Args:
+            metric: One of the METRIC_* constants
+            start_date: First day of the range (inclusive)
+            end_date: Last day of the range (inclusive), open-ended if None
+            company_id: Optional company filter
+
+        Returns:
+            Dictionary of status -> {'count': int, 'amount': float}
+        """
+        table = DashboardDailyRollup.__table__
+        query = select(
+            table.c.status,
+            func.sum(table.c.document_count),
+            func.sum(table.c.total_amount)
+        ).where(
+            table.c.metric == metric,
+            table.c.rollup_date >= start_date
+        )
+        if end_date:
+            query = query.where(table.c.rollup_date <= end_date)
+        if company_id:
+            query = query.where(table.c.company_id == str(company_id))
+        query = query.group_by(table.c.status)
+
+        with self.database.get_readonly_session() as session:
+            rows = session.execute(query).all()
+
+        return {
+            status: {'count': int(count or 0), 'amount': float(amount or 0)}
+            for status, count, amount in rows
+        }
+
+    def get_count(self,
+                  metric: str,
+                  start_date: date,
+                  end_date: Optional[date] = None,
+                  company_id: Optional[str] = None,
+                  statuses: Optional[List[str]] = None) -> int:
+        """Total document count for a metric, optionally limited to statuses"""
+        totals = self.get_totals(metric, start_date, end_date, company_id)
+        return sum(
+            values['count'] for status, values in totals.items()
+            if statuses is None or status in statuses
+        )
+
+    def rebuild(self,
+                start_date: Optional[date] = None,
+                end_date: Optional[date] = None) -> Dict[str, int]:
+        """
+        Recompute rollups from the source tables.
+
+        Existing rollup rows in the range are replaced. With no range, the
+        whole table is rebuilt and the rebuild is recorded, which switches
+        dashboards from scanning documents to reading rollups.
+
+        Args:
+            start_date: First day to rebuild (inclusive)
+            end_date: Last day to rebuild (inclusive)
+
+        Returns:
+            Dictionary of metric -> number of rollup rows written
+        """
+        global _rollups_ready
+        if not self.enabled:
+            raise RuntimeError("Dashboard rollups require a SQLAlchemy database")
+
+        invoices = Invoice.__table__
+        estimates = Estimate.__table__
+        work_orders = WorkOrder.__table__
+
+        sources = {
+            METRIC_INVOICE_CREATED: (invoices, invoices.c.created_at, invoices.c.status, invoices.c.total_amount, None),
+            METRIC_INVOICE_BILLED: (
+                invoices,
+                func.coalesce(invoices.c.invoice_date, invoices.c.created_at),
+                invoices.c.status,
+                invoices.c.total_amount,
+                None
+            ),
+            METRIC_ESTIMATE_CREATED: (estimates, estimates.c.created_at, estimates.c.status, estimates.c.total_amount, None),
+            METRIC_WORK_ORDER_COMPLETED: (
+                work_orders,
+                func.coalesce(work_orders.c.actual_end_date, work_orders.c.updated_at),
+                work_orders.c.status,
+                None,
+                work_orders.c.status == WorkOrderStatus.COMPLETED
+            ),
+        }
+
+        rollups = DashboardDailyRollup.__table__
+        written = {}
+
+        with self.database.get_session() as session:
+            for metric, (table, date_expr, status_col, amount_col, condition) in sources.items():
+                day = func.date(date_expr)
+                amount = func.sum(amount_col) if amount_col is not None else func.sum(0)
+                query = select(table.c.company_id, day, status_col, func.count(), amount).where(date_expr.isnot(None))
+                if condition is not None:
+                    query = query.where(condition)
+                if start_date:
+                    query = query.where(date_expr >= datetime.combine(start_date, time.min))
+                if end_date:
+                    query = query.where(date_expr < datetime.combine(end_date + timedelta(days=1), time.min))
+                query = query.group_by(table.c.company_id, day, status_col)
+
+                # Merge in Python: NULL companies share the unassigned key
+                aggregated: Dict[RollupKey, List] = defaultdict(lambda: [0, Decimal('0')])
+                for company_id, rollup_day, status, count, total in session.execute(query).all():
+                    rollup_day = _as_date(rollup_day)
+                    if rollup_day is None:
+                        continue
+                    key = (_company_key(company_id), rollup_day, metric, _status_value(status))
+                    aggregated[key][0] += int(count or 0)
+                    aggregated[key][1] += _as_decimal(total)
+
+                clear = delete(rollups).where(rollups.c.metric == metric)
+                if start_date:
+                    clear = clear.where(rollups.c.rollup_date >= start_date)
+                if end_date:
+                    clear = clear.where(rollups.c.rollup_date <= end_date)
+                session.execute(clear)
+
+                now = datetime.utcnow()
+                rows = [
+                    {
+                        'id': generate_uuid(),
+                        'company_id': key[0],
+                        'rollup_date': key[1],
+                        'metric': key[2],
+                        'status': key[3],
+                        'document_count': count,
+                        'total_amount': total,
+                        'updated_at': now,
+                    }
+                    for key, (count, total) in aggregated.items()
+                ]
+                if rows:
+                    session.execute(insert(rollups), rows)
+                written[metric] = len(rows)
+
+            if start_date is None and end_date is None:
+                session.execute(delete(rollups).where(rollups.c.metric == METRIC_REBUILD_COMPLETED))
+                session.execute(insert(rollups), [{
+                    'id': generate_uuid(),
+                    'company_id': UNASSIGNED_COMPANY_ID,
+                    'rollup_date': date.today(),
+                    'metric': METRIC_REBUILD_COMPLETED,
+                    'status': '',
+                    'document_count': 0,
+                    'total_amount': Decimal('0'),
+                    'updated_at': datetime.utcnow(),
+                }])
+
+        if start_date is None and end_date is None:
+            _rollups_ready = True
+
+        logger.info(f"Rebuilt dashboard rollups ({start_date} - {end_date}): {written}")
+        return written
@@ -2,7 +2,8 @@
 Dashboard service for generating dashboard data
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
+from collections import defaultdict
 from datetime import datetime, timedelta, date
 import logging
 from app.core.database_factory import get_database
@@ -15,6 +16,10 @@ from app.domains.work_order.service import WorkOrderService
 from app.domains.invoice.service import InvoiceService
 from app.domains.estimate.service import EstimateService
 from app.domains.staff.service import StaffService
+from app.domains.dashboard.rollup_service import (
+    DashboardRollupService, METRIC_INVOICE_CREATED, METRIC_INVOICE_BILLED,
+    METRIC_ESTIMATE_CREATED, METRIC_WORK_ORDER_COMPLETED
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +33,7 @@ class DashboardService:
         self.invoice_service = InvoiceService(self.database)
         self.estimate_service = EstimateService(self.database)
         self.staff_service = StaffService(self.database)
+        self.rollup_service = DashboardRollupService(self.database)
     
     def calculate_priority(self, created_at: datetime) -> Priority:
         """
@@ -89,39 +95,86 @@ class DashboardService:
         
         return start_date, end_date
     
-    def get_work_order_assignments(self, staff_id: str) -> List[Dict[str, Any]]:
-        """Get work orders assigned to a specific staff member"""
+    def get_work_order_assignments(self, staff_id: Union[str, List[str]]) -> List[Dict[str, Any]]:
+        """Get work orders assigned to a staff member (or any of a list of staff members)"""
         try:
-            # Get work orders where staff is assigned
-            with self.database.get_session() as session:
-                # Query work_order_staff_assignments table
-                query = """
-                    SELECT DISTINCT wo.* 
-                    FROM work_orders wo
-                    JOIN work_order_staff_assignments wosa ON wo.id = wosa.work_order_id
-                    WHERE wosa.staff_id = :staff_id 
-                    AND wosa.is_active = true
-                    AND wo.is_active = true
-                    ORDER BY wo.created_at ASC
-                """
-                # For SQLite/development, we'll use the simpler approach
-                # In production with proper junction table, use the above query
-                
-                # Fallback to using assigned_to_staff_id for now
-                work_orders = self.work_order_service.get_all()
-                assigned_orders = [
-                    wo for wo in work_orders 
-                    if wo.get('assigned_to_staff_id') == staff_id
-                ]
-                return assigned_orders
-                
+            # Filter in the database instead of loading every work order
+            return self.work_order_service.get_all(
+                filters={'assigned_to_staff_id': staff_id},
+                order_by='created_at'
+            )
         except Exception as e:
             logger.error(f"Error getting work order assignments: {e}")
             return []
     
+    def _resolve_assigned_staff(self, work_orders: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Resolve the assignees of many work orders with one batched staff lookup"""
+        try:
+            return self.staff_service.get_by_ids(
+                wo.get('assigned_to_staff_id') for wo in work_orders
+            )
+        except Exception as e:
+            logger.error(f"Error resolving assigned staff: {e}")
+            return {}
+    
+    @staticmethod
+    def _assigned_staff_summary(wo: Dict[str, Any], staff_by_id: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build the assigned_staff entries for a work order from a prefetched staff map"""
+        assigned_staff = []
+        if wo.get('assigned_to_staff_id'):
+            staff = staff_by_id.get(str(wo['assigned_to_staff_id']))
+            if staff:
+                assigned_staff.append({
+                    'id': staff['id'],
+                    'name': staff.get('name', ''),
+                    'role': staff.get('role', '')
+                })
+        return assigned_staff
+    
     def get_document_completions(self, staff_id: Optional[str], period: TimePeriod) -> List[DocumentCompletionStats]:
         """Get document completion statistics for a time period"""
         start_date, end_date = self.get_time_period_dates(period)
+        
+        if not self.rollup_service.ready:
+            return self._scan_document_completions(start_date, end_date)
+        
+        try:
+            stats = []
+            
+            # Invoices: completed or paid, keyed by creation date
+            invoice_totals = self.rollup_service.get_totals(METRIC_INVOICE_CREATED, start_date, end_date)
+            invoice_done = {k: v for k, v in invoice_totals.items() if k in ('completed', 'paid')}
+            invoice_count = sum(v['count'] for v in invoice_done.values())
+            if invoice_count > 0:
+                stats.append(DocumentCompletionStats(
+                    document_type='invoice',
+                    completed_count=invoice_count,
+                    paid_count=invoice_done.get('paid', {}).get('count', 0),
+                    total_amount=sum(v['amount'] for v in invoice_done.values()),
+                    average_completion_time_hours=None
+                ))
+            
+            # Estimates: completed or approved, keyed by creation date
+            estimate_totals = self.rollup_service.get_totals(METRIC_ESTIMATE_CREATED, start_date, end_date)
+            estimate_done = {k: v for k, v in estimate_totals.items() if k in ('completed', 'approved')}
+            estimate_count = sum(v['count'] for v in estimate_done.values())
+            if estimate_count > 0:
+                stats.append(DocumentCompletionStats(
+                    document_type='estimate',
+                    completed_count=estimate_count,
+                    paid_count=0,
+                    total_amount=sum(v['amount'] for v in estimate_done.values()),
+                    average_completion_time_hours=None
+                ))
+            
+            return stats
+            
+        except Exception as e:
+            logger.error(f"Error getting document completions: {e}")
+            return []
+    
+    def _scan_document_completions(self, start_date: date, end_date: date) -> List[DocumentCompletionStats]:
+        """Compute document completions by scanning documents (databases without rollups)"""
         stats_by_type = {}
         
         try:
@@ -184,14 +237,14 @@ class DashboardService:
         revision_docs = []
         
         try:
-            # Check work orders with revision_requested flag
-            work_orders = self.work_order_service.get_all()
+            # Only work orders with the revision_requested flag (and assignee, if given)
+            filters = {'revision_requested': True}
+            if staff_id:
+                filters['assigned_to_staff_id'] = staff_id
+            
+            work_orders = self.work_order_service.get_all(filters=filters)
             for wo in work_orders:
                 if wo.get('revision_requested'):
-                    # Check if assigned to this staff member (if staff_id provided)
-                    if staff_id and wo.get('assigned_to_staff_id') != staff_id:
-                        continue
-                    
                     revision_date = wo.get('last_revision_date') or wo.get('updated_at')
                     if isinstance(revision_date, str):
                         revision_date = datetime.fromisoformat(revision_date.replace('Z', '+00:00'))
@@ -234,6 +287,9 @@ class DashboardService:
         completed_today = 0
         completed_this_week = 0
         
+        # Resolve every assignee up front instead of one lookup per work order
+        staff_by_id = self._resolve_assigned_staff(work_orders)
+        
         for wo in work_orders:
             # Calculate priority based on creation time
             created_at = wo.get('created_at')
@@ -252,15 +308,7 @@ class DashboardService:
                 is_overdue = scheduled_end < now
             
             # Get assigned staff info (for multi-staff support)
-            assigned_staff = []
-            if wo.get('assigned_to_staff_id'):
-                staff = self.staff_service.get_by_id(wo['assigned_to_staff_id'])
-                if staff:
-                    assigned_staff.append({
-                        'id': staff['id'],
-                        'name': staff.get('name', ''),
-                        'role': staff.get('role', '')
-                    })
+            assigned_staff = self._assigned_staff_summary(wo, staff_by_id)
             
             wo_summary = WorkOrderSummary(
                 id=wo['id'],
@@ -339,10 +387,21 @@ class DashboardService:
         }
         work_distribution = {}
         
+        # Fetch the whole team's assignments and revisions in two queries, then group
+        staff_ids = [str(staff['id']) for staff in all_staff]
+        work_orders_by_staff: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        revisions_by_staff: Dict[str, int] = defaultdict(int)
+        if staff_ids:
+            for wo in self.get_work_order_assignments(staff_ids):
+                work_orders_by_staff[str(wo.get('assigned_to_staff_id'))].append(wo)
+            for revision in self.get_documents_requiring_revision(None):
+                if revision.assigned_to:
+                    revisions_by_staff[str(revision.assigned_to)] += 1
+        
         for staff in all_staff:
             # Get stats for each team member
-            member_work_orders = self.get_work_order_assignments(staff['id'])
-            member_revisions = self.get_documents_requiring_revision(staff['id'])
+            member_work_orders = work_orders_by_staff.get(str(staff['id']), [])
+            member_revision_count = revisions_by_staff.get(str(staff['id']), 0)
             
             # Count completions
             today = date.today()
@@ -369,7 +428,7 @@ class DashboardService:
                 assigned_work_orders=len(member_work_orders),
                 completed_today=member_completed_today,
                 completed_this_week=member_completed_week,
-                pending_revisions=len(member_revisions),
+                pending_revisions=member_revision_count,
                 average_completion_time_hours=None  # TODO: Calculate this
             ))
             
@@ -377,7 +436,7 @@ class DashboardService:
             team_stats['total_assigned'] += len(member_work_orders)
             team_stats['completed_today'] += member_completed_today
             team_stats['completed_this_week'] += member_completed_week
-            team_stats['pending_revisions'] += len(member_revisions)
+            team_stats['pending_revisions'] += member_revision_count
             
             # Work distribution
             work_distribution[str(staff['id'])] = len(member_work_orders)
@@ -408,6 +467,10 @@ class DashboardService:
         today = date.today()
         week_start = today - timedelta(days=today.weekday())
         now = datetime.utcnow()
+        use_rollups = self.rollup_service.ready
+        
+        # Resolve every assignee up front instead of one lookup per work order
+        staff_by_id = self._resolve_assigned_staff(all_work_orders)
         
         for wo in all_work_orders:
             created_at = wo.get('created_at')
@@ -426,15 +489,7 @@ class DashboardService:
                 is_overdue = scheduled_end < now
             
             # Get assigned staff
-            assigned_staff = []
-            if wo.get('assigned_to_staff_id'):
-                staff = self.staff_service.get_by_id(wo['assigned_to_staff_id'])
-                if staff:
-                    assigned_staff.append({
-                        'id': staff['id'],
-                        'name': staff.get('name', ''),
-                        'role': staff.get('role', '')
-                    })
+            assigned_staff = self._assigned_staff_summary(wo, staff_by_id)
             
             all_wo_summaries.append(WorkOrderSummary(
                 id=wo['id'],
@@ -453,8 +508,8 @@ class DashboardService:
                 revision_count=wo.get('revision_count', 0)
             ))
             
-            # Count system-wide stats
-            if wo.get('status') == 'completed':
+            # Count system-wide stats (from rollups when available)
+            if not use_rollups and wo.get('status') == 'completed':
                 completed_date = wo.get('actual_end_date') or wo.get('updated_at')
                 if isinstance(completed_date, str):
                     completed_date = datetime.fromisoformat(completed_date.replace('Z', '+00:00'))
@@ -467,25 +522,33 @@ class DashboardService:
             if wo.get('revision_requested'):
                 system_pending_revisions += 1
         
-        # Get company count
+        # Get company count (COUNT(*) rather than loading every company)
         from app.domains.company.service import CompanyService
         company_service = CompanyService(self.database)
-        companies = company_service.get_all()
+        companies_count = company_service.count()
         
         # Calculate total revenue for the period
         start_date, end_date = self.get_time_period_dates(filters.time_period)
         total_revenue = 0.0
         
-        # Sum invoice amounts in the period
-        invoices = self.invoice_service.get_all()
-        for invoice in invoices:
-            invoice_date = invoice.get('invoice_date') or invoice.get('created_at')
-            if isinstance(invoice_date, str):
-                invoice_date = datetime.fromisoformat(invoice_date.replace('Z', '+00:00'))
+        if use_rollups:
+            system_completed_today = self.rollup_service.get_count(METRIC_WORK_ORDER_COMPLETED, today, today)
+            system_completed_week = self.rollup_service.get_count(METRIC_WORK_ORDER_COMPLETED, week_start)
             
-            if start_date <= invoice_date.date() <= end_date:
-                if invoice.get('status') == 'paid':
-                    total_revenue += float(invoice.get('total_amount', 0))
+            # Paid invoices keyed by invoice date
+            billed = self.rollup_service.get_totals(METRIC_INVOICE_BILLED, start_date, end_date)
+            total_revenue = billed.get('paid', {}).get('amount', 0.0)
+        else:
+            # Sum invoice amounts in the period
+            invoices = self.invoice_service.get_all()
+            for invoice in invoices:
+                invoice_date = invoice.get('invoice_date') or invoice.get('created_at')
+                if isinstance(invoice_date, str):
+                    invoice_date = datetime.fromisoformat(invoice_date.replace('Z', '+00:00'))
+                
+                if start_date <= invoice_date.date() <= end_date:
+                    if invoice.get('status') == 'paid':
+                        total_revenue += float(invoice.get('total_amount', 0))
         
         return AdminDashboardData(
             **manager_data.dict(),
@@ -494,6 +557,6 @@ class DashboardService:
             system_completed_today=system_completed_today,
             system_completed_this_week=system_completed_week,
             system_pending_revisions=system_pending_revisions,
-            companies_count=len(companies),
+            companies_count=companies_count,
             total_revenue_this_period=total_revenue
         )
\ No newline at end of file
@@ -4,10 +4,12 @@ Document API endpoints (combined estimates and invoices)
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from typing import Optional
 import io
 from app.domains.document.schemas import Document, DocumentFilter, PaginatedDocuments
 from app.domains.document.service import DocumentService
+from app.common.utils.streaming_export import CSV_MEDIA_TYPE, XLSX_MEDIA_TYPE, close_rows
 
 router = APIRouter()
 
@@ -112,18 +114,35 @@ async def send_document(document_id: str, email: str):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/export")
-async def export_documents(filter_params: DocumentFilter):
-    """Export documents to Excel"""
+async def export_documents(
+    filter_params: DocumentFilter,
+    format: str = Query("xlsx", pattern="^(xlsx|csv)$", description="Export format: xlsx or csv")
+):
+    """Export documents to Excel or CSV (streamed)"""
     service = DocumentService()
     try:
-        excel_bytes = service.export_to_excel(filter_params)
+        # Closing the stream afterwards releases its database session when the client disconnects
+        if format == "csv":
+            stream = service.export_to_csv(filter_params)
+            return StreamingResponse(
+                stream,
+                media_type=CSV_MEDIA_TYPE,
+                headers={
+                    "Content-Disposition": "attachment; filename=documents_export.csv"
+                },
+                background=BackgroundTask(close_rows, stream)
+            )
         
+        stream = service.export_to_excel(filter_params)
         return StreamingResponse(
-            io.BytesIO(excel_bytes),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            stream,
+            media_type=XLSX_MEDIA_TYPE,
             headers={
                 "Content-Disposition": "attachment; filename=documents_export.xlsx"
-            }
+            },
+            background=BackgroundTask(close_rows, stream)
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
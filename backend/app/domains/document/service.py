@@ -2,14 +2,50 @@
 Document service for combined document operations
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 import io
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 
 from app.domains.estimate.service import EstimateService
 from app.domains.invoice.service import InvoiceService
 from app.domains.document.schemas import DocumentFilter, PaginatedDocuments
 from app.core.database_factory import get_database
+from app.common.utils.streaming_export import close_rows, iter_csv, iter_xlsx
+
+# Rows fetched per round trip when streaming an export from the database
+EXPORT_FETCH_SIZE = 500
+
+EXPORT_HEADERS = [
+    'Type', 'Document Number', 'Date', 'Status', 'Client', 'Company', 'Total Amount', 'Created At'
+]
+EXPORT_COLUMN_WIDTHS = [12, 20, 22, 12, 30, 30, 15, 22]
+
+
+def _parse_filter_date(name: str, value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO date filter, raising ValueError with the filter name"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: expected an ISO date, got {value!r}")
+
+
+def _parse_filter_end(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse the date_to filter as an exclusive upper bound.
+
+    A date without a time covers that whole day, so it becomes midnight of the
+    next day; a timestamp stays inclusive.
+    """
+    end = _parse_filter_date('date_to', value)
+    if end is None:
+        return None
+    try:
+        return datetime.combine(date.fromisoformat(value) + timedelta(days=1), time.min)
+    except ValueError:
+        return end + timedelta(microseconds=1)
+
 
 class DocumentService:
     """Service for document-related operations"""
@@ -26,6 +62,9 @@ class DocumentService:
     def get_documents(self, filter_params: DocumentFilter, page: int, page_size: int) -> PaginatedDocuments:
         """Get documents with filters and pagination"""
         documents = []
+        # created_at is an ISO string here; compared against the ISO form of the bound
+        date_to_end = _parse_filter_end(filter_params.date_to)
+        date_to_end = date_to_end.isoformat() if date_to_end else None
         
         # Get estimates if included in filter
         if not filter_params.type or filter_params.type in ['all', 'estimate']:
@@ -38,7 +77,7 @@ class DocumentService:
                     continue
                 if filter_params.date_from and estimate.get('created_at') < filter_params.date_from:
                     continue
-                if filter_params.date_to and estimate.get('created_at') > filter_params.date_to:
+                if date_to_end and estimate.get('created_at') >= date_to_end:
                     continue
                 
                 documents.append({
@@ -65,7 +104,7 @@ class DocumentService:
                     continue
                 if filter_params.date_from and invoice.get('created_at') < filter_params.date_from:
                     continue
-                if filter_params.date_to and invoice.get('created_at') > filter_params.date_to:
+                if date_to_end and invoice.get('created_at') >= date_to_end:
                     continue
                 
                 documents.append({
@@ -216,11 +255,133 @@ class DocumentService:
         # For now, just return True to indicate success
         return True
     
-    def export_to_excel(self, filter_params: DocumentFilter) -> bytes:
-        """Export documents to Excel format"""
-        # Get all documents with the filter
-        documents = self.get_documents(filter_params, 1, 10000)  # Get all documents
+    def export_to_excel(self, filter_params: DocumentFilter) -> Iterator[bytes]:
+        """Export documents to Excel format, streamed in chunks"""
+        return iter_xlsx(
+            EXPORT_HEADERS,
+            self.iter_export_rows(filter_params),
+            sheet_title="Documents",
+            column_widths=EXPORT_COLUMN_WIDTHS
+        )
+    
+    def export_to_csv(self, filter_params: DocumentFilter) -> Iterator[str]:
+        """Export documents to CSV format, streamed in chunks"""
+        return iter_csv(EXPORT_HEADERS, self.iter_export_rows(filter_params))
+    
+    def iter_export_rows(self, filter_params: DocumentFilter) -> Iterator[List[Any]]:
+        """
+        Export rows (newest first), streamed without loading every document.
         
-        # TODO: Implement Excel export using pandas or openpyxl
-        # For now, return empty bytes
-        return b''
\ No newline at end of file
+        Filters are validated and the query is started before this returns, so
+        bad filters and query errors raise here instead of after a streaming
+        response has already been sent.
+        
+        Raises:
+            ValueError: If date_from or date_to is not an ISO date
+        """
+        date_from = _parse_filter_date('date_from', filter_params.date_from)
+        date_to_end = _parse_filter_end(filter_params.date_to)
+        
+        rows = self._stream_export_rows(filter_params, date_from, date_to_end)
+        try:
+            first = next(rows)
+        except StopIteration:
+            return iter(())
+        return self._prepend_row(first, rows)
+    
+    @staticmethod
+    def _prepend_row(first: List[Any], rows: Iterator[List[Any]]) -> Iterator[List[Any]]:
+        """Yield first, then rows; closing this closes rows"""
+        try:
+            yield first
+            yield from rows
+        finally:
+            close_rows(rows)
+    
+    def _stream_export_rows(self, filter_params: DocumentFilter,
+                            date_from: Optional[datetime],
+                            date_to_end: Optional[datetime]) -> Iterator[List[Any]]:
+        """
+        SQL databases stream a single filtered UNION of estimates and invoices
+        from a server-side cursor; other providers fall back to get_documents.
+        """
+        if not hasattr(self.database, 'engine'):
+            documents = self.get_documents(filter_params, 1, 10000).items
+            for doc in documents:
+                yield [
+                    doc['type'], doc['document_number'], doc['date'], doc['status'],
+                    doc.get('client_name', ''), doc.get('company_name', ''),
+                    float(doc.get('total_amount') or 0), doc['created_at']
+                ]
+            return
+        
+        query = self._build_export_query(filter_params, date_from, date_to_end)
+        if query is None:
+            return
+        
+        # Closed on completion, on errors and when the stream is closed early
+        # (client disconnect), since closing a generator runs its finally
+        session = self.database.get_readonly_session()
+        try:
+            result = session.execute(query.execution_options(yield_per=EXPORT_FETCH_SIZE))
+            for row in result:
+                yield [
+                    row.type, row.document_number, row.date, row.status,
+                    row.client_name or '', row.company_name or '',
+                    float(row.total_amount or 0), row.created_at
+                ]
+        finally:
+            session.close()
+    
+    def _build_export_query(self, filter_params: DocumentFilter,
+                            date_from: Optional[datetime],
+                            date_to_end: Optional[datetime]):
+        """Build the filtered estimate/invoice UNION used by exports (None if nothing matches the type)"""
+        from sqlalchemy import select, literal, func, or_, union_all
+        from app.domains.estimate.models import Estimate
+        from app.domains.invoice.models import Invoice
+        from app.domains.company.models import Company
+        
+        branches = []
+        sources = [
+            ('estimate', Estimate, Estimate.estimate_number, Estimate.estimate_date),
+            ('invoice', Invoice, Invoice.invoice_number, Invoice.invoice_date),
+        ]
+        for doc_type, model, number_column, date_column in sources:
+            if filter_params.type and filter_params.type not in ('all', doc_type):
+                continue
+            
+            query = select(
+                literal(doc_type).label('type'),
+                number_column.label('document_number'),
+                func.coalesce(date_column, model.created_at).label('date'),
+                model.status.label('status'),
+                model.client_name.label('client_name'),
+                Company.name.label('company_name'),
+                model.total_amount.label('total_amount'),
+                model.created_at.label('created_at'),
+            ).select_from(model).outerjoin(Company, Company.id == model.company_id)
+            
+            if filter_params.status:
+                query = query.where(model.status == filter_params.status)
+            if filter_params.company_id:
+                query = query.where(model.company_id == filter_params.company_id)
+            if date_from:
+                query = query.where(model.created_at >= date_from)
+            if date_to_end:
+                query = query.where(model.created_at < date_to_end)
+            if filter_params.search:
+                pattern = f"%{filter_params.search}%"
+                query = query.where(or_(
+                    number_column.ilike(pattern),
+                    model.client_name.ilike(pattern),
+                    Company.name.ilike(pattern),
+                ))
+            branches.append(query)
+        
+        if not branches:
+            return None
+        
+        combined = branches[0] if len(branches) == 1 else union_all(*branches)
+        documents = combined.subquery()
+        return select(documents).order_by(documents.c.date.desc())
@@ -109,6 +109,12 @@ def get_trade(db: Session, trade_id: UUID) -> Optional[models.Trade]:
     return db.query(models.Trade).filter(models.Trade.id == trade_id).first()
 
 
+def get_trades_by_ids(db: Session, trade_ids: List[UUID]) -> List[models.Trade]:
+    if not trade_ids:
+        return []
+    return db.query(models.Trade).filter(models.Trade.id.in_(trade_ids)).all()
+
+
 def create_trade(db: Session, trade: schemas.TradeCreate, user_id: UUID) -> models.Trade:
     db_trade = models.Trade(
         **trade.dict(),
@@ -218,14 +218,12 @@ class EstimateSQLAlchemyRepository(SQLAlchemyRepository, EstimateRepositoryMixin
             estimate = self.create(estimate_data)
             estimate_id = estimate['id']
             
-            # Create items
+            # Create items with one bulk insert
             for idx, item_data in enumerate(items_data):
                 item_data['estimate_id'] = estimate_id
                 item_data['order_index'] = idx
 
-                item_entity = EstimateItem(**item_data)
-                self.db_session.add(item_entity)
-            
+            self.bulk_insert(items_data, EstimateItem)
             self.db_session.flush()
             
             # Return estimate with items
@@ -5,11 +5,11 @@ Estimate domain service with comprehensive business logic and validation.
 from typing import Any, Dict, List, Optional
 import logging
 from datetime import datetime, date
-from decimal import Decimal
 import json
 from sqlalchemy import text, select, func
 
 from app.common.base_service import TransactionalService
+from app.common.utils.document_totals import calculate_document_totals
 from app.domains.estimate.repository import get_estimate_repository
 from app.core.interfaces import DatabaseProvider
 from app.core.database_factory import get_database
@@ -246,12 +246,9 @@ class EstimateService(TransactionalService[Dict[str, Any], str]):
             from app.domains.estimate.models import EstimateItem
             repository.db_session.query(EstimateItem).filter(EstimateItem.estimate_id == estimate_id).delete()
             
-            # Create new items
+            # Create new items with one bulk insert
             logger.info(f"Creating {len(items_data)} items for estimate {estimate_id}")
             for idx, item_data in enumerate(items_data):
-                logger.info(f"Processing item {idx}: {item_data}")
-                logger.info(f"Item fields - name: {item_data.get('name')}, description: {item_data.get('description')}")
-
                 item_data['estimate_id'] = estimate_id
                 item_data['order_index'] = idx
                 # Calculate the amount for the item
@@ -259,11 +256,7 @@ class EstimateService(TransactionalService[Dict[str, Any], str]):
                 rate = float(item_data.get('rate', 0))
                 item_data['amount'] = quantity * rate
 
-                # Create the item directly using SQLAlchemy
-                from app.domains.estimate.models import EstimateItem
-                item_entity = EstimateItem(**item_data)
-                logger.info(f"Created EstimateItem entity: name={item_entity.name}, description={item_entity.description}")
-                repository.db_session.add(item_entity)
+            repository.bulk_insert(items_data, EstimateItem)
             
             return repository.get_with_items(estimate_id)
         
@@ -367,59 +360,28 @@ class EstimateService(TransactionalService[Dict[str, Any], str]):
             Dictionary with calculated totals
         """
         try:
-            subtotal = Decimal('0')
-            total_item_tax = Decimal('0')
-            total_depreciation = Decimal('0')
-
-            for item in items:
-                quantity = Decimal(str(item.get('quantity', 1)))
-                rate = Decimal(str(item.get('rate', 0)))
-                item_tax_rate = Decimal(str(item.get('tax_rate', 0)))
-                depreciation_rate = Decimal(str(item.get('depreciation_rate', 0)))
-
-                item_amount = quantity * rate
-                item_tax = item_amount * (item_tax_rate / 100)
-                item_depreciation = item_amount * (depreciation_rate / 100)
-
-                subtotal += item_amount
-                total_item_tax += item_tax
-                total_depreciation += item_depreciation
-
-            # Calculate O&P amount
-            op_amount = subtotal * (Decimal(str(op_percent)) / 100)
-
-            # Calculate tax based on method
-            if tax_method == 'percentage':
-                # Calculate tax on taxable items only + proportional O&P
-                taxable_amount = Decimal('0')
-                for item in items:
-                    if item.get('taxable', True):  # Default to taxable if not specified
-                        quantity = Decimal(str(item.get('quantity', 1)))
-                        rate = Decimal(str(item.get('rate', 0)))
-                        taxable_amount += quantity * rate
-
-                # Calculate taxable ratio and apply to O&P
-                taxable_ratio = taxable_amount / subtotal if subtotal > 0 else Decimal('0')
-                taxable_op_amount = op_amount * taxable_ratio
-
-                # Calculate tax on taxable items + taxable portion of O&P
-                calculated_tax_amount = (taxable_amount + taxable_op_amount) * (Decimal(str(tax_rate)) / 100)
-            else:
-                # Use specific tax amount
-                calculated_tax_amount = Decimal(str(tax_amount))
-
-            discount = Decimal(str(items[0].get('discount_amount', 0) if items else 0))
-            rcv_amount = subtotal + op_amount + calculated_tax_amount - discount  # Replacement Cost Value
-            acv_amount = rcv_amount - total_depreciation  # Actual Cash Value
+            # Estimates tax the full taxable amount; the discount comes off the total only
+            totals = calculate_document_totals(
+                items,
+                op_percent=op_percent,
+                tax_method=tax_method,
+                tax_rate=tax_rate,
+                tax_amount=tax_amount,
+                discount_amount=items[0].get('discount_amount', 0) if items else 0,
+                discount_reduces_tax_base=False,
+                include_item_tax=False
+            )
+            rcv_amount = totals['total_amount']  # Replacement Cost Value
+            acv_amount = rcv_amount - totals['depreciation_amount']  # Actual Cash Value
 
             return {
-                'subtotal': float(subtotal),
+                'subtotal': float(totals['items_subtotal']),
                 'op_percent': float(op_percent),
-                'op_amount': float(op_amount),
+                'op_amount': float(totals['op_amount']),
                 'tax_method': tax_method,
                 'tax_rate': float(tax_rate) if tax_method == 'percentage' else 0,
-                'tax_amount': float(calculated_tax_amount),
-                'depreciation_amount': float(total_depreciation),
+                'tax_amount': float(totals['tax_amount']),
+                'depreciation_amount': float(totals['depreciation_amount']),
                 'rcv_amount': float(rcv_amount),
                 'acv_amount': float(acv_amount),
                 'total_amount': float(rcv_amount)  # Use RCV as total
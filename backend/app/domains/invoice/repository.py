@@ -197,6 +197,64 @@ class InvoiceSQLAlchemyRepository(SQLAlchemyRepository, InvoiceRepositoryMixin):
             )
             # Don't fail invoice creation/update if library save fails
             return None
+
+    def _build_item_rows(
+            self, invoice_id: str,
+            items_data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Map incoming item payloads to invoice_items column values
+        (amount and tax are calculated per item).
+        """
+        rows = []
+        for idx, item_data in enumerate(items_data):
+            # Only use line_item_id if provided by frontend
+            # Don't auto-create - respect user's choice
+            line_item_id = item_data.get('line_item_id')
+
+            # Calculate item amount and tax
+            quantity = float(item_data.get('quantity', 1))
+            rate = float(item_data.get('rate', 0))
+            amount = quantity * rate
+
+            # Calculate item tax if taxable
+            taxable = item_data.get('taxable', True)
+            item_tax_rate = float(item_data.get('tax_rate', 0))
+            tax_amount = (amount * (item_tax_rate / 100)
+                         if taxable and item_tax_rate > 0 else 0)
+
+            # Filter and map fields for InvoiceItem model
+            valid_fields = {
+                'invoice_id': invoice_id,
+                'order_index': idx,
+                'name': item_data.get(
+                    'name', item_data.get('description', '')
+                ),
+                'description': item_data.get('description'),
+                'note': item_data.get('note'),
+                'quantity': quantity,
+                'unit': item_data.get('unit', 'ea'),
+                'rate': rate,
+                'amount': amount,
+                'taxable': taxable,
+                'tax_rate': item_tax_rate,
+                'tax_amount': tax_amount,
+                'line_item_id': line_item_id,  # Use provided ID only
+                'is_custom_override': item_data.get(
+                    'is_custom_override', False
+                ),
+                'override_values': item_data.get('override_values'),
+                # Section/Group fields
+                'primary_group': item_data.get('primary_group'),
+                'secondary_group': item_data.get('secondary_group'),
+                'sort_order': item_data.get('sort_order', 0)
+            }
+
+            # Remove None values except for nullable fields (note, description, etc.)
+            nullable_fields = {'note', 'description', 'line_item_id', 'override_values', 'secondary_group'}
+            rows.append({k: v for k, v in valid_fields.items() if v is not None or k in nullable_fields})
+
+        return rows
     
     def get_by_id(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """Override to include items when getting invoice by ID"""
@@ -294,56 +352,8 @@ class InvoiceSQLAlchemyRepository(SQLAlchemyRepository, InvoiceRepositoryMixin):
             invoice = self.create(invoice_data)
             invoice_id = invoice['id']
 
-            # Create items
-            for idx, item_data in enumerate(items_data):
-                # Only use line_item_id if provided by frontend
-                # Don't auto-create - respect user's choice
-                line_item_id = item_data.get('line_item_id')
-
-                # Calculate item amount and tax
-                quantity = float(item_data.get('quantity', 1))
-                rate = float(item_data.get('rate', 0))
-                amount = quantity * rate
-
-                # Calculate item tax if taxable
-                taxable = item_data.get('taxable', True)
-                item_tax_rate = float(item_data.get('tax_rate', 0))
-                tax_amount = (amount * (item_tax_rate / 100)
-                             if taxable and item_tax_rate > 0 else 0)
-
-                # Filter and map fields for InvoiceItem model
-                valid_fields = {
-                    'invoice_id': invoice_id,
-                    'order_index': idx,
-                    'name': item_data.get(
-                        'name', item_data.get('description', '')
-                    ),
-                    'description': item_data.get('description'),
-                    'note': item_data.get('note'),
-                    'quantity': quantity,
-                    'unit': item_data.get('unit', 'ea'),
-                    'rate': rate,
-                    'amount': amount,
-                    'taxable': taxable,
-                    'tax_rate': item_tax_rate,
-                    'tax_amount': tax_amount,
-                    'line_item_id': line_item_id,  # Use provided ID only
-                    'is_custom_override': item_data.get(
-                        'is_custom_override', False
-                    ),
-                    'override_values': item_data.get('override_values'),
-                    # Section/Group fields
-                    'primary_group': item_data.get('primary_group'),
-                    'secondary_group': item_data.get('secondary_group'),
-                    'sort_order': item_data.get('sort_order', 0)
-                }
-
-                # Remove None values except for nullable fields (note, description, etc.)
-                nullable_fields = {'note', 'description', 'line_item_id', 'override_values', 'secondary_group'}
-                filtered_fields = {k: v for k, v in valid_fields.items() if v is not None or k in nullable_fields}
-
-                item_entity = InvoiceItem(**filtered_fields)
-                self.db_session.add(item_entity)
+            # Create items with one bulk insert
+            self.bulk_insert(self._build_item_rows(invoice_id, items_data), InvoiceItem)
 
             self.db_session.flush()
             self.db_session.commit()
@@ -388,56 +398,8 @@ class InvoiceSQLAlchemyRepository(SQLAlchemyRepository, InvoiceRepositoryMixin):
                     InvoiceItem.invoice_id == invoice_id
                 ).delete()
 
-                # Create new items
-                for idx, item_data in enumerate(items_data):
-                    # Only use line_item_id if provided
-                    # Don't auto-create - respect user's choice
-                    line_item_id = item_data.get('line_item_id')
-
-                    # Calculate item amount and tax
-                    quantity = float(item_data.get('quantity', 1))
-                    rate = float(item_data.get('rate', 0))
-                    amount = quantity * rate
-
-                    # Calculate item tax if taxable
-                    taxable = item_data.get('taxable', True)
-                    item_tax_rate = float(item_data.get('tax_rate', 0))
-                    tax_amount = (amount * (item_tax_rate / 100)
-                                 if taxable and item_tax_rate > 0 else 0)
-
-                    # Filter and map fields for InvoiceItem model
-                    valid_fields = {
-                        'invoice_id': invoice_id,
-                        'order_index': idx,
-                        'name': item_data.get(
-                            'name', item_data.get('description', '')
-                        ),
-                        'description': item_data.get('description'),
-                        'note': item_data.get('note'),
-                        'quantity': quantity,
-                        'unit': item_data.get('unit', 'ea'),
-                        'rate': rate,
-                        'amount': amount,
-                        'taxable': taxable,
-                        'tax_rate': item_tax_rate,
-                        'tax_amount': tax_amount,
-                        'line_item_id': line_item_id,  # Use provided ID only
-                        'is_custom_override': item_data.get(
-                            'is_custom_override', False
-                        ),
-                        'override_values': item_data.get('override_values'),
-                        # Section/Group fields
-                        'primary_group': item_data.get('primary_group'),
-                        'secondary_group': item_data.get('secondary_group'),
-                        'sort_order': item_data.get('sort_order', 0)
-                    }
-
-                    # Remove None values except for nullable fields (note, description, etc.)
-                    nullable_fields = {'note', 'description', 'line_item_id', 'override_values', 'secondary_group'}
-                    filtered_fields = {k: v for k, v in valid_fields.items() if v is not None or k in nullable_fields}
-
-                    item_entity = InvoiceItem(**filtered_fields)
-                    self.db_session.add(item_entity)
+                # Create new items with one bulk insert
+                self.bulk_insert(self._build_item_rows(invoice_id, items_data), InvoiceItem)
 
             self.db_session.flush()
             self.db_session.commit()
@@ -5,9 +5,9 @@ Invoice domain service with comprehensive business logic and validation.
 from typing import Any, Dict, List, Optional
 import logging
 from datetime import datetime, date
-from decimal import Decimal
 
 from app.common.base_service import TransactionalService
+from app.common.utils.document_totals import calculate_document_totals
 from app.domains.invoice.repository import get_invoice_repository
 from app.core.interfaces import DatabaseProvider
 from app.core.database_factory import get_database
@@ -281,60 +281,24 @@ class InvoiceService(TransactionalService[Dict[str, Any], str]):
             Dictionary with calculated totals
         """
         try:
-            items_subtotal = Decimal('0')
-
-            # Calculate items subtotal and track taxable items
-            taxable_amount = Decimal('0')
-            for item in items:
-                quantity = Decimal(str(item.get('quantity', 1)))
-                rate = Decimal(str(item.get('rate', 0)))
-                taxable = item.get('taxable', True)
-
-                item_amount = quantity * rate
-                items_subtotal += item_amount
-
-                # Track taxable amount for percentage tax calculation
-                if taxable:
-                    taxable_amount += item_amount
-
-            # Calculate O&P amount
-            op_amount = items_subtotal * (Decimal(str(op_percent)) / 100)
-            subtotal_with_op = items_subtotal + op_amount
-
-            # Calculate tax amount
-            tax_total = Decimal('0')
-            if tax_method == 'percentage' and tax_rate > 0:
-                # For percentage tax: apply to (subtotal + O&P - discount)
-                # But only on taxable items
-                if taxable_amount > 0:
-                    # Calculate O&P portion that's taxable
-                    taxable_op_amount = taxable_amount * (Decimal(str(op_percent)) / 100)
-                    taxable_subtotal_with_op = taxable_amount + taxable_op_amount
-
-                    # Apply discount proportionally to taxable amount
-                    discount = Decimal(str(discount_amount))
-                    taxable_ratio = taxable_amount / items_subtotal if items_subtotal > 0 else Decimal('0')
-                    taxable_discount = discount * taxable_ratio
-
-                    # Calculate tax on (taxable_subtotal_with_op - taxable_discount)
-                    taxable_base = taxable_subtotal_with_op - taxable_discount
-                    if taxable_base > 0:
-                        tax_total = taxable_base * (Decimal(str(tax_rate)) / 100)
-            elif tax_method == 'specific' and tax_amount > 0:
-                # Use specific tax amount
-                tax_total = Decimal(str(tax_amount))
-
-            # Apply discount and calculate final total
-            discount = Decimal(str(discount_amount))
-            total_amount = subtotal_with_op + tax_total - discount
+            totals = calculate_document_totals(
+                items,
+                op_percent=op_percent,
+                tax_method=tax_method,
+                tax_rate=tax_rate,
+                # Invoices only support 'percentage' and 'specific'; any other method is untaxed
+                tax_amount=tax_amount if tax_method == 'specific' else 0,
+                discount_amount=discount_amount,
+                include_item_tax=False
+            )
 
             return {
-                'items_subtotal': float(items_subtotal),
-                'op_amount': float(op_amount),
-                'subtotal': float(subtotal_with_op),
-                'tax_amount': float(tax_total),
-                'discount_amount': float(discount),
-                'total_amount': float(total_amount)
+                'items_subtotal': float(totals['items_subtotal']),
+                'op_amount': float(totals['op_amount']),
+                'subtotal': float(totals['subtotal']),
+                'tax_amount': float(totals['tax_amount']),
+                'discount_amount': float(totals['discount_amount']),
+                'total_amount': float(totals['total_amount'])
             }
             
         except Exception as e:
@@ -2,22 +2,30 @@
 Line Items domain API endpoints
 """
 
-from typing import List, Optional, Dict, Any
+import json
+from typing import Callable, List, Optional, Dict, Any
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, BackgroundTasks, UploadFile, File
 from sqlalchemy.orm import Session
 
 from app.core.database_factory import get_db_session as get_db
 from app.domains.auth.dependencies import get_current_user
 from app.domains.staff.models import Staff
 from app.core.cache import CacheService, get_cache
-from app.domains.line_items.service import LineItemService
+from app.domains.line_items.service import LineItemService, BusinessError
 from app.domains.line_items.repository import LineItemRepository
+from app.common.utils.bulk_import import ImportFormatError, detect_format
+from app.domains.line_items.autocomplete import line_item_autocomplete, SOURCE_CUSTOM
+from app.domains.line_items.category_snapshot import (
+    get_category_snapshot, refresh_category_snapshot,
+    VIEW_ALL, VIEW_ALL_INACTIVE, VIEW_MODAL, VIEW_MODAL_INACTIVE
+)
 from app.domains.line_items.schemas import (
     LineItemCreate, LineItemUpdate, LineItemResponse, LineItemSearch,
     LineItemNoteCreate, LineItemNoteUpdate, LineItemNoteResponse,
     LineItemTemplateCreate, LineItemTemplateUpdate, LineItemTemplateResponse,
     TaxCalculationRequest, TaxCalculationResponse,
+    DocumentTotalsRequest, DocumentTotalsResponse,
     BulkLineItemCreate, BulkTemplateApply,
     InvoiceLineItemCreate, EstimateLineItemCreate,
     LineItemType, TaxMethod,
@@ -26,191 +34,84 @@ from app.domains.line_items.schemas import (
 
 router = APIRouter(tags=["Line Items"])
 
+
 # =====================================================
 # Category Endpoints
 # =====================================================
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def _conditional_json(request: Request, etag: str, build_body: Callable[[], bytes]) -> Response:
+    """JSON response with an ETag, or 304 Not Modified when the client already has it"""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=build_body(), media_type="application/json", headers=headers)
+
+
 @router.get("/categories", response_model=List[LineItemCategoryResponse])
 async def get_categories(
+    request: Request,
     include_inactive: bool = False,
-    db: Session = Depends(get_db),
-    cache: CacheService = Depends(get_cache),
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    db: Session = Depends(get_db)
 ):
     """Get all line item categories with code and name
     
-    Implements multi-level caching:
-    - L1: Redis/Memory cache with 30min TTL
-    - L2: Database query with optimized indexing
-    - Cache warming on miss
-    - Automatic invalidation on updates
+    Served from the in-memory category snapshot with a strong ETag;
+    clients sending If-None-Match get 304 Not Modified while nothing changed.
     """
-    from app.domains.line_items.category_models import LineItemCategory
-    import json
-    
-    # Generate cache key
-    cache_key = f"categories:all:inactive_{include_inactive}"
-    
-    # Try to get from cache first
-    cached_data = await cache.get(cache_key)
-    if cached_data:
-        try:
-            # Cache hit - parse and return
-            categories = json.loads(cached_data)
-            return categories
-        except json.JSONDecodeError:
-            # Invalid cache data, continue to fetch from DB
-            await cache.delete(cache_key)
-    
-    # Cache miss - fetch from database
-    query = db.query(LineItemCategory)
-    if not include_inactive:
-        query = query.filter(LineItemCategory.is_active == True)
-    
-    categories = query.order_by(LineItemCategory.display_order).all()
-    response_data = [LineItemCategoryResponse.from_orm(cat) for cat in categories]
-    
-    # Convert to dict for JSON serialization
-    response_dict = [cat.dict() for cat in response_data]
-    
-    # Cache the result (30 minutes TTL for frequently accessed data)
-    try:
-        await cache.set(cache_key, json.dumps(response_dict), ttl=1800)
-        
-        # Warm up related caches in background
-        background_tasks.add_task(warm_category_caches, categories, cache)
-    except Exception as e:
-        # Log but don't fail the request
-        import logging
-        logging.warning(f"Failed to cache categories: {e}")
-    
-    return response_data
-
-
-async def warm_category_caches(categories: List, cache: CacheService):
-    """Warm up related category caches in background"""
-    import json
-    
-    try:
-        # Cache individual categories by code for fast lookups
-        for cat in categories:
-            cat_dict = {
-                'code': cat.code,
-                'name': cat.name,
-                'description': cat.description,
-                'parent_code': cat.parent_code,
-                'display_order': cat.display_order,
-                'is_active': cat.is_active
-            }
-            await cache.set(
-                f"category:code:{cat.code}",
-                json.dumps(cat_dict),
-                ttl=1800  # 30 minutes
-            )
-        
-        # Cache modal format for common UI needs
-        modal_data = [
-            {
-                "code": cat.code,
-                "description": cat.name,
-                "full_description": f"{cat.name} - {cat.description}" if cat.description else cat.name
-            }
-            for cat in categories if cat.is_active
-        ]
-        await cache.set(
-            "categories:modal:all",
-            json.dumps(modal_data),
-            ttl=1800
-        )
-    except Exception as e:
-        import logging
-        logging.warning(f"Failed to warm category caches: {e}")
+    snapshot = get_category_snapshot(db)
+    view = VIEW_ALL_INACTIVE if include_inactive else VIEW_ALL
+    return _conditional_json(request, snapshot.etag(view), lambda: snapshot.views[view])
 
 
 @router.get("/categories/search", response_model=List[Dict[str, Any]])
 async def search_categories(
+    request: Request,
     q: str = Query(..., min_length=1, description="Search query for categories"),
     limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
-    """Search categories by code or name for modal selection"""
-    from app.domains.line_items.category_models import LineItemCategory
-    from sqlalchemy import or_, func
-    
+    """Search categories by code, name or description prefix for modal selection"""
     try:
-        search_term = f"%{q.upper()}%"
-        
-        query = db.query(LineItemCategory).filter(
-            LineItemCategory.is_active == True,
-            or_(
-                func.upper(LineItemCategory.code).like(search_term),
-                func.upper(LineItemCategory.name).like(search_term),
-                func.upper(LineItemCategory.description).like(search_term)
-            )
-        ).order_by(
-            # Exact match first, then partial matches
-            func.length(LineItemCategory.code).asc(),
-            LineItemCategory.display_order.asc()
-        ).limit(limit)
-        
-        categories = query.all()
-        
-        # Return in modal-friendly format
-        return [
-            {
-                "code": cat.code,
-                "description": cat.name,
-                "full_description": f"{cat.name} - {cat.description}" if cat.description else cat.name
-            }
-            for cat in categories
-        ]
+        snapshot = get_category_snapshot(db)
     except Exception:
         # Return empty list if search fails, don't raise error
         return []
+    
+    return _conditional_json(
+        request,
+        snapshot.etag("search", q.strip().lower(), limit),
+        lambda: json.dumps(snapshot.search(q, limit)).encode("utf-8")
+    )
 
 
 @router.get("/categories/modal", response_model=List[Dict[str, Any]])
 async def get_categories_for_modal(
+    request: Request,
     include_inactive: bool = False,
-    db: Session = Depends(get_db),
-    cache: CacheService = Depends(get_cache)
+    db: Session = Depends(get_db)
 ):
     """Get all categories formatted for modal display
     
-    Optimized for UI performance with aggressive caching
+    Served from the in-memory category snapshot with a strong ETag
     """
-    from app.domains.line_items.category_models import LineItemCategory
-    import json
-    
-    # Try cache first
-    cache_key = f"categories:modal:inactive_{include_inactive}"
-    cached_data = await cache.get(cache_key)
-    
-    if cached_data:
-        try:
-            return json.loads(cached_data)
-        except json.JSONDecodeError:
-            await cache.delete(cache_key)
-    
     try:
-        query = db.query(LineItemCategory)
-        if not include_inactive:
-            query = query.filter(LineItemCategory.is_active == True)
-        
-        categories = query.order_by(LineItemCategory.display_order).all()
-        
-        # Return in modal-friendly format matching the image
-        return [
-            {
-                "code": cat.code,
-                "description": cat.name,
-                "full_description": f"{cat.name} - {cat.description}" if cat.description else cat.name
-            }
-            for cat in categories
-        ]
+        snapshot = get_category_snapshot(db)
     except Exception:
         # Return empty list if query fails
         return []
+    
+    view = VIEW_MODAL_INACTIVE if include_inactive else VIEW_MODAL
+    return _conditional_json(request, snapshot.etag(view), lambda: snapshot.views[view])
 
 
 @router.post("/categories", response_model=LineItemCategoryResponse, status_code=status.HTTP_201_CREATED)
@@ -234,6 +135,7 @@ async def create_category(
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    refresh_category_snapshot(db)
     
     return LineItemCategoryResponse.from_orm(db_category)
 
@@ -261,6 +163,7 @@ async def update_category(
     
     db.commit()
     db.refresh(db_category)
+    refresh_category_snapshot(db)
     
     return LineItemCategoryResponse.from_orm(db_category)
 
@@ -427,6 +330,28 @@ async def bulk_create_line_items(
     return await service.bulk_create_line_items(bulk_create.items, UUID(current_user.id))
 
 
+@router.post("/import", response_model=Dict[str, Any])
+async def import_line_items(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$", description="Defaults to the file extension"),
+    db: Session = Depends(get_db),
+    cache: CacheService = Depends(get_cache),
+    current_user: Staff = Depends(get_current_user)
+):
+    """
+    Import line items from a CSV or JSONL file.
+
+    Rows are upserted by (company_id, cat, item). Invalid rows are skipped
+    and listed in the report with their line numbers.
+    """
+    try:
+        fmt = detect_format(file.filename, file.content_type, format)
+        service = LineItemService(db, cache)
+        return await service.import_line_items(file.file, fmt, UUID(current_user.id))
+    except (ImportFormatError, BusinessError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/{line_item_id}/notes", response_model=List[LineItemNoteResponse])
 async def get_line_item_notes(
     line_item_id: UUID,
@@ -537,6 +462,16 @@ async def get_line_items_for_modal(
     
     service = LineItemService(db, cache)
     
+    # Type-ahead queries are answered from the in-memory index once it is built
+    if search_term and search_term.strip() and line_item_autocomplete.ensure_ready(db.get_bind()):
+        matches = line_item_autocomplete.search(
+            search_term, limit=page * page_size, category=category, sources=(SOURCE_CUSTOM,)
+        )
+        return [
+            {key: value for key, value in dict(match, act="+").items() if key != "type"}
+            for match in matches[(page - 1) * page_size:]
+        ]
+    
     try:
         # Build search parameters (type removed - all are custom now)
         search_params = LineItemSearch(
@@ -596,14 +531,19 @@ async def search_line_items_for_modal(
     db: Session = Depends(get_db),
     cache: CacheService = Depends(get_cache)
 ):
-    """Enhanced search for line items in modal with multi-keyword support"""
+    """Enhanced search for line items in modal with multi-keyword support
+    
+    Answered from the in-memory autocomplete index (line items ranked by
+    usage) once it is built; until then the database search is used. Both
+    return line items only.
+    """
     from app.domains.line_items.models import LineItem
-    from sqlalchemy import or_, func, and_
+    from app.domains.line_items.search import apply_text_search
+    
+    if line_item_autocomplete.ensure_ready(db.get_bind()):
+        return line_item_autocomplete.search(q, limit=limit, category=category, sources=(SOURCE_CUSTOM,))
     
     try:
-        # Split search terms for multi-keyword search
-        search_terms = [term.strip() for term in q.split() if term.strip()]
-        
         # Build base query
         query = db.query(LineItem).filter(LineItem.is_active == True)
         
@@ -613,28 +553,8 @@ async def search_line_items_for_modal(
         if category:
             query = query.filter(LineItem.cat == category)
         
-        # Apply multi-keyword search
-        if search_terms:
-            search_conditions = []
-            for term in search_terms:
-                term_pattern = f"%{term.upper()}%"
-                term_conditions = or_(
-                    func.upper(LineItem.item).like(term_pattern),
-                    func.upper(LineItem.description).like(term_pattern),
-                    func.upper(LineItem.includes).like(term_pattern),
-                    func.upper(LineItem.cat).like(term_pattern)
-                )
-                search_conditions.append(term_conditions)
-            
-            # All terms must match (AND logic)
-            if search_conditions:
-                query = query.filter(and_(*search_conditions))
-        
-        # Order by relevance and limit results
-        query = query.order_by(
-            func.length(LineItem.item).asc(),  # Shorter codes first
-            LineItem.item.asc()
-        ).limit(limit)
+        # Multi-keyword prefix search (all terms must match), ordered by relevance
+        query = apply_text_search(query, q).limit(limit)
         
         items = query.all()
         
@@ -680,11 +600,17 @@ async def search_line_items(
     is_active: Optional[bool] = True,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$",
+                       description="Total count mode: exact, estimated, or none (use has_more)"),
     db: Session = Depends(get_db),
     cache: CacheService = Depends(get_cache)
 ):
     """Search line items with filters and pagination
 
+    search_term tokens match word prefixes in the code, category, description
+    and includes ("dry pat" finds "Drywall patch"). Text inside a word is not
+    matched: "wall" does not find "Drywall".
+
     Note: Authentication is optional for this endpoint to allow library browsing.
     Company-specific filtering is disabled when not authenticated.
     """
@@ -695,7 +621,8 @@ async def search_line_items(
         company_id=company_id,
         is_active=is_active,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        count_mode=count
     )
 
     service = LineItemService(db, cache)
@@ -939,6 +866,24 @@ async def calculate_tax(
     return await service.calculate_tax(request)
 
 
+@router.post("/tax/calculate-document", response_model=DocumentTotalsResponse)
+async def calculate_document_totals(
+    request: DocumentTotalsRequest,
+    db: Session = Depends(get_db),
+    cache: CacheService = Depends(get_cache),
+    current_user: Staff = Depends(get_current_user)
+):
+    """Calculate per-line and document totals (O&P, tax, discount, credits) in one call"""
+    service = LineItemService(db, cache)
+    try:
+        return await service.calculate_document_totals(request)
+    except BusinessError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 # =====================================================
 # Invoice/Estimate Integration Endpoints
 # =====================================================
@@ -0,0 +1,478 @@
+"""
+In-memory autocomplete index for modal item search
+
+Type-ahead in the line item modal sends a request per keystroke. Instead of
+running a text search per request, each process keeps a compact index of
+every active line item and the latest price row of every Xactimate item:
+
+- a sorted array of normalized words of the item code, category and
+  description with a parallel array of entry ids; a prefix is one bisected
+  slice, and multi-word queries and filters are set intersections
+- the modal payload of every entry, so results need no database access
+- a usage count per entry (how often it was added to invoices and
+  estimates), used to rank matches
+
+Company-specific line items are tagged with their company and filtered at
+query time, so one index serves every company.
+
+The index is built in a background thread on first use; callers fall back to
+the database search until it is ready. Writes through ``LineItemService``
+update it incrementally. Changes made by other processes (or imports that
+bypass the service) are picked up by a fingerprint check every
+``REVALIDATE_SECONDS``, which rebuilds the index in the background.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.common.utils.snapshot import table_fingerprint
+from app.domains.line_items.models import LineItem, LineItemType
+from app.domains.line_items.search import tokenize
+
+logger = logging.getLogger(__name__)
+
+SOURCE_CUSTOM = "custom"
+SOURCE_XACTIMATE = "xactimate"
+
+# How often the index checks whether the tables changed underneath it
+REVALIDATE_SECONDS = 300
+
+# Cached result lists for repeated keystroke queries; a write drops the
+# cached queries it can affect
+RESULT_CACHE_SIZE = 1024
+
+# Rows fetched per round trip while building
+BUILD_BATCH_SIZE = 5000
+
+
+def _money(value: Any) -> float:
+    return float(value or 0)
+
+
+class _Entry:
+    """One searchable item"""
+    __slots__ = ('id', 'source', 'company_id', 'category', 'code', 'tokens', 'payload')
+
+    def __init__(self, id: str, source: str, company_id: Optional[str], category: str,
+                 code: str, tokens: FrozenSet[str], payload: Dict[str, Any]):
+        self.id = id
+        self.source = source
+        self.company_id = company_id
+        self.category = category
+        self.code = code
+        self.tokens = tokens
+        self.payload = payload
+
+
+def _entry_tokens(*texts: Optional[str]) -> FrozenSet[str]:
+    return frozenset(token for text in texts for token in tokenize(text))
+
+
+def _line_item_entry(item: LineItem) -> _Entry:
+    is_xactimate = item.type == LineItemType.XACTIMATE
+    if is_xactimate:
+        unit_price = sum(_money(value) for value in (
+            item.lab, item.mat, item.equ, item.labor_burden, item.market_condition
+        ))
+    else:
+        unit_price = _money(item.untaxed_unit_price)
+
+    return _Entry(
+        id=str(item.id),
+        source=SOURCE_CUSTOM,
+        company_id=str(item.company_id) if item.company_id else None,
+        category=item.cat or "",
+        code=(item.item or "").lower(),
+        tokens=_entry_tokens(item.item, item.cat, item.description),
+        payload={
+            "component_code": item.item or "",
+            "description": item.description or "",
+            "unit": item.unit or "EA",
+            "act": "&" if is_xactimate else "+",
+            "unit_price": round(unit_price, 2),
+            "id": str(item.id),
+            "category": item.cat or "",
+            "type": item.type.value if item.type else LineItemType.CUSTOM.value
+        }
+    )
+
+
+def _xactimate_entry(row: Any) -> _Entry:
+    entry_id = f"xactimate_{row.id}"
+    return _Entry(
+        id=entry_id,
+        source=SOURCE_XACTIMATE,
+        company_id=None,
+        category=row.category_code or "",
+        code=(row.item_code or "").lower(),
+        tokens=_entry_tokens(row.item_code, row.category_code, row.description),
+        payload={
+            "component_code": row.item_code or "",
+            "description": row.description or "",
+            "unit": "EA",
+            "act": "&",
+            "unit_price": round(_money(row.untaxed_unit_price), 2),
+            "id": entry_id,
+            "category": row.category_code or "",
+            "type": LineItemType.XACTIMATE.value
+        }
+    )
+
+
+class AutocompleteIndex:
+    """Prefix index over line items and Xactimate items, ranked by usage"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+        self._results: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+
+        self._ready = False
+        self._building = False
+        self._pending: List[Tuple[str, Any]] = []
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+        self._checked_at = 0.0
+
+    def _clear(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+        # Postings sorted by token; _posting_ids[i] holds the entry of _posting_tokens[i]
+        self._posting_tokens: List[str] = []
+        self._posting_ids: List[str] = []
+        self._usage: Dict[str, int] = {}
+        self._by_code: Dict[str, Set[str]] = {}
+        self._by_category: Dict[str, Set[str]] = {}
+        self._by_source: Dict[str, Set[str]] = {}
+        self._by_company: Dict[str, Set[str]] = {}
+        self._company_scoped: Set[str] = set()
+        # (code, entry id) of every entry, sorted, for ranking broad matches
+        self._code_order: List[Tuple[str, str]] = []
+
+    # -------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------
+
+    def ensure_ready(self, engine: Engine) -> bool:
+        """
+        Return True if the index can answer queries. Starts a background
+        build on first use, and a background revalidation when due.
+        """
+        if self._building:
+            return self._ready
+        if not self._ready or time.monotonic() - self._checked_at >= REVALIDATE_SECONDS:
+            with self._lock:
+                if not self._building:
+                    self._building = True
+                    self._checked_at = time.monotonic()
+                    threading.Thread(
+                        target=self._refresh, args=(engine,),
+                        name="line-item-autocomplete", daemon=True
+                    ).start()
+        return self._ready
+
+    def build(self, session: Session) -> None:
+        """Build the index synchronously from a session"""
+        with self._lock:
+            self._building = True
+        try:
+            self._load(session, self._read_fingerprint(session))
+        finally:
+            self._finish_build()
+
+    def reset(self) -> None:
+        """Drop the index; the next query starts a rebuild"""
+        with self._lock:
+            self._clear()
+            self._results.clear()
+            self._ready = False
+            self._fingerprint = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _refresh(self, engine: Engine) -> None:
+        try:
+            with Session(bind=engine) as session:
+                fingerprint = self._read_fingerprint(session)
+                if self._ready and fingerprint == self._fingerprint:
+                    return
+                self._load(session, fingerprint)
+        except Exception as e:
+            logger.warning(f"Could not build line item autocomplete index: {e}")
+        finally:
+            self._finish_build()
+
+    def _finish_build(self) -> None:
+        """Apply writes queued during a build that did not swap in a new index"""
+        with self._lock:
+            if self._ready:
+                for operation, argument in self._pending:
+                    self._apply(operation, argument)
+            self._pending = []
+            self._building = False
+
+    def _read_fingerprint(self, session: Session) -> Tuple[Any, ...]:
+        """Counts and latest change times; they move on every write"""
+        from app.domains.xactimate.models import XactimateItem
+
+        return table_fingerprint(session, LineItem) + table_fingerprint(session, XactimateItem)
+
+    def _load(self, session: Session, fingerprint: Tuple[Any, ...]) -> None:
+        started = time.perf_counter()
+        with self._lock:
+            self._pending = []
+
+        entries = [_line_item_entry(item) for item in session.query(LineItem)
+                   .filter(LineItem.is_active == True)
+                   .yield_per(BUILD_BATCH_SIZE)]
+        entries.extend(_xactimate_entry(row) for row in self._latest_xactimate_rows(session))
+        postings = sorted((token, entry.id) for entry in entries for token in entry.tokens)
+        usage = self._load_usage(session)
+
+        with self._lock:
+            self._clear()
+            for entry in entries:
+                self._add_to_sets(entry)
+            self._posting_tokens = [token for token, _ in postings]
+            self._posting_ids = [entry_id for _, entry_id in postings]
+            self._code_order = sorted((entry.code, entry.id) for entry in entries)
+            self._usage = usage
+            self._results.clear()
+            # Writes that happened while the rows were being read
+            for operation, argument in self._pending:
+                self._apply(operation, argument)
+            self._pending = []
+            self._fingerprint = fingerprint
+            self._ready = True
+
+        logger.info(
+            f"Built line item autocomplete index: {len(entries)} items, "
+            f"{len(postings)} tokens in {time.perf_counter() - started:.2f}s"
+        )
+
+    def _latest_xactimate_rows(self, session: Session) -> Iterable[Any]:
+        """Newest price row per Xactimate item code"""
+        from app.domains.xactimate.models import XactimateItem
+
+        query = session.query(
+            XactimateItem.id, XactimateItem.item_code, XactimateItem.category_code,
+            XactimateItem.description, XactimateItem.untaxed_unit_price
+        ).order_by(
+            XactimateItem.item_code,
+            XactimateItem.price_year.desc(),
+            XactimateItem.price_month.desc(),
+            XactimateItem.id.desc()
+        )
+        previous_code = None
+        for row in query.yield_per(BUILD_BATCH_SIZE):
+            if row.item_code != previous_code:
+                previous_code = row.item_code
+                yield row
+
+    def _load_usage(self, session: Session) -> Dict[str, int]:
+        """How many invoice and estimate items reference each line item"""
+        from app.domains.invoice.models import InvoiceItem
+        from app.domains.estimate.models import EstimateItem
+
+        usage: Dict[str, int] = {}
+        for model in (InvoiceItem, EstimateItem):
+            rows = session.query(model.line_item_id, func.count(model.id))\
+                .filter(model.line_item_id.isnot(None))\
+                .group_by(model.line_item_id)
+            for line_item_id, count in rows:
+                key = str(line_item_id)
+                usage[key] = usage.get(key, 0) + count
+        return usage
+
+    # -------------------------------------------------------------------
+    # Incremental updates
+    # -------------------------------------------------------------------
+
+    def upsert_line_item(self, item: LineItem) -> None:
+        """Add or refresh a line item after it was created or updated"""
+        if item.is_active:
+            self._mutate("upsert", _line_item_entry(item))
+        else:
+            self._mutate("remove", str(item.id))
+
+    def remove(self, entry_id: Any) -> None:
+        """Remove an item after it was deleted or deactivated"""
+        self._mutate("remove", str(entry_id))
+
+    def record_usage(self, entry_id: Any) -> None:
+        """Count one more use of an item (added to an invoice or estimate)"""
+        self._mutate("usage", str(entry_id))
+
+    def _mutate(self, operation: str, argument: Any) -> None:
+        with self._lock:
+            if self._building:
+                # Applied once, when the build finishes: replayed onto the new
+                # index, or onto the current one if nothing was rebuilt
+                self._pending.append((operation, argument))
+            elif self._ready:
+                self._apply(operation, argument)
+
+    def _apply(self, operation: str, argument: Any) -> None:
+        if operation == "upsert":
+            old = self._remove_entry(argument.id)
+            self._add_to_sets(argument)
+            insort(self._code_order, (argument.code, argument.id))
+            for token in argument.tokens:
+                position = bisect_right(self._posting_tokens, token)
+                self._posting_tokens.insert(position, token)
+                self._posting_ids.insert(position, argument.id)
+            self._invalidate_results(argument.tokens | (old.tokens if old else frozenset()))
+        elif operation == "remove":
+            old = self._remove_entry(argument)
+            if old:
+                self._invalidate_results(old.tokens)
+        elif operation == "usage":
+            self._usage[argument] = self._usage.get(argument, 0) + 1
+            entry = self._entries.get(argument)
+            if entry:
+                self._invalidate_results(entry.tokens)
+
+    def _add_to_sets(self, entry: _Entry) -> None:
+        self._entries[entry.id] = entry
+        self._by_code.setdefault(entry.code, set()).add(entry.id)
+        self._by_category.setdefault(entry.category, set()).add(entry.id)
+        self._by_source.setdefault(entry.source, set()).add(entry.id)
+        if entry.company_id:
+            self._by_company.setdefault(entry.company_id, set()).add(entry.id)
+            self._company_scoped.add(entry.id)
+
+    def _remove_entry(self, entry_id: str) -> Optional[_Entry]:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return None
+        self._by_code[entry.code].discard(entry_id)
+        self._by_category[entry.category].discard(entry_id)
+        self._by_source[entry.source].discard(entry_id)
+        if entry.company_id:
+            self._by_company[entry.company_id].discard(entry_id)
+            self._company_scoped.discard(entry_id)
+        position = bisect_left(self._code_order, (entry.code, entry_id))
+        if position < len(self._code_order) and self._code_order[position] == (entry.code, entry_id):
+            del self._code_order[position]
+        for token in entry.tokens:
+            low = bisect_left(self._posting_tokens, token)
+            high = bisect_right(self._posting_tokens, token, low)
+            position = self._posting_ids.index(entry_id, low, high)
+            del self._posting_tokens[position]
+            del self._posting_ids[position]
+        return entry
+
+    def _invalidate_results(self, tokens: FrozenSet[str]) -> None:
+        """Drop cached queries that a change to an item with these tokens can affect"""
+        for key in [key for key in self._results
+                    if any(token.startswith(query_token) for query_token in key[0] for token in tokens)]:
+            del self._results[key]
+
+    # -------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        low = bisect_left(self._posting_tokens, prefix)
+        high = bisect_left(self._posting_tokens, prefix + "\U0010ffff", low)
+        return set(self._posting_ids[low:high])
+
+    def search(self, q: str, limit: int = 20, category: Optional[str] = None,
+               company_id: Optional[Any] = None,
+               sources: Tuple[str, ...] = (SOURCE_CUSTOM, SOURCE_XACTIMATE)) -> List[Dict[str, Any]]:
+        """
+        Top matches for a type-ahead query.
+
+        Every word of q must be the prefix of a word in the item code,
+        category or description. Exact code matches rank first, then items
+        used most often, then item code.
+
+        Args:
+            q: Query text
+            limit: Maximum number of results
+            category: Only items in this category
+            company_id: Only shared items and items of this company
+                (None searches every item)
+            sources: Item sources to include
+
+        Returns:
+            Modal payloads of the best matches
+        """
+        tokens = sorted(set(tokenize(q)), key=len, reverse=True)
+        if not tokens:
+            return []
+        exact = q.strip().lower()
+        company = str(company_id) if company_id else None
+        cache_key = (tuple(tokens), exact, limit, category, company, tuple(sources))
+
+        with self._lock:
+            cached = self._results.get(cache_key)
+            if cached is not None:
+                self._results.move_to_end(cache_key)
+                return list(cached)
+
+            # Longest (most selective) token first
+            candidates = self._prefix_matches(tokens[0])
+            for token in tokens[1:]:
+                if not candidates:
+                    break
+                candidates &= self._prefix_matches(token)
+            if category:
+                candidates &= self._by_category.get(category, set())
+            if set(sources) != {SOURCE_CUSTOM, SOURCE_XACTIMATE}:
+                candidates &= set().union(*(self._by_source.get(source, set()) for source in sources))
+            if company:
+                candidates = (candidates - self._company_scoped) | \
+                    (candidates & self._by_company.get(company, set()))
+
+            ranked = self._rank(candidates, exact, limit)
+            results = [self._entries[entry_id].payload for entry_id in ranked]
+
+            self._results[cache_key] = results
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+            return list(results)
+
+    def _rank(self, candidates: Set[str], exact: str, limit: int) -> List[str]:
+        """Order by (exact code match, usage descending, code) and keep the top"""
+        entries, usage = self._entries, self._usage
+
+        def rank_key(entry_id: str) -> Tuple:
+            code = entries[entry_id].code
+            return (code != exact, -usage.get(entry_id, 0), code, entry_id)
+
+        # Exact and used items always outrank the rest, which only sort by code
+        head = (candidates & self._by_code.get(exact, set())) | (candidates & usage.keys())
+        ranked = sorted(head, key=rank_key)[:limit]
+        wanted = limit - len(ranked)
+        if wanted <= 0:
+            return ranked
+
+        rest = candidates - head
+        if wanted * len(self._code_order) < len(rest) * len(rest):
+            # Broad match: walking all items in code order reaches enough
+            # matches after about wanted * total / matches steps
+            for _, entry_id in self._code_order:
+                if entry_id in rest:
+                    ranked.append(entry_id)
+                    if len(ranked) >= limit:
+                        break
+            return ranked
+        return ranked + heapq.nsmallest(
+            wanted, rest, key=lambda entry_id: (entries[entry_id].code, entry_id)
+        )
+
+
+line_item_autocomplete = AutocompleteIndex()
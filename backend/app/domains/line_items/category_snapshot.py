@@ -0,0 +1,185 @@
+"""
+In-memory category snapshot
+
+Categories are a small, read-mostly table that the frontend requests on
+almost every screen. Instead of rebuilding the lists per request, each
+process holds one immutable snapshot with every representation the category
+endpoints serve already serialized to JSON, plus a sorted prefix index for
+search.
+
+The snapshot is rebuilt when categories are written through the category
+endpoints; other worker processes notice writes by fingerprint (see
+app.common.utils.snapshot).
+
+Every representation carries a strong ETag derived from the snapshot
+content, so it is identical across processes and clients can revalidate with
+``If-None-Match`` and get ``304 Not Modified``.
+"""
+
+import hashlib
+import json
+import logging
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.common.utils.snapshot import FingerprintedSnapshot, table_fingerprint
+from app.domains.line_items.category_models import LineItemCategory
+from app.domains.line_items.search import tokenize
+
+logger = logging.getLogger(__name__)
+
+VIEW_ALL = "all"
+VIEW_ALL_INACTIVE = "all_inactive"
+VIEW_MODAL = "modal"
+VIEW_MODAL_INACTIVE = "modal_inactive"
+
+
+def _modal_entry(category: Dict[str, Any]) -> Dict[str, Any]:
+    """Category in the format used by the selection modal"""
+    name = category['name']
+    description = category['description']
+    return {
+        "code": category['code'],
+        "description": name,
+        "full_description": f"{name} - {description}" if description else name
+    }
+
+
+@dataclass(frozen=True)
+class CategorySnapshot:
+    """Immutable view of all line item categories"""
+    version: int
+    digest: str
+    categories: Tuple[Dict[str, Any], ...]
+    views: Dict[str, bytes]
+    # Sorted (token, category index) pairs over codes, names and descriptions
+    prefix_index: Tuple[Tuple[str, int], ...]
+
+    def etag(self, *variant: Any) -> str:
+        """Strong ETag for one representation of this snapshot"""
+        if not variant:
+            return f'"{self.digest}"'
+        suffix = hashlib.sha1(repr(variant).encode("utf-8")).hexdigest()[:12]
+        return f'"{self.digest}-{suffix}"'
+
+    def search(self, q: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Prefix search over active categories.
+
+        Every word of the query must be the prefix of a word in the code,
+        name or description. Exact code matches come first, then shorter
+        codes, then display order.
+        """
+        tokens = tokenize(q)
+        if not tokens:
+            return []
+
+        matches = None
+        for token in tokens:
+            found = set()
+            position = bisect_left(self.prefix_index, (token, -1))
+            while position < len(self.prefix_index):
+                key, index = self.prefix_index[position]
+                if not key.startswith(token):
+                    break
+                found.add(index)
+                position += 1
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+
+        exact = q.strip().lower()
+        ranked = sorted(
+            (index for index in matches if self.categories[index]['is_active']),
+            key=lambda index: (
+                self.categories[index]['code'].lower() != exact,
+                len(self.categories[index]['code']),
+                self.categories[index]['display_order'] or 0,
+                index
+            )
+        )
+        return [_modal_entry(self.categories[index]) for index in ranked[:limit]]
+
+
+def _build_snapshot(db: Session, version: int) -> CategorySnapshot:
+    rows = db.query(LineItemCategory)\
+        .order_by(LineItemCategory.display_order, LineItemCategory.code)\
+        .all()
+
+    categories = [
+        dict(row.to_dict(), created_at=row.created_at, updated_at=row.updated_at)
+        for row in rows
+    ]
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    for category in categories:
+        if category['parent_code']:
+            children.setdefault(category['parent_code'], []).append(category)
+
+    def with_subcategories(category: Dict[str, Any], seen: frozenset) -> Dict[str, Any]:
+        # Guards against parent_code cycles, which the table does not prevent
+        seen = seen | {category['code']}
+        return dict(category, subcategories=[
+            with_subcategories(child, seen)
+            for child in children.get(category['code'], [])
+            if child['code'] not in seen
+        ])
+
+    full = [with_subcategories(category, frozenset()) for category in categories]
+    active_full = [category for category in full if category['is_active']]
+
+    def serialize(payload: Any) -> bytes:
+        return json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+
+    views = {
+        VIEW_ALL: serialize(active_full),
+        VIEW_ALL_INACTIVE: serialize(full),
+        VIEW_MODAL: serialize([_modal_entry(c) for c in categories if c['is_active']]),
+        VIEW_MODAL_INACTIVE: serialize([_modal_entry(c) for c in categories]),
+    }
+
+    prefix_index = set()
+    for index, category in enumerate(categories):
+        text = " ".join(filter(None, (category['code'], category['name'], category['description'])))
+        for token in tokenize(text):
+            prefix_index.add((token, index))
+        prefix_index.add((category['code'].lower(), index))
+
+    snapshot = CategorySnapshot(
+        version=version,
+        digest=hashlib.sha256(views[VIEW_ALL_INACTIVE]).hexdigest()[:32],
+        categories=tuple(categories),
+        views=views,
+        prefix_index=tuple(sorted(prefix_index)),
+    )
+    logger.info(
+        f"Built category snapshot v{snapshot.version} "
+        f"({len(snapshot.categories)} categories, etag {snapshot.digest[:8]})"
+    )
+    return snapshot
+
+
+_snapshot = FingerprintedSnapshot(
+    lambda db: table_fingerprint(db, LineItemCategory), _build_snapshot
+)
+
+
+def get_category_snapshot(db: Session) -> CategorySnapshot:
+    """
+    Get the current category snapshot, building it on first use and
+    rebuilding it when another process has changed the categories.
+    """
+    return _snapshot.get(db)
+
+
+def refresh_category_snapshot(db: Session) -> CategorySnapshot:
+    """Rebuild the snapshot after a category write in this process"""
+    return _snapshot.refresh(db)
+
+
+def invalidate_category_snapshot() -> None:
+    """Drop the snapshot so the next read rebuilds it"""
+    _snapshot.invalidate()
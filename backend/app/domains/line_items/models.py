@@ -32,6 +32,8 @@ class LineItem(Base):
     __table_args__ = (
         Index('idx_line_items_cat_item', 'cat', 'item'),
         Index('idx_line_items_company_active', 'company_id', 'is_active'),
+        # Search indexes live outside the model (see line_items/search.py):
+        # PostgreSQL search_vector + pg_trgm GIN indexes, SQLite FTS5 table
         {'extend_existing': True}
     )
     
@@ -4,7 +4,7 @@ Line Items domain repository
 
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, insert
 from sqlalchemy.orm import Session, selectinload, joinedload
 from sqlalchemy.exc import IntegrityError
 from decimal import Decimal
@@ -22,6 +22,9 @@ from app.domains.line_items.schemas import (
     LineItemTemplateCreate, LineItemTemplateUpdate,
     TemplateLineItemCreate
 )
+from app.domains.line_items.search import apply_text_search
+from app.common.base_repository import paginate_query
+from app.core.database_types import generate_uuid
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +90,15 @@ class LineItemRepository:
             .filter(LineItem.id == line_item_id)\
             .first()
     
+    def get_line_items_by_ids(self, line_item_ids: List[UUID]) -> Dict[str, LineItem]:
+        """Get several line items in one query, keyed by ID string"""
+        if not line_item_ids:
+            return {}
+        items = self.db.query(LineItem)\
+            .filter(LineItem.id.in_(set(line_item_ids)))\
+            .all()
+        return {str(item.id): item for item in items}
+    
     def get_line_items(self, search: LineItemSearch) -> Dict[str, Any]:
         """Search line items with pagination"""
         query = self.db.query(LineItem)\
@@ -118,26 +130,17 @@ class LineItemRepository:
             query = query.filter(LineItem.is_active == search.is_active)
         
         if search.search_term:
-            search_pattern = f"%{search.search_term}%"
-            query = query.filter(or_(
-                LineItem.description.ilike(search_pattern),
-                LineItem.includes.ilike(search_pattern),
-                LineItem.cat.ilike(search_pattern),
-                LineItem.item.ilike(search_pattern)
-            ))
+            # Indexed full-text/prefix search, ordered by relevance
+            query = apply_text_search(query, search.search_term)
         
-        # Get total count
-        total = query.count()
+        # Page plus total per the requested count mode (relevance ordering does not affect it)
+        items, page_info = paginate_query(query, search.page, search.page_size, search.count_mode)
         
         logger.info(
             f"Line items query - Type: {search.type}, "
-            f"Active: {search.is_active}, Total: {total}"
+            f"Active: {search.is_active}, Total: {page_info['total']}"
         )
         
-        # Apply pagination
-        offset = (search.page - 1) * search.page_size
-        items = query.offset(offset).limit(search.page_size).all()
-        
         # Debug: Log types of returned items
         if items:
             types_found = [item.type for item in items[:3]]
@@ -145,10 +148,12 @@ class LineItemRepository:
         
         return {
             "items": items,
-            "total": total,
+            "total": page_info["total"],
             "page": search.page,
             "page_size": search.page_size,
-            "total_pages": (total + search.page_size - 1) // search.page_size
+            "total_pages": page_info["total_pages"],
+            "has_more": page_info["has_more"],
+            "total_estimated": page_info["total_estimated"]
         }
     
     def update_line_item(self, line_item_id: UUID, update: LineItemUpdate) -> Optional[LineItem]:
@@ -443,29 +448,53 @@ class LineItemRepository:
             action=action,
             old_values=old_values,
             new_values=new_values,
-            changed_by=changed_by
+            changed_by=changed_by,
+            **self._price_verification(action, new_values)
         )
         
-        # Calculate price verification if applicable
-        if action in ['CREATE', 'UPDATE'] and new_values:
-            if new_values.get('type') == 'xactimate':
-                calculated = sum([
-                    new_values.get('lab', 0),
-                    new_values.get('mat', 0),
-                    new_values.get('equ', 0),
-                    new_values.get('labor_burden', 0),
-                    new_values.get('market_condition', 0)
-                ])
-                stored = new_values.get('untaxed_unit_price', 0)
-                audit.calculated_price = calculated
-                audit.stored_price = stored
-                audit.price_match = abs(calculated - stored) < 0.01
-        
         self.db.add(audit)
         self.db.commit()
         
         return audit
     
+    def create_audit_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Add audit log entries in one executemany insert.
+
+        Each entry holds line_item_id, action, new_values and changed_by
+        (old_values optional). The caller commits.
+        """
+        if not entries:
+            return
+        self.db.execute(insert(LineItemAudit), [
+            {
+                'id': generate_uuid(),
+                'old_values': None,
+                **entry,
+                **self._price_verification(entry['action'], entry.get('new_values'))
+            }
+            for entry in entries
+        ])
+    
+    @staticmethod
+    def _price_verification(action: str, new_values: Optional[Dict]) -> Dict[str, Any]:
+        """Calculated vs stored price of Xactimate items for the audit log"""
+        if action not in ['CREATE', 'UPDATE'] or not new_values or new_values.get('type') != 'xactimate':
+            return {}
+        calculated = sum([
+            new_values.get('lab', 0),
+            new_values.get('mat', 0),
+            new_values.get('equ', 0),
+            new_values.get('labor_burden', 0),
+            new_values.get('market_condition', 0)
+        ])
+        stored = new_values.get('untaxed_unit_price', 0)
+        return {
+            'calculated_price': calculated,
+            'stored_price': stored,
+            'price_match': abs(calculated - stored) < 0.01
+        }
+    
     # =====================================================
     # Performance Optimized Queries
     # =====================================================
@@ -502,13 +531,5 @@ class LineItemRepository:
         ]
     
     def search_line_items_fulltext(self, search_term: str, limit: int = 20) -> List[LineItem]:
-        """Full-text search using PostgreSQL trigram"""
-        return self.db.query(LineItem)\
-            .filter(
-                func.similarity(LineItem.description, search_term) > 0.3
-            )\
-            .order_by(
-                func.similarity(LineItem.description, search_term).desc()
-            )\
-            .limit(limit)\
-            .all()
\ No newline at end of file
+        """Ranked full-text search with prefix matching on the line item search index"""
+        return apply_text_search(self.db.query(LineItem), search_term).limit(limit).all()
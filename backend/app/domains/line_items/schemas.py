@@ -191,12 +191,13 @@ class LineItemSearch(BaseModel):
     type: Optional[LineItemType] = None  # Filter by line item type
     cat: Optional[str] = None  # Filter by category code
     item: Optional[str] = None  # Filter by item code
-    search_term: Optional[str] = None  # Search in description and includes (ILIKE)
+    search_term: Optional[str] = None  # Word-prefix search in code, category, description and includes
     description: Optional[str] = None  # Specific description search
     company_id: Optional[UUID] = None
     is_active: Optional[bool] = True
     page: int = Field(1, ge=1)
     page_size: int = Field(20, ge=1, le=100)
+    count_mode: str = Field("exact", pattern="^(exact|estimated|none)$")  # How 'total' is computed
 
 
 # =====================================================
@@ -363,6 +364,58 @@ class TaxCalculationResponse(BaseModel):
     breakdown: Dict[str, Decimal]
 
 
+class DocumentTotalsLine(BaseModel):
+    """One line of a document totals calculation"""
+    line_item_id: Optional[UUID] = None
+    quantity: Decimal = Field(Decimal('1'), ge=0)
+    rate: Optional[Decimal] = Field(None, description="Unit price; defaults to the line item's untaxed unit price")
+    taxable: bool = True
+    taxable_rate: Optional[Decimal] = Field(None, ge=0, description="Taxable part of the unit price; material only for Xactimate items")
+    tax_rate: Decimal = Field(Decimal('0'), ge=0, le=100, description="Item-level tax percentage")
+    depreciation_rate: Decimal = Field(Decimal('0'), ge=0, le=100)
+
+
+class DocumentTotalsRequest(BaseModel):
+    """Request schema for calculating a whole document's totals"""
+    items: List[DocumentTotalsLine] = Field(..., max_length=2000)
+    op_percent: Decimal = Field(Decimal('0'), ge=0)
+    tax_method: TaxMethod = TaxMethod.percentage
+    tax_rate: Decimal = Field(Decimal('0'), ge=0, le=100)
+    tax_amount: Decimal = Field(Decimal('0'), ge=0)
+    discount_amount: Decimal = Field(Decimal('0'), ge=0)
+    credit_amount: Decimal = Field(Decimal('0'), ge=0)
+    discount_reduces_tax_base: bool = True
+
+
+class DocumentTotalsLineResult(BaseModel):
+    """Per-line result of a document totals calculation"""
+    line_item_id: Optional[UUID] = None
+    quantity: Decimal
+    rate: Decimal
+    amount: Decimal
+    taxable_amount: Decimal
+    op_amount: Decimal
+    discount_amount: Decimal
+    tax_amount: Decimal
+    depreciation_amount: Decimal
+    total_amount: Decimal
+
+
+class DocumentTotalsResponse(BaseModel):
+    """Response schema for a document totals calculation"""
+    lines: List[DocumentTotalsLineResult]
+    items_subtotal: Decimal
+    op_amount: Decimal
+    subtotal: Decimal
+    taxable_amount: Decimal
+    tax_amount: Decimal
+    discount_amount: Decimal
+    depreciation_amount: Decimal
+    total_amount: Decimal
+    credit_amount: Decimal
+    amount_due: Decimal
+
+
 # =====================================================
 # Bulk Operations
 # =====================================================
@@ -386,6 +439,23 @@ class LineItemImportRequest(BaseModel):
     mapping: Optional[Dict[str, str]] = None  # Field mapping
 
 
+class LineItemImportRow(LineItemBase):
+    """One row of a line item CSV/JSONL import, matched on (company_id, cat, item)"""
+    item: str = Field(..., min_length=1, max_length=50)
+    type: LineItemType = LineItemType.CUSTOM
+    company_id: Optional[UUID] = None
+    is_active: bool = True
+
+    @model_validator(mode='after')
+    def validate_type_prices(self):
+        """Xactimate rows need at least one price component"""
+        if self.type == LineItemType.XACTIMATE and not any([
+            self.lab, self.mat, self.equ, self.labor_burden, self.market_condition
+        ]):
+            raise ValueError("Xactimate items must have at least one price component")
+        return self
+
+
 class LineItemExportRequest(BaseModel):
     """Schema for exporting line items"""
     format: str = Field(..., pattern="^(csv|excel|json|pdf)$")
@@ -0,0 +1,241 @@
+"""
+Line item text search backends
+
+Line item search runs against an index instead of scanning with
+``ILIKE '%term%'``:
+
+- PostgreSQL: a generated ``search_vector`` tsvector column with a GIN index
+  (codes weighted above descriptions, descriptions above includes) plus
+  pg_trgm GIN indexes on ``item`` and ``description`` for code prefixes and
+  typo-tolerant matches. Created by the line item search migration.
+- SQLite: an FTS5 virtual table ``line_items_fts`` kept in sync by triggers,
+  created by ``ensure_sqlite_search_index`` when the database is initialized.
+
+Every search token is matched as a word prefix, so "dry pat" finds "Drywall
+patch". Text inside a word is not matched by the index: "wall" does not find
+"Drywall" (on PostgreSQL only when trigram similarity is close enough).
+Databases without the index fall back to per-token ILIKE substring matching.
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, func, literal, literal_column, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query
+
+from app.domains.line_items.models import LineItem
+
+logger = logging.getLogger(__name__)
+
+BACKEND_POSTGRES = "postgres_fts"
+BACKEND_SQLITE_FTS5 = "sqlite_fts5"
+BACKEND_LIKE = "like"
+
+SQLITE_FTS_TABLE = "line_items_fts"
+
+# Relative bm25 weights for the FTS5 columns (id, cat, item, description, includes)
+SQLITE_FTS_WEIGHTS = (0.0, 10.0, 10.0, 4.0, 1.0)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_backend_cache: Dict[str, str] = {}
+_backend_lock = threading.Lock()
+
+
+def tokenize(search_term: Optional[str]) -> List[str]:
+    """Split a search term into lowercase word tokens"""
+    if not search_term:
+        return []
+    return _TOKEN_PATTERN.findall(search_term.lower())
+
+
+def to_tsquery_text(tokens: List[str]) -> str:
+    """Build a prefix tsquery ('dry:* & pat:*') from word tokens"""
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def to_fts5_query(tokens: List[str]) -> str:
+    """Build a prefix FTS5 MATCH expression ('"dry"* "pat"*') from word tokens"""
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def get_search_backend(engine: Engine) -> str:
+    """Detect which search index is available, once per database"""
+    key = str(engine.url)
+    backend = _backend_cache.get(key)
+    if backend is not None:
+        return backend
+
+    with _backend_lock:
+        backend = _backend_cache.get(key)
+        if backend is None:
+            backend = _detect_backend(engine)
+            _backend_cache[key] = backend
+            logger.info(f"Line item search backend: {backend}")
+    return backend
+
+
+def reset_search_backend_cache() -> None:
+    """Forget detected backends (after creating or dropping the search index)"""
+    with _backend_lock:
+        _backend_cache.clear()
+
+
+def _detect_backend(engine: Engine) -> str:
+    try:
+        with engine.connect() as conn:
+            if engine.dialect.name == "postgresql":
+                found = conn.execute(text(
+                    "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = 'line_items' AND column_name = 'search_vector')"
+                )).scalar()
+                return BACKEND_POSTGRES if found else BACKEND_LIKE
+            if engine.dialect.name == "sqlite":
+                found = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                ), {"name": SQLITE_FTS_TABLE}).first()
+                return BACKEND_SQLITE_FTS5 if found else BACKEND_LIKE
+    except Exception as e:
+        logger.warning(f"Could not detect line item search index, using ILIKE: {e}")
+    return BACKEND_LIKE
+
+
+def apply_text_search(query: Query, search_term: Optional[str]) -> Query:
+    """
+    Filter a LineItem query to items matching every token of search_term and
+    order it by relevance. Exact item code matches always rank first.
+
+    Args:
+        query: Query selecting LineItem
+        search_term: Free-text search input
+
+    Returns:
+        Filtered and ordered query (unchanged when the term has no tokens)
+    """
+    tokens = tokenize(search_term)
+    if not tokens:
+        return query
+
+    exact_code_first = case(
+        (func.lower(LineItem.item) == search_term.strip().lower(), 0),
+        else_=1
+    )
+    backend = get_search_backend(query.session.get_bind())
+
+    if backend == BACKEND_POSTGRES:
+        term = " ".join(tokens)
+        tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), to_tsquery_text(tokens))
+        search_vector = literal_column("line_items.search_vector")
+        # Typo tolerance: trigram word similarity against the description
+        fuzzy = literal(term).op("<%")(LineItem.description)
+        rank = func.ts_rank_cd(search_vector, tsquery) * 2 + func.word_similarity(term, LineItem.description)
+        return query.filter(or_(search_vector.op("@@")(tsquery), fuzzy)) \
+            .order_by(exact_code_first, rank.desc(), LineItem.item)
+
+    if backend == BACKEND_SQLITE_FTS5:
+        weights = ", ".join(str(weight) for weight in SQLITE_FTS_WEIGHTS)
+        matches = text(
+            f"SELECT id, bm25({SQLITE_FTS_TABLE}, {weights}) AS rank "
+            f"FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :fts_query"
+        ).bindparams(fts_query=to_fts5_query(tokens)) \
+            .columns(literal_column("id"), literal_column("rank")) \
+            .subquery("fts_matches")
+        # bm25() is lower for better matches
+        return query.join(matches, LineItem.id == matches.c.id) \
+            .order_by(exact_code_first, matches.c.rank, LineItem.item)
+
+    conditions = []
+    for token in tokens:
+        pattern = f"%{token}%"
+        conditions.append(or_(
+            LineItem.description.ilike(pattern),
+            LineItem.includes.ilike(pattern),
+            LineItem.cat.ilike(pattern),
+            LineItem.item.ilike(pattern)
+        ))
+    return query.filter(and_(*conditions)) \
+        .order_by(exact_code_first, func.length(LineItem.item), LineItem.item)
+
+
+def ensure_sqlite_search_index(engine: Engine) -> bool:
+    """
+    Create the FTS5 index for line items on SQLite and keep it in sync with
+    triggers. Idempotent; the index is (re)filled when first created or when
+    it no longer lines up with line_items.
+
+    Returns:
+        True if the index exists after the call
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+
+    columns = "cat, item, description, includes"
+    new_values = "new.rowid, new.id, new.cat, new.item, new.description, new.includes"
+    try:
+        with engine.begin() as conn:
+            existing = {row[0] for row in conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('line_items', :name)"
+            ), {"name": SQLITE_FTS_TABLE})}
+            if "line_items" not in existing:
+                return False
+
+            created = SQLITE_FTS_TABLE not in existing
+            if created:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5("
+                    f"id UNINDEXED, {columns}, tokenize = 'unicode61', prefix = '2 3')"
+                ))
+
+            # Index rows share the line item's rowid, so the triggers delete by
+            # rowid instead of scanning the index. Recreated on every start so
+            # older trigger definitions are replaced.
+            for trigger in ("line_items_fts_insert", "line_items_fts_delete", "line_items_fts_update"):
+                conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            conn.execute(text(
+                f"CREATE TRIGGER line_items_fts_insert AFTER INSERT ON line_items BEGIN "
+                f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, id, {columns}) VALUES ({new_values}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER line_items_fts_delete AFTER DELETE ON line_items BEGIN "
+                f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = old.rowid; END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER line_items_fts_update "
+                f"AFTER UPDATE OF id, {columns} ON line_items BEGIN "
+                f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = old.rowid; "
+                f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, id, {columns}) VALUES ({new_values}); END"
+            ))
+
+            # line_items has no INTEGER PRIMARY KEY, so VACUUM may renumber its
+            # rowids; refill the index if it no longer lines up
+            if created or not _sqlite_index_in_sync(conn):
+                conn.execute(text(f"DELETE FROM {SQLITE_FTS_TABLE}"))
+                conn.execute(text(
+                    f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, id, {columns}) "
+                    f"SELECT rowid, id, {columns} FROM line_items"
+                ))
+                logger.info("Filled SQLite FTS5 index for line items")
+        return True
+    except Exception as e:
+        # FTS5 is compiled into nearly every SQLite build, but search still
+        # works (unindexed) without it
+        logger.warning(f"Could not create SQLite line item search index: {e}")
+        return False
+    finally:
+        reset_search_backend_cache()
+
+
+def _sqlite_index_in_sync(conn) -> bool:
+    """Every line item has exactly one index row under its own rowid"""
+    items = conn.execute(text("SELECT count(*) FROM line_items")).scalar()
+    indexed = conn.execute(text(f"SELECT count(*) FROM {SQLITE_FTS_TABLE}")).scalar()
+    if items != indexed:
+        return False
+    aligned = conn.execute(text(
+        f"SELECT count(*) FROM {SQLITE_FTS_TABLE} f "
+        f"JOIN line_items l ON l.rowid = f.rowid AND l.id = f.id"
+    )).scalar()
+    return aligned == items
@@ -2,11 +2,12 @@
 Line Items domain service layer
 """
 
-from typing import List, Optional, Dict, Any
+from typing import BinaryIO, List, Optional, Dict, Any
 from uuid import UUID
 from decimal import Decimal, ROUND_HALF_UP
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from fastapi.encoders import jsonable_encoder
 import asyncio
 import json
 import logging
@@ -19,12 +20,19 @@ from app.domains.line_items.schemas import (
     LineItemNoteCreate, LineItemNoteUpdate, LineItemNoteResponse,
     LineItemTemplateCreate, LineItemTemplateUpdate, LineItemTemplateResponse,
     TaxCalculationRequest, TaxCalculationResponse,
+    DocumentTotalsRequest, DocumentTotalsResponse,
     BulkTemplateApply, InvoiceLineItemCreate, EstimateLineItemCreate,
-    LineItemOverride, TaxMethod
+    LineItemOverride, TaxMethod, LineItemImportRow
 )
 from app.domains.line_items.models import LineItem, LineItemType
+from app.domains.line_items.autocomplete import line_item_autocomplete
 from app.core.cache import CacheService
 from app.core.interfaces import ValidationError
+from app.common.utils.document_totals import calculate_document_totals
+from app.common.utils.bulk_import import (
+    BulkUpserter, ImportReport, iter_records, iter_valid_chunks
+)
+from app.core.database_types import generate_uuid
 
 # BusinessError as a simple alias
 class BusinessError(Exception):
@@ -32,6 +40,13 @@ class BusinessError(Exception):
 
 logger = logging.getLogger(__name__)
 
+# Columns written by line item imports
+LINE_ITEM_IMPORT_COLUMNS = (
+    'type', 'cat', 'item', 'description', 'includes', 'unit',
+    'lab', 'mat', 'equ', 'labor_burden', 'market_condition', 'untaxed_unit_price',
+    'company_id', 'is_active'
+)
+
 
 class LineItemService:
     """Service layer for line item operations"""
@@ -64,6 +79,7 @@ class LineItemService:
             
             # Clear cache
             self._invalidate_line_item_cache()
+            line_item_autocomplete.upsert_line_item(db_item)
             
             # Create audit log
             self.repository.create_audit_entry(
@@ -202,6 +218,7 @@ class LineItemService:
         
         # Clear cache
         self._invalidate_line_item_cache(line_item_id)
+        line_item_autocomplete.upsert_line_item(db_item)
         
         # Create audit log
         self.repository.create_audit_entry(
@@ -221,6 +238,7 @@ class LineItemService:
         if success:
             # Clear cache
             self._invalidate_line_item_cache(line_item_id)
+            line_item_autocomplete.remove(line_item_id)
             
             # Create audit log
             self.repository.create_audit_entry(
@@ -246,8 +264,63 @@ class LineItemService:
         
         # Clear cache
         self._invalidate_line_item_cache()
+        for db_item in db_items:
+            line_item_autocomplete.upsert_line_item(db_item)
 
         return [LineItemResponse.model_validate(item) for item in db_items]
+
+    async def import_line_items(self, stream: BinaryIO, fmt: str, user_id: UUID) -> Dict[str, Any]:
+        """
+        Import line items from a CSV or JSONL stream.
+
+        Rows are matched on (company_id, cat, item): existing items are
+        updated, new ones inserted with created_by set to the importing
+        user. Every written row gets a CREATE or UPDATE audit entry.
+        Invalid rows are skipped and reported; the valid rows are written
+        in one transaction.
+        """
+        report = ImportReport()
+
+        def audit_written(action: str, rows: List[Dict[str, Any]]) -> None:
+            self.repository.create_audit_entries([
+                {
+                    'line_item_id': row['id'],
+                    'action': 'CREATE' if action == 'insert' else 'UPDATE',
+                    'new_values': jsonable_encoder(
+                        {'id': row['id'], **{column: row[column] for column in LINE_ITEM_IMPORT_COLUMNS}}
+                    ),
+                    'changed_by': user_id
+                }
+                for row in rows
+            ])
+
+        upserter = BulkUpserter(
+            self.db, LineItem,
+            key_columns=('item', 'cat', 'company_id'),
+            columns=LINE_ITEM_IMPORT_COLUMNS,
+            nullable_keys=('cat', 'company_id'),
+            generated_id=generate_uuid,
+            insert_values={'created_by': user_id},
+            on_written=audit_written
+        )
+        try:
+            for chunk in iter_valid_chunks(iter_records(stream, fmt), LineItemImportRow, report):
+                upserter.write([row.model_dump(include=set(LINE_ITEM_IMPORT_COLUMNS)) for _, row in chunk])
+            report.inserted, report.updated = upserter.finish()
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Line item import failed: {e}")
+            raise BusinessError(f"Line item import failed: {e}")
+
+        self._invalidate_line_item_cache()
+        if report.inserted or report.updated:
+            line_item_autocomplete.reset()
+        logger.info(
+            f"Imported line items: {report.inserted} inserted, {report.updated} updated, "
+            f"{report.failed} failed"
+        )
+        return report.to_dict()
     
     # =====================================================
     # Note Operations
@@ -421,6 +494,8 @@ class LineItemService:
                 continue
 
             self.db.add(invoice_item)
+            if invoice_item.line_item_id:
+                line_item_autocomplete.record_usage(invoice_item.line_item_id)
             created_items.append({
                 'invoice_item': invoice_item,
                 'template_item': template_item
@@ -434,6 +509,50 @@ class LineItemService:
     # Tax Calculation
     # =====================================================
     
+    async def calculate_document_totals(
+        self,
+        request: DocumentTotalsRequest
+    ) -> DocumentTotalsResponse:
+        """
+        Calculate line and document totals for a whole invoice or estimate
+        in one pass. Referenced line items are loaded in a single query.
+        """
+        line_items = self.repository.get_line_items_by_ids(
+            [line.line_item_id for line in request.items if line.line_item_id]
+        )
+        
+        lines = []
+        for line in request.items:
+            values = line.dict()
+            if line.line_item_id:
+                line_item = line_items.get(str(line.line_item_id))
+                if not line_item:
+                    raise BusinessError(f"Line item not found: {line.line_item_id}")
+                if values['rate'] is None:
+                    values['rate'] = line_item.calculate_untaxed_unit_price()
+                if values['taxable_rate'] is None and line_item.type == LineItemType.XACTIMATE:
+                    # Only material is taxable for Xactimate
+                    values['taxable_rate'] = Decimal(str(line_item.mat or 0))
+            elif values['rate'] is None:
+                raise BusinessError("Either line_item_id or rate is required for each line")
+            lines.append(values)
+        
+        tax_method = request.tax_method.value
+        totals = calculate_document_totals(
+            lines,
+            op_percent=request.op_percent,
+            tax_method=tax_method,
+            tax_rate=request.tax_rate,
+            tax_amount=request.tax_amount if request.tax_method == TaxMethod.specific else 0,
+            discount_amount=request.discount_amount,
+            credit_amount=request.credit_amount,
+            discount_reduces_tax_base=request.discount_reduces_tax_base
+        )
+        for line, result in zip(request.items, totals['lines']):
+            result['line_item_id'] = line.line_item_id
+        
+        return DocumentTotalsResponse(**totals)
+    
     async def calculate_tax(
         self, 
         request: TaxCalculationRequest
@@ -524,6 +643,7 @@ class LineItemService:
             )
             db_line_item = self.repository.create_line_item(custom_create, user_id)
             line_item_id = db_line_item.id
+            line_item_autocomplete.upsert_line_item(db_line_item)
         elif item.line_item_id:
             line_item_id = item.line_item_id
             db_line_item = self.repository.get_line_item(line_item_id)
@@ -550,6 +670,7 @@ class LineItemService:
         self.db.add(invoice_item)
         self.db.commit()
         self.db.refresh(invoice_item)
+        line_item_autocomplete.record_usage(line_item_id)
         
         return {
             'invoice_item': invoice_item,
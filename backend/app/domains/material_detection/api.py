@@ -528,7 +528,7 @@ async def export_job_materials_csv(
             raise HTTPException(status_code=404, detail="No materials found for this job")
 
         # Export to CSV
-        csv_buffer = export_materials_to_csv(materials)
+        csv_chunks = export_materials_to_csv(materials)
 
         # Generate filename
         timestamp = dt.now().strftime('%Y%m%d_%H%M%S')
@@ -536,7 +536,7 @@ async def export_job_materials_csv(
 
         # Return as streaming response
         return StreamingResponse(
-            iter([csv_buffer.getvalue()]),
+            csv_chunks,
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -574,7 +574,7 @@ async def export_job_materials_excel(
             raise HTTPException(status_code=404, detail="No materials found for this job")
 
         # Export to Excel
-        excel_buffer = export_materials_to_excel(materials)
+        excel_chunks = export_materials_to_excel(materials)
 
         # Generate filename
         timestamp = dt.now().strftime('%Y%m%d_%H%M%S')
@@ -582,7 +582,7 @@ async def export_job_materials_excel(
 
         # Return as streaming response
         return StreamingResponse(
-            iter([excel_buffer.getvalue()]),
+            excel_chunks,
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
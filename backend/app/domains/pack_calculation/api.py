@@ -2,7 +2,7 @@
 Pack Calculation API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 import logging
 from sqlalchemy.orm import Session
 from typing import List
@@ -27,15 +27,27 @@ from .repository import (
     MLTrainingMetadataRepository,
 )
 from .service import PackCalculationService
+from .intelligent_matcher import IntelligentItemMatcher, get_item_matcher
+from .mapping_snapshot import invalidate_mapping_snapshot
+from .learned_overlay import learned_overlay
 
 router = APIRouter(prefix="/pack-calculation", tags=["pack_calculation"])
 logger = logging.getLogger(__name__)
 
 
+def get_pack_calculation_service(
+    db: Session = Depends(get_db),
+    matcher: IntelligentItemMatcher = Depends(get_item_matcher),
+) -> PackCalculationService:
+    """Get pack calculation service with the shared item matcher"""
+    return PackCalculationService(db, matcher)
+
+
 @router.post("/calculate", response_model=PackCalculationResult)
 def calculate_pack(
     request: PackCalculationRequest,
-    db: Session = Depends(get_db),
+    trace: bool = Query(False, description="Include each item's match decision path"),
+    service: PackCalculationService = Depends(get_pack_calculation_service),
     current_user: Staff = Depends(get_current_user),
 ):
     """
@@ -43,8 +55,7 @@ def calculate_pack(
     Supports multiple input methods: structured, text, image
     Auto-selects optimal calculation strategies
     """
-    service = PackCalculationService(db)
-    result = service.calculate(request, current_user.id)
+    result = service.calculate(request, current_user.id, trace=trace)
     return result
 
 
@@ -73,6 +84,7 @@ def get_seed_categories(
 def get_calculation(
     calculation_id: UUID,
     db: Session = Depends(get_db),
+    service: PackCalculationService = Depends(get_pack_calculation_service),
     current_user: Staff = Depends(get_current_user),
 ):
     """Get pack calculation by ID with full details including rooms and items"""
@@ -88,7 +100,6 @@ def get_calculation(
         )
         raise HTTPException(status_code=404, detail="Calculation not found")
 
-    service = PackCalculationService(db)
     return service.format_detail_response(calculation)
 
 
@@ -97,6 +108,7 @@ def list_calculations(
     skip: int = 0,
     limit: int = 50,
     db: Session = Depends(get_db),
+    service: PackCalculationService = Depends(get_pack_calculation_service),
     current_user: Staff = Depends(get_current_user),
 ):
     """List all pack calculations"""
@@ -108,7 +120,6 @@ def list_calculations(
 
     logger.info(f"Found {len(calculations)} pack calculations")
 
-    service = PackCalculationService(db)
     results = []
     for calc in calculations:
         try:
@@ -129,14 +140,13 @@ def list_calculations(
 def save_correction(
     calculation_id: UUID,
     correction: CorrectionInput,
-    db: Session = Depends(get_db),
+    service: PackCalculationService = Depends(get_pack_calculation_service),
     current_user: Staff = Depends(get_current_user),
 ):
     """
     Save human corrections to improve ML model
     Triggers retraining when enough corrections accumulated
     """
-    service = PackCalculationService(db)
     result = service.save_correction(
         calculation_id,
         correction,
@@ -149,17 +159,16 @@ def save_correction(
 def update_calculation(
     calculation_id: UUID,
     request: PackCalculationRequest,
-    db: Session = Depends(get_db),
+    trace: bool = Query(False, description="Include each item's match decision path"),
+    service: PackCalculationService = Depends(get_pack_calculation_service),
     current_user: Staff = Depends(get_current_user),
 ):
     """Update pack calculation - recalculate with new inputs while preserving ID"""
-    service = PackCalculationService(db)
-
     try:
         logger.info(
             f"[PackCalc] PUT update requested for calculation_id={calculation_id}"
         )
-        result = service.update(calculation_id, request, current_user.id)
+        result = service.update(calculation_id, request, current_user.id, trace=trace)
         logger.info(
             f"[PackCalc] PUT update succeeded for calculation_id={calculation_id}"
         )
@@ -242,7 +251,9 @@ def create_item_mapping(
         created_by_id=current_user.id,
     )
 
-    return repo.create(mapping)
+    created = repo.create(mapping)
+    invalidate_mapping_snapshot()
+    return created
 
 
 @router.put("/mappings/{mapping_id}", response_model=ItemMaterialMappingResponse)
@@ -271,7 +282,9 @@ def update_item_mapping(
     mapping.moving_hours_base = mapping_input.moving_hours_base
     mapping.updated_by_id = current_user.id
 
-    return repo.update(mapping)
+    updated = repo.update(mapping)
+    invalidate_mapping_snapshot()
+    return updated
 
 
 @router.delete("/mappings/{mapping_id}")
@@ -288,6 +301,7 @@ def delete_item_mapping(
         raise HTTPException(status_code=404, detail="Mapping not found")
 
     repo.delete(mapping)
+    invalidate_mapping_snapshot()
     return {"message": "Mapping deleted successfully"}
 
 
@@ -332,18 +346,23 @@ def get_ml_metrics(
         )
 
 
-@router.post("/ml/trigger-retraining")
-def trigger_ml_retraining(
+@router.post("/ml/compact-learned-matches")
+def compact_learned_matches(
     db: Session = Depends(get_db),
     current_user: Staff = Depends(get_current_user),
 ):
     """
-    Manually trigger ML model retraining
+    Compact learned item matches to the database now
     (Admin only)
+
+    Item corrections are learned incrementally as they are saved (see
+    learned_overlay) and compacted in the background; this runs a
+    compaction immediately and returns the overlay statistics.
     """
-    # TODO: Implement background job queue for retraining
-    # For now, just return success
+    written = learned_overlay.compact()
     return {
-        "message": "ML retraining triggered successfully",
-        "status": "queued"
+        "message": "Learned item matches compacted",
+        "status": "compacted",
+        "learned_matches_written": written,
+        "learned_overlay": learned_overlay.stats(),
     }
@@ -5,7 +5,22 @@ Based on fuzzy user input + furniture type + size indicators
 """
 
 from typing import Dict, Tuple, Optional
-import re
+
+from .keyword_tables import KeywordTable
+
+# Fullness label for words that cap the multiplier
+_BARELY = 'barely'
+
+
+def _quantity_rows(multipliers: Dict[str, float]):
+    """Fullness words grouped by multiplier: capping words first, then highest multiplier"""
+    by_value: Dict[float, list] = {}
+    for word, mult in multipliers.items():
+        by_value.setdefault(mult, []).append(word)
+    by_value.setdefault(1.4, []).extend(['too much', 'way too'])
+    rows = [(_BARELY, ['barely', 'hardly'])]
+    rows.extend(sorted(by_value.items(), key=lambda row: -row[0]))
+    return rows
 
 
 class ContentsEstimator:
@@ -116,6 +131,23 @@ class ContentsEstimator:
         'xl': r'\b(xl|x-large|extra\s*large|huge|massive)\b',
     }
 
+    # Priority order - more specific first ('shelf' is generic, checked last)
+    FURNITURE_TYPE_KEYWORDS = {
+        'bookshelf': ['bookshelf', 'bookshelves', 'bookcase', 'bookcases'],
+        'wardrobe': ['wardrobe', 'armoire', 'closet'],
+        'dresser': ['dresser', 'chest of drawers', 'drawer'],
+        'cabinet': ['cabinet', 'cupboard', 'hutch'],
+        'desk': ['desk', 'workstation', 'workspace'],
+        'shelf': ['shelf', 'shelves', 'shelving', 'rack'],
+    }
+
+    # Tables above compiled for single-pass scans
+    _FURNITURE_TYPE_TABLE = KeywordTable(list(FURNITURE_TYPE_KEYWORDS.items()))
+    _SIZE_TABLE = KeywordTable([(size, [pattern]) for size, pattern in SIZE_PATTERNS.items()], regex=True)
+    # "barely"/"hardly" cap the multiplier at 0.3 whatever else is said, so
+    # they rank first; then the highest multiplier wins
+    _QUANTITY_TABLE = KeywordTable(_quantity_rows(QUANTITY_MULTIPLIERS))
+
     @classmethod
     def estimate_contents(
         cls,
@@ -186,21 +218,7 @@ class ContentsEstimator:
     @classmethod
     def _detect_furniture_type(cls, item_lower: str) -> Optional[str]:
         """Detect furniture type from input string"""
-        # Priority order - more specific first
-        type_keywords = {
-            'bookshelf': ['bookshelf', 'bookshelves', 'bookcase', 'bookcases'],
-            'wardrobe': ['wardrobe', 'armoire', 'closet'],
-            'dresser': ['dresser', 'chest of drawers', 'drawer'],
-            'cabinet': ['cabinet', 'cupboard', 'hutch'],
-            'desk': ['desk', 'workstation', 'workspace'],
-            'shelf': ['shelf', 'shelves', 'shelving', 'rack'],  # Generic, check last
-        }
-
-        for furniture_type, keywords in type_keywords.items():
-            if any(kw in item_lower for kw in keywords):
-                return furniture_type
-
-        return None
+        return cls._FURNITURE_TYPE_TABLE.first_label(item_lower)
 
     @classmethod
     def _detect_size(cls, item_lower: str) -> str:
@@ -211,19 +229,15 @@ class ContentsEstimator:
         - "xl"
         - "x-large"
         """
-        # Count "extra" occurrences
-        extra_count = item_lower.count('extra')
+        size = cls._SIZE_TABLE.first_label(item_lower)
+        if size is None:
+            # Default to medium
+            return 'medium'
 
-        # Check each size pattern
-        for size, pattern in cls.SIZE_PATTERNS.items():
-            if re.search(pattern, item_lower):
-                # Upgrade size based on "extra" count
-                if size == 'large' and extra_count >= 1:
-                    return 'xl'
-                return size
-
-        # Default to medium
-        return 'medium'
+        # Upgrade size based on "extra" count
+        if size == 'large' and 'extra' in item_lower:
+            return 'xl'
+        return size
 
     @classmethod
     def _detect_quantity_multiplier(cls, item_lower: str) -> float:
@@ -235,21 +249,12 @@ class ContentsEstimator:
         - "too much stuff" → 1.3
         - "some items" → 0.5
         """
-        multiplier = 1.0  # Default: assume full
-
-        # Check for explicit quantity words
-        for word, mult in cls.QUANTITY_MULTIPLIERS.items():
-            if word in item_lower:
-                multiplier = max(multiplier, mult)  # Take highest
-
-        # Special cases
-        if 'too much' in item_lower or 'way too' in item_lower:
-            multiplier = max(multiplier, 1.4)
-
-        if 'barely' in item_lower or 'hardly' in item_lower:
-            multiplier = min(multiplier, 0.3)
-
-        return multiplier
+        multiplier = cls._QUANTITY_TABLE.first_label(item_lower)
+        if multiplier is None:
+            return 1.0  # Default: assume full
+        if multiplier == _BARELY:
+            return 0.3
+        return max(1.0, multiplier)  # Take highest, never below full
 
     @classmethod
     def _calculate_confidence(
@@ -6,11 +6,60 @@ Solves the scalability problem of hardcoded fuzzy rules by using:
 2. Category-based matching
 3. String similarity algorithms
 4. Learning from user corrections (future)
+
+One matcher is shared by every request in a process (see get_item_matcher).
+It is read-only after construction; changes are made by building a new
+matcher and swapping it in with reload_item_matcher.
 """
 
+from collections import Counter
+from types import MappingProxyType
+import hashlib
 from typing import Optional, Dict, Tuple, List
 from difflib import SequenceMatcher
+import logging
 import re
+import threading
+
+from .keyword_tables import KeywordTable
+
+logger = logging.getLogger(__name__)
+
+# Seed keys scored first in similarity matching, picked by trigram overlap
+SIMILARITY_SHORTLIST_SIZE = 8
+
+# Input words whose similar seed words are remembered per matcher
+SIMILAR_WORDS_CACHE_SIZE = 4096
+
+
+def _trigrams(text: str) -> set:
+    """Character trigrams of space-padded text"""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _ratio_bound(input_counts: Counter, input_length: int,
+                 seed_counts: Dict[str, int], seed_length: int) -> float:
+    """
+    Upper bound of SequenceMatcher.ratio() from character counts
+    (the same bound as SequenceMatcher.quick_ratio)
+    """
+    length = input_length + seed_length
+    if not length:
+        return 1.0
+    matches = 0
+    for char, count in input_counts.items():
+        seed_count = seed_counts.get(char)
+        if seed_count:
+            matches += count if count < seed_count else seed_count
+    return 2.0 * matches / length
+
+
+def _add_word_bonus(score: float, similar_word_pairs: int) -> float:
+    """Add 0.15 per similar word pair, in the same order as the original loop"""
+    for _ in range(similar_word_pairs):
+        score += 0.15
+    return score
 
 
 class IntelligentItemMatcher:
@@ -388,28 +437,94 @@ class IntelligentItemMatcher:
         'one_piece': ['one piece', 'solid', 'built-in', 'integrated'],
     }
 
-    def __init__(self, seed_mappings: Dict):
+    # Size implied by words describing several pieces
+    IMPLIED_SIZE_MODIFIERS = {
+        'large': ['set', 'suite', 'collection', 'ensemble', 'group', 'bunch', 'multiple', 'several'],
+    }
+
+    # Keyword tables above compiled for single-pass scans
+    _CATEGORY_TABLE = KeywordTable(list(CATEGORY_KEYWORDS.items()))
+    _SIZE_TABLE = KeywordTable(list(SIZE_KEYWORDS.items()), word_bounded=True)
+    _IMPLIED_SIZE_TABLE = KeywordTable(list(IMPLIED_SIZE_MODIFIERS.items()), word_bounded=True)
+    _MATERIAL_TABLE = KeywordTable(list(MATERIAL_KEYWORDS.items()))
+
+    def __init__(self, seed_mappings: Dict, version: int = 0):
         """
         Initialize matcher with seed data mappings
 
         Args:
             seed_mappings: Dictionary of item_key -> item_data from ITEM_MAPPINGS
+            version: Build number, increased on every reload
         """
-        self.seed_mappings = seed_mappings
+        self.seed_mappings = MappingProxyType(dict(seed_mappings))
+        self.version = version
+        self.fingerprint = self._fingerprint()
         self._build_reverse_index()
+        self._build_similarity_index()
         self.quantity_pattern = re.compile(self.QUANTITY_KEYWORDS['numbers'], re.IGNORECASE)
 
+    def _fingerprint(self) -> str:
+        """Content hash of the seed keys and keyword tables, equal across processes"""
+        keyword_tables = sorted(
+            (name, value) for name, value in vars(IntelligentItemMatcher).items()
+            if name.isupper() and not name.startswith('_')
+        )
+        content = repr((sorted(self.seed_mappings.keys()), keyword_tables))
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+
     def _build_reverse_index(self):
         """Build reverse index for fast category lookup"""
-        self.category_to_keys = {}
+        category_to_keys: Dict[str, List[str]] = {}
 
         for seed_key in self.seed_mappings.keys():
             category = seed_key.split('_')[0]
 
-            if category not in self.category_to_keys:
-                self.category_to_keys[category] = []
-
-            self.category_to_keys[category].append(seed_key)
+            if category not in category_to_keys:
+                category_to_keys[category] = []
+
+            category_to_keys[category].append(seed_key)
+
+        self.category_to_keys = MappingProxyType({
+            category: tuple(keys) for category, keys in category_to_keys.items()
+        })
+
+    def _build_similarity_index(self):
+        """Build trigram and word postings over the readable seed keys"""
+        self._seed_keys = tuple(self.seed_mappings.keys())
+        self._seed_readable = tuple(key.replace('_', ' ') for key in self._seed_keys)
+        self._seed_char_counts = tuple(dict(Counter(text)) for text in self._seed_readable)
+
+        trigram_postings: Dict[str, List[int]] = {}
+        word_postings: Dict[str, List[int]] = {}
+        for key_id, text in enumerate(self._seed_readable):
+            for gram in _trigrams(text):
+                trigram_postings.setdefault(gram, []).append(key_id)
+            # One entry per occurrence, so repeated words count repeatedly
+            for word in text.split():
+                word_postings.setdefault(word, []).append(key_id)
+
+        self._trigram_postings = MappingProxyType({g: tuple(ids) for g, ids in trigram_postings.items()})
+        self._word_postings = MappingProxyType({w: tuple(ids) for w, ids in word_postings.items()})
+        self._similar_words_cache: Dict[str, Tuple[str, ...]] = {}
+
+    def _similar_seed_words(self, input_word: str) -> Tuple[str, ...]:
+        """Seed words whose similarity to input_word is above 0.8"""
+        similar = self._similar_words_cache.get(input_word)
+        if similar is not None:
+            return similar
+
+        matches = []
+        for seed_word in self._word_postings:
+            # ratio() is at most 2 * shorter / total; skip words that cannot pass
+            shorter = min(len(input_word), len(seed_word))
+            if 2.0 * shorter / (len(input_word) + len(seed_word)) <= 0.8:
+                continue
+            if SequenceMatcher(None, input_word, seed_word).ratio() > 0.8:
+                matches.append(seed_word)
+        similar = tuple(matches)
+        if len(self._similar_words_cache) < SIMILAR_WORDS_CACHE_SIZE:
+            self._similar_words_cache[input_word] = similar
+        return similar
 
     # --- Helper methods (new) ---
     def normalize_text(self, text: str) -> str:
@@ -483,14 +598,7 @@ class IntelligentItemMatcher:
         return max(size_scores.items(), key=lambda x: x[1])[0]
 
     def detect_material(self, text: str) -> List[str]:
-        normalized = self.normalize_text(text)
-        materials: List[str] = []
-        for material, keywords in self.MATERIAL_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in normalized:
-                    materials.append(material)
-                    break
-        return materials
+        return self._MATERIAL_TABLE.all_labels(self.normalize_text(text))
 
     def is_fragile(self, text: str, category: Optional[str] = None) -> bool:
         normalized = self.normalize_text(text)
@@ -574,10 +682,14 @@ class IntelligentItemMatcher:
             }
         }
 
-    def match(self, item_name: str) -> Optional[str]:
+    def match(self, item_name: str, trace=None) -> Optional[str]:
         """
         Match item name to seed mapping key
 
+        Args:
+            item_name: Item name as entered
+            trace: Optional CalculationTrace that records the decision made
+
         Returns:
             Matched seed key or None
         """
@@ -588,17 +700,26 @@ class IntelligentItemMatcher:
             '+ contents', '+contents', 'with contents', '& contents', 'and contents', ' contents'
         ])
         if has_contents:
-            print(f"🚫 IntelligentMatcher: Skipping furniture matching for contents-only item: '{item_name}'")
+            logger.debug("IntelligentMatcher: Skipping furniture matching for contents-only item: '%s'", item_name)
+            if trace is not None:
+                trace.step("contents_skip", detail="contents-only items are not matched to furniture")
             return None
 
         # New: Try rich mapper first
         map_result = self.map_to_seed_item(item_name)
         mapped_key = map_result.get('seed_item')
         if mapped_key and mapped_key in self.seed_mappings and map_result.get('confidence', 0) >= 0.5:
-            print(
-                f"🎯 Semantic match: '{item_name}' → category={map_result['category']}, "
-                f"size={map_result['size']} → '{mapped_key}'"
+            logger.debug(
+                "Semantic match: '%s' -> category=%s, size=%s -> '%s'",
+                item_name, map_result['category'], map_result['size'], mapped_key
             )
+            if trace is not None:
+                trace.step(
+                    "semantic",
+                    result=mapped_key,
+                    score=map_result.get('confidence'),
+                    detail=f"category={map_result['category']}, size={map_result['size']}",
+                )
             return mapped_key
 
         # Existing flow
@@ -607,46 +728,39 @@ class IntelligentItemMatcher:
         if category:
             matched_key = self._find_seed_key_by_category_size(category, size)
             if matched_key:
-                print(f"🎯 Semantic match: '{item_name}' → category={category}, size={size} → '{matched_key}'")
+                logger.debug(
+                    "Semantic match: '%s' -> category=%s, size=%s -> '%s'", item_name, category, size, matched_key
+                )
+                if trace is not None:
+                    trace.step("semantic_keywords", result=matched_key, detail=f"category={category}, size={size}")
                 return matched_key
 
         matched_key, score = self._similarity_match(normalized)
         if matched_key and score >= 0.75:
-            print(f"🔍 Similarity match: '{item_name}' → '{matched_key}' (score: {score:.2f})")
+            logger.debug("Similarity match: '%s' -> '%s' (score: %.2f)", item_name, matched_key, score)
+            if trace is not None:
+                trace.step("similarity", result=matched_key, score=score)
             return matched_key
 
-        score_display = f"{score:.2f}" if matched_key else "0.00"
-        print(
-            f"⚠️ No confident match for '{item_name}' (best similarity: {score_display})"
-        )
+        best_score = score if matched_key else 0.0
+        logger.debug("No confident match for '%s' (best similarity: %.2f)", item_name, best_score)
+        if trace is not None:
+            trace.step(
+                "no_confident_match",
+                score=best_score,
+                detail=f"best similarity candidate: {matched_key}" if matched_key else None,
+            )
         return None
 
     def _extract_semantic_info(self, normalized_input: str) -> Tuple[Optional[str], Optional[str]]:
-        detected_category = None
-        detected_size = None
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in normalized_input:
-                    detected_category = category
-                    break
-            if detected_category:
-                break
-        for size, keywords in self.SIZE_KEYWORDS.items():
-            for keyword in keywords:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', normalized_input):
-                    detected_size = size
-                    break
-            if detected_size:
-                break
+        """First category (substring) and size (whole word) in table order"""
+        detected_category = self._CATEGORY_TABLE.first_label(normalized_input)
+        detected_size = self._SIZE_TABLE.first_label(normalized_input)
         if not detected_size:
-            for implied_size, modifiers in {'large': ['set', 'suite', 'collection', 'ensemble', 'group', 'bunch', 'multiple', 'several']}.items():
-                for modifier in modifiers:
-                    if re.search(r'\b' + re.escape(modifier) + r'\b', normalized_input):
-                        detected_size = implied_size
-                        print(f"🔍 Size modifier detected: '{modifier}' → implied size: {implied_size}")
-                        break
-                if detected_size:
-                    break
+            implied = self._IMPLIED_SIZE_TABLE.first(normalized_input)
+            if implied:
+                detected_size, modifier = implied
+                logger.debug("Size modifier detected: '%s' -> implied size: %s", modifier, detected_size)
         return detected_category, detected_size
 
     def _find_seed_key_by_category_size(self, category: str, size: Optional[str]) -> Optional[str]:
@@ -673,40 +787,144 @@ class IntelligentItemMatcher:
         return candidate_keys[0] if candidate_keys else None
 
     def _similarity_match(self, normalized_input: str) -> Tuple[Optional[str], float]:
-        best_match = None
+        """
+        Best seed key by string similarity plus 0.15 per similar word pair.
+
+        Keys sharing the most trigrams with the input are scored first. Every
+        other key is scored only if an upper bound of its score (character
+        count bound plus its exact word bonus) can still beat the best so
+        far, so the result equals scoring every key in order.
+        """
+        key_count = len(self._seed_keys)
+        if not key_count:
+            return None, 0.0
+
+        # Exact word bonus per key via the word postings
+        word_pairs = [0] * key_count
+        for input_word in normalized_input.split():
+            if len(input_word) > 3:
+                for seed_word in self._similar_seed_words(input_word):
+                    for key_id in self._word_postings[seed_word]:
+                        word_pairs[key_id] += 1
+
+        best_id: Optional[int] = None
         best_score = 0.0
-        for seed_key in self.seed_mappings.keys():
-            seed_readable = seed_key.replace('_', ' ')
-            score = SequenceMatcher(None, normalized_input, seed_readable).ratio()
-            input_words = normalized_input.split()
-            seed_words = seed_readable.split()
-            for input_word in input_words:
-                if len(input_word) > 3:
-                    for seed_word in seed_words:
-                        word_sim = SequenceMatcher(None, input_word, seed_word).ratio()
-                        if word_sim > 0.8:
-                            score += 0.15
-            if score > best_score:
-                best_score = score
-                best_match = seed_key
-        return best_match, best_score
-
-
-# Learning System (Future Enhancement)
+
+        def consider(key_id: int) -> None:
+            nonlocal best_id, best_score
+            score = SequenceMatcher(None, normalized_input, self._seed_readable[key_id]).ratio()
+            score = _add_word_bonus(score, word_pairs[key_id])
+            # Ties go to the earlier key, as in a scan in key order
+            if score > best_score or (score == best_score and best_id is not None and key_id < best_id):
+                best_id, best_score = key_id, score
+
+        overlap = Counter()
+        for gram in _trigrams(normalized_input):
+            for key_id in self._trigram_postings.get(gram, ()):
+                overlap[key_id] += 1
+        shortlist = [key_id for key_id, _ in overlap.most_common(SIMILARITY_SHORTLIST_SIZE)]
+        for key_id in shortlist:
+            consider(key_id)
+
+        input_counts = Counter(normalized_input)
+        input_length = len(normalized_input)
+        scored = set(shortlist)
+        bounds = sorted(
+            (
+                (_add_word_bonus(
+                    _ratio_bound(input_counts, input_length, self._seed_char_counts[key_id],
+                                 len(self._seed_readable[key_id])),
+                    word_pairs[key_id]
+                ), key_id)
+                for key_id in range(key_count) if key_id not in scored
+            ),
+            key=lambda bound: (-bound[0], bound[1])
+        )
+        for bound, key_id in bounds:
+            if bound < best_score:
+                break
+            if bound == best_score and (best_id is None or key_id > best_id):
+                continue
+            consider(key_id)
+
+        if best_id is None:
+            return None, best_score
+        return self._seed_keys[best_id], best_score
+
+
+_shared_matcher: Optional[IntelligentItemMatcher] = None
+_shared_matcher_version = 0
+_shared_matcher_lock = threading.Lock()
+
+
+def get_item_matcher() -> IntelligentItemMatcher:
+    """
+    Process-wide matcher over the seed mappings, built on first use.
+
+    Usable as a FastAPI dependency.
+    """
+    matcher = _shared_matcher
+    if matcher is not None:
+        return matcher
+    with _shared_matcher_lock:
+        if _shared_matcher is None:
+            _swap_matcher(None)
+        return _shared_matcher
+
+
+def reload_item_matcher(seed_mappings: Optional[Dict] = None) -> IntelligentItemMatcher:
+    """
+    Build a new shared matcher and swap it in.
+
+    Call when the seed mappings change. Database item mappings are not part
+    of the matcher; they are served by the mapping snapshot. Requests
+    already holding the previous matcher finish with it; new requests get
+    the new version.
+
+    Args:
+        seed_mappings: Mappings to match against (defaults to ITEM_MAPPINGS)
+    """
+    with _shared_matcher_lock:
+        return _swap_matcher(seed_mappings)
+
+
+def _swap_matcher(seed_mappings: Optional[Dict]) -> IntelligentItemMatcher:
+    global _shared_matcher, _shared_matcher_version
+    if seed_mappings is None:
+        from .seed_item_mappings import ITEM_MAPPINGS
+        seed_mappings = ITEM_MAPPINGS
+    _shared_matcher_version += 1
+    _shared_matcher = IntelligentItemMatcher(seed_mappings, version=_shared_matcher_version)
+    logger.info(
+        f"Built item matcher v{_shared_matcher_version} ({len(seed_mappings)} seed mappings)"
+    )
+    return _shared_matcher
+
+
+# Learning System
 class LearningMatcher:
     """
     Learns from user corrections to improve matching over time
 
     Usage:
-    1. User corrects a match: "Large dresser" -> "dresser_large"
-    2. System stores: correction_db["large dresser"] = "dresser_large"
-    3. Next time: Direct lookup before semantic matching
+    1. User corrects an item: "Large dresser" -> dresser_large materials
+    2. The correction is folded into the learned overlay (see learned_overlay)
+    3. Next time: Overlay lookup before seed and fuzzy matching
 
     This eliminates need for hardcoded rules over time.
     """
 
-    def __init__(self, db_session):
+    def __init__(self, db_session, overlay=None):
+        from .learned_overlay import learned_overlay
+
         self.db = db_session
+        self.overlay = overlay or learned_overlay
+
+    @property
+    def version(self) -> int:
+        """Changes whenever a learned match changes"""
+        self.overlay.ensure_loaded(self.db)
+        return self.overlay.version
 
     def learn_from_correction(self, original_input: str, corrected_key: str):
         """
@@ -715,8 +933,18 @@ class LearningMatcher:
         This gradually builds a custom mapping database
         that replaces hardcoded fuzzy_rules
         """
-        pass
+        from .seed_item_mappings import ITEM_MAPPINGS
+
+        if corrected_key not in ITEM_MAPPINGS:
+            raise ValueError(f"Unknown seed item '{corrected_key}'")
+        return self.learn_materials(original_input, dict(ITEM_MAPPINGS[corrected_key]["materials"]))
+
+    def learn_materials(self, original_input: str, materials: Dict[str, float]):
+        """Store corrected per-item materials for an input"""
+        self.overlay.ensure_loaded(self.db)
+        return self.overlay.learn(original_input, materials)
 
-    def get_learned_match(self, input_name: str) -> Optional[str]:
-        """Check if we have a learned match for this input"""
-        pass
+    def get_learned_match(self, input_name: str):
+        """Check if we have a learned match for this input (LearnedMatch or None)"""
+        self.overlay.ensure_loaded(self.db)
+        return self.overlay.lookup(input_name)
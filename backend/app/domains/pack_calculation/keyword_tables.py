@@ -0,0 +1,132 @@
+"""
+Compiled keyword tables
+
+The matcher and the contents estimator classify item names by scanning
+keyword lists per label (category, size, material, fullness), which took one
+``in`` test or regex search per keyword. A KeywordTable compiles a whole
+table into a single regex so one pass over the text finds the hits for
+every label.
+
+Plain keywords are compiled into a trie-shaped regex that, at each position
+of the text, matches the longest keyword starting there. Every other keyword
+starting at that position is a prefix of it, so the labels hit at that
+position are known in advance per keyword. Labels are kept in priority
+order, so the earliest label hit anywhere in the text is exactly the label a
+scan of the lists in order would have found first.
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+# (label, keywords or regex alternatives)
+KeywordRows = Sequence[Tuple[Any, Iterable[str]]]
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation of words that prefers the longest match"""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy optional tail: try the longer keywords first
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordTable:
+    """Keyword lists per label compiled into one regex"""
+
+    def __init__(self, rows: KeywordRows, word_bounded: bool = False, regex: bool = False):
+        """
+        Args:
+            rows: (label, keywords) pairs in priority order
+            word_bounded: Keywords only match as whole words (``\\b`` on both sides)
+            regex: Keywords are regular expressions rather than plain text
+        """
+        self.labels: Tuple[Any, ...] = tuple(label for label, _ in rows)
+        self._regex = regex
+
+        if regex:
+            # One named group per label, tried in priority order
+            groups = [
+                f"(?P<l{index}>{'|'.join(keywords)})"
+                for index, (_, keywords) in enumerate(rows)
+            ]
+            self._pattern = re.compile(f"(?=(?:{'|'.join(groups)}))")
+            return
+
+        label_ids: Dict[str, set] = {}
+        for index, (_, keywords) in enumerate(rows):
+            for keyword in keywords:
+                label_ids.setdefault(keyword, set()).add(index)
+
+        # Labels hit when `keyword` is the longest match at a position: its
+        # own and those of its prefixes that end on a word boundary there
+        self._hits: Dict[str, FrozenSet[int]] = {}
+        for keyword in label_ids:
+            hits = set()
+            for end in range(1, len(keyword) + 1):
+                prefix = keyword[:end]
+                if prefix not in label_ids:
+                    continue
+                if word_bounded and end < len(keyword) and (
+                    bool(_WORD_CHAR.match(keyword[end - 1])) == bool(_WORD_CHAR.match(keyword[end]))
+                ):
+                    continue
+                hits |= label_ids[prefix]
+            self._hits[keyword] = frozenset(hits)
+        self._first_hit = {keyword: min(hits) for keyword, hits in self._hits.items()}
+
+        body = _trie_pattern(label_ids)
+        if word_bounded:
+            body = rf"\b{body}\b"
+        # The lookahead lets hits overlap, so no keyword hides a later one
+        self._pattern = re.compile(f"(?=({body}))")
+
+    def _hit_ids(self, text: str) -> Iterable[FrozenSet[int]]:
+        if self._regex:
+            for match in self._pattern.finditer(text):
+                yield frozenset((int(match.lastgroup[1:]),))
+        else:
+            for match in self._pattern.finditer(text):
+                yield self._hits[match.group(1)]
+
+    def first(self, text: str) -> Optional[Tuple[Any, str]]:
+        """Highest-priority label with a hit in text, and the matched keyword"""
+        best: Optional[Tuple[int, str]] = None
+        for match in self._pattern.finditer(text):
+            if self._regex:
+                index, keyword = int(match.lastgroup[1:]), match.group(match.lastgroup)
+            else:
+                keyword = match.group(1)
+                index = self._first_hit[keyword]
+            if best is None or index < best[0]:
+                best = (index, keyword)
+                if index == 0:
+                    break
+        if best is None:
+            return None
+        return self.labels[best[0]], best[1]
+
+    def first_label(self, text: str) -> Optional[Any]:
+        """Highest-priority label with a hit in text"""
+        hit = self.first(text)
+        return hit[0] if hit else None
+
+    def all_labels(self, text: str) -> List[Any]:
+        """Every label with a hit in text, in priority order"""
+        found = set()
+        for ids in self._hit_ids(text):
+            found |= ids
+        return [self.labels[index] for index in sorted(found)]
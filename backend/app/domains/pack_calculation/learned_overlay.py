@@ -0,0 +1,239 @@
+"""
+Learned item match overlay
+
+User corrections used to be stored only for a full model retrain, so they
+changed nothing until that retrain ran. Each per-item correction is now
+folded into an in-memory overlay (normalized item name -> materials, with a
+confidence) in constant time, and the calculation consults the overlay
+ahead of the seed and fuzzy matching. A correction takes effect on the next
+calculation in the same process.
+
+Folding is a majority vote per name: a correction that agrees with the
+learned materials adds support, one that disagrees removes support and
+replaces the materials once none is left. Confidence grows with support.
+
+The overlay is compacted to one row per name in ``pack_learned_matches`` by
+a background thread every PACK_LEARNING_COMPACT_SECONDS. The same pass picks
+up rows written by other worker processes, so their corrections arrive
+within one interval. When two processes learn the same name in the same
+interval, the last one to compact wins.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Set
+
+from app.core.config import settings
+from app.core.database_factory import get_database_session
+
+from .mapping_snapshot import normalize_mapping_name
+from .repository import LearnedItemMatchRepository
+
+logger = logging.getLogger(__name__)
+
+# Learned matches below this confidence are kept but not applied
+MIN_CONFIDENCE = 0.5
+
+
+@dataclass(frozen=True)
+class LearnedMatch:
+    """Materials learned for one item name"""
+    materials: Mapping[str, float]
+    support: int
+    correction_count: int
+    last_corrected_at: Optional[datetime] = None
+
+    @property
+    def confidence(self) -> float:
+        """0.5 for a single correction, approaching 1 with agreeing ones"""
+        return self.support / (self.support + 1)
+
+
+def fold_correction(
+    current: Optional[LearnedMatch],
+    materials: Dict[str, float],
+    corrected_at: datetime
+) -> LearnedMatch:
+    """Fold one correction into the learned match for a name"""
+    if current is None:
+        return LearnedMatch(MappingProxyType(dict(materials)), 1, 1, corrected_at)
+
+    count = current.correction_count + 1
+    if dict(current.materials) == materials:
+        return LearnedMatch(current.materials, current.support + 1, count, corrected_at)
+    if current.support > 1:
+        # Outvoted for now: keep the materials with less support
+        return LearnedMatch(current.materials, current.support - 1, count, corrected_at)
+    return LearnedMatch(MappingProxyType(dict(materials)), 1, count, corrected_at)
+
+
+class LearnedMatchOverlay:
+    """In-memory learned matches, compacted to the database in the background"""
+
+    def __init__(self, compact_interval: float = 60.0):
+        """
+        Args:
+            compact_interval: Seconds between background compactions; 0 or
+                less compacts after every correction
+        """
+        self.compact_interval = compact_interval
+        self.version = 0
+        self._entries: Dict[str, LearnedMatch] = {}
+        self._dirty: Set[str] = set()
+        self._synced_until: Optional[datetime] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.corrections_learned = 0
+        self.compactions = 0
+        self.compact_errors = 0
+
+    def ensure_loaded(self, db) -> None:
+        """Load the compacted matches on first use"""
+        if self._loaded:
+            return
+        with self._compact_lock:
+            if self._loaded:
+                return
+            try:
+                self._sync(db)
+            except Exception as e:
+                # Start empty; the background compaction retries the load
+                logger.warning(f"Failed to load learned item matches: {e}")
+            self._loaded = True
+            logger.info(f"Loaded {len(self._entries)} learned item matches")
+        self._start()
+
+    def lookup(self, item_name: str) -> Optional[LearnedMatch]:
+        """Learned match for an item name, if confident enough to apply"""
+        entry = self._entries.get(normalize_mapping_name(item_name))
+        if entry is not None and entry.confidence >= MIN_CONFIDENCE:
+            return entry
+        return None
+
+    def learn(self, item_name: str, materials: Dict[str, float]) -> LearnedMatch:
+        """Fold one correction for an item name into the overlay"""
+        key = normalize_mapping_name(item_name)
+        with self._lock:
+            entry = fold_correction(self._entries.get(key), materials, datetime.now())
+            self._entries[key] = entry
+            self._dirty.add(key)
+            self.version += 1
+            self.corrections_learned += 1
+
+        if self.compact_interval <= 0 or self._stopping:
+            self.compact()
+        else:
+            self._start()
+        return entry
+
+    def compact(self) -> int:
+        """
+        Write learned matches changed since the last compaction and pick up
+        those written by other processes; returns the number written
+        """
+        with self._compact_lock:
+            with self._lock:
+                names, self._dirty = self._dirty, set()
+                rows = [self._row(name, self._entries[name]) for name in names]
+
+            try:
+                with get_database_session() as session:
+                    LearnedItemMatchRepository(session).upsert_matches(rows)
+                    self._sync(session)
+            except Exception as e:
+                with self._lock:
+                    self._dirty |= names
+                self.compact_errors += 1
+                logger.warning(f"Failed to compact {len(rows)} learned item matches: {e}")
+                return 0
+
+            self.compactions += 1
+            return len(rows)
+
+    @staticmethod
+    def _row(name: str, entry: LearnedMatch) -> Dict[str, Any]:
+        return {
+            "normalized_name": name,
+            "xactimate_materials": dict(entry.materials),
+            "support": entry.support,
+            "correction_count": entry.correction_count,
+            "confidence": round(entry.confidence, 4),
+            "last_corrected_at": entry.last_corrected_at,
+        }
+
+    def _sync(self, db) -> None:
+        """Merge rows written since the last sync; names with unsaved corrections keep theirs"""
+        rows = LearnedItemMatchRepository(db).get_changed_since(self._synced_until)
+        if not rows:
+            return
+        with self._lock:
+            changed = False
+            for name, materials, support, correction_count, _, updated_at in rows:
+                if updated_at is not None and (self._synced_until is None or updated_at > self._synced_until):
+                    self._synced_until = updated_at
+                if name in self._dirty:
+                    continue
+                materials = dict(materials or {})
+                current = self._entries.get(name)
+                if current is not None and (dict(current.materials), current.support,
+                                            current.correction_count) == (materials, support, correction_count):
+                    continue
+                self._entries[name] = LearnedMatch(
+                    MappingProxyType(materials), support or 1, correction_count or 1
+                )
+                changed = True
+            if changed:
+                self.version += 1
+
+    def _start(self):
+        if self._thread is not None or self.compact_interval <= 0 or self._stopping:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="pack-learned-matches", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.compact_interval)
+            if not self._stopping:
+                self.compact()
+
+    def stop(self, timeout: float = 10.0) -> int:
+        """Stop the background thread and compact what is pending"""
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._lock:
+            pending = bool(self._dirty)
+        return self.compact() if pending else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Overlay metrics for monitoring"""
+        with self._lock:
+            entries = len(self._entries)
+            pending = len(self._dirty)
+        return {
+            "learned_matches": entries,
+            "pending_matches": pending,
+            "version": self.version,
+            "corrections_learned": self.corrections_learned,
+            "compactions": self.compactions,
+            "compact_errors": self.compact_errors,
+            "compact_interval": self.compact_interval,
+        }
+
+
+# Process-wide overlay used by LearningMatcher
+learned_overlay = LearnedMatchOverlay(compact_interval=settings.PACK_LEARNING_COMPACT_SECONDS)
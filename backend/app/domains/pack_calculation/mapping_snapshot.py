@@ -0,0 +1,99 @@
+"""
+In-memory item mapping snapshot
+
+Pack calculations look up a database mapping for every item before falling
+back to the seed matcher. The mapping table is small and edited rarely from
+the admin endpoints, so each process holds one immutable snapshot of the
+active mappings keyed by item name, and a calculation makes no mapping
+queries per item.
+
+The mapping endpoints drop the snapshot on every write and the next read
+rebuilds it; other worker processes notice writes by fingerprint (see
+app.common.utils.snapshot). Usage count flushes keep updated_at unchanged, so
+they do not trigger a rebuild.
+"""
+
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from sqlalchemy.orm import Session
+
+from app.common.utils.snapshot import FingerprintedSnapshot, table_fingerprint
+from .models import ItemMaterialMapping
+
+logger = logging.getLogger(__name__)
+
+# Mapping fields served to the calculation
+SNAPSHOT_FIELDS = (
+    "id", "item_name", "item_category", "size_category", "xactimate_materials",
+    "estimated_weight_lb", "fragile", "requires_disassembly",
+    "packing_hours_base", "moving_hours_base",
+)
+
+
+def normalize_mapping_name(item_name: str) -> str:
+    """Lookup key for an item name: lowercase, single-spaced"""
+    return " ".join(item_name.lower().split())
+
+
+@dataclass(frozen=True)
+class MappingSnapshot:
+    """Immutable view of the active item mappings"""
+    version: int
+    by_name: Mapping[str, Mapping[str, Any]]
+    by_normalized_name: Mapping[str, Mapping[str, Any]]
+
+    def get(self, item_name: str) -> Optional[Mapping[str, Any]]:
+        """Mapping for an item name; exact name first, then normalized"""
+        entry = self.by_name.get(item_name)
+        if entry is None:
+            entry = self.by_normalized_name.get(normalize_mapping_name(item_name))
+        return entry
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+
+def _build_snapshot(db: Session, version: int) -> MappingSnapshot:
+    rows = db.query(*(getattr(ItemMaterialMapping, name) for name in SNAPSHOT_FIELDS))\
+        .filter(ItemMaterialMapping.active == True)\
+        .order_by(ItemMaterialMapping.item_name)\
+        .all()
+
+    by_name = {}
+    by_normalized_name = {}
+    for row in rows:
+        entry = dict(zip(SNAPSHOT_FIELDS, row))
+        entry["xactimate_materials"] = MappingProxyType(dict(entry["xactimate_materials"] or {}))
+        entry = MappingProxyType(entry)
+        by_name[entry["item_name"]] = entry
+        # Names differing only in case or spacing: the first in name order wins
+        by_normalized_name.setdefault(normalize_mapping_name(entry["item_name"]), entry)
+
+    snapshot = MappingSnapshot(
+        version=version,
+        by_name=MappingProxyType(by_name),
+        by_normalized_name=MappingProxyType(by_normalized_name),
+    )
+    logger.info(f"Built item mapping snapshot v{snapshot.version} ({len(snapshot)} mappings)")
+    return snapshot
+
+
+_snapshot = FingerprintedSnapshot(
+    lambda db: table_fingerprint(db, ItemMaterialMapping), _build_snapshot
+)
+
+
+def get_mapping_snapshot(db: Session) -> MappingSnapshot:
+    """
+    Get the current mapping snapshot, building it on first use and
+    rebuilding it when another process has changed the mappings.
+    """
+    return _snapshot.get(db)
+
+
+def invalidate_mapping_snapshot() -> None:
+    """Drop the snapshot so the next read rebuilds it"""
+    _snapshot.invalidate()
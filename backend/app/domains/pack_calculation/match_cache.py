@@ -0,0 +1,159 @@
+"""
+Item name match cache
+
+The same item names ("queen bed", "dresser", "tv 55 inch") recur across
+pack calculations. Matching a name to a seed mapping key is deterministic
+for a given matcher, so results are memoized in a bounded per-process LRU
+keyed by the matcher version and the normalized name. Names that match
+nothing are cached too.
+
+With PACK_MATCH_CACHE_SHARED enabled, results are also written to Redis so
+other workers can reuse them. Shared entries are keyed by the matcher's
+content fingerprint, because matcher versions are counted per process.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared entries expire after a day; a matcher change also changes their keys
+SHARED_TTL_SECONDS = 24 * 3600
+SHARED_KEY_PREFIX = "pack_match"
+
+_MISSING = object()
+
+
+class ItemMatchCache:
+    """Bounded LRU of item name -> seed mapping key with hit-rate counters"""
+
+    def __init__(self, max_size: int = 10000, shared: bool = False):
+        self.max_size = max_size
+        self.shared = shared
+        self._entries: "OrderedDict[Tuple[int, str], Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._backend: Any = None
+        self._backend_resolved = False
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.shared_errors = 0
+
+    def get_or_compute(self, matcher: Any, normalized_name: str,
+                       compute: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Cached match for a normalized item name.
+
+        Args:
+            matcher: The IntelligentItemMatcher the result depends on
+            normalized_name: Lower-cased, stripped item name
+            compute: Runs the full match when the name is not cached
+        """
+        key = (matcher.version, normalized_name)
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._shared_get(matcher, normalized_name)
+        if value is not _MISSING:
+            with self._lock:
+                self.shared_hits += 1
+            self._store(key, value)
+            return value
+
+        value = compute()
+        with self._lock:
+            self.misses += 1
+        self._store(key, value)
+        self._shared_set(matcher, normalized_name, value)
+        return value
+
+    def _store(self, key: Tuple[int, str], value: Optional[str]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    # Shared backend (Redis through the application cache client)
+
+    def _shared_client(self) -> Any:
+        if not self.shared:
+            return None
+        if not self._backend_resolved:
+            from app.core.cache import InMemoryCache, get_cache
+            client = get_cache().redis_client
+            # A per-process fallback cache would only duplicate the local LRU
+            self._backend = None if isinstance(client, InMemoryCache) else client
+            self._backend_resolved = True
+        return self._backend
+
+    @staticmethod
+    def _shared_key(matcher: Any, normalized_name: str) -> str:
+        digest = hashlib.sha1(normalized_name.encode("utf-8")).hexdigest()
+        return f"{SHARED_KEY_PREFIX}:{matcher.fingerprint}:{digest}"
+
+    def _shared_get(self, matcher: Any, normalized_name: str) -> Any:
+        client = self._shared_client()
+        if client is None:
+            return _MISSING
+        try:
+            raw = client.get(self._shared_key(matcher, normalized_name))
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared match cache read failed: {e}")
+            return _MISSING
+        if raw is None:
+            return _MISSING
+        return json.loads(raw).get("key")
+
+    def _shared_set(self, matcher: Any, normalized_name: str, value: Optional[str]) -> None:
+        client = self._shared_client()
+        if client is None:
+            return
+        try:
+            client.setex(
+                self._shared_key(matcher, normalized_name),
+                SHARED_TTL_SECONDS,
+                json.dumps({"key": value})
+            )
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared match cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop local entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = self.shared_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics for monitoring"""
+        shared = self._shared_client() is not None
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+                "shared": shared,
+                "shared_errors": self.shared_errors,
+            }
+
+
+item_match_cache = ItemMatchCache(
+    max_size=settings.PACK_MATCH_CACHE_SIZE,
+    shared=settings.PACK_MATCH_CACHE_SHARED
+)
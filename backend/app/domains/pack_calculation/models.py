@@ -217,6 +217,27 @@ class ItemMaterialMapping(Base, BaseModel):
     updated_by_id = Column(UUIDType(), ForeignKey("staff.id"))
 
 
+class LearnedItemMatch(Base, BaseModel):
+    """
+    Item material mapping learned from user corrections
+    One compacted row per normalized item name (see learned_overlay)
+    """
+    __tablename__ = "pack_learned_matches"
+    __table_args__ = (
+        Index('ix_pack_learned_matches_updated_at', 'updated_at'),
+        {'extend_existing': True}
+    )
+
+    normalized_name = Column(String(255), nullable=False, unique=True, index=True)
+    xactimate_materials = Column(JSONB, nullable=False)  # {code: quantity_per_item}
+
+    # Corrections agreeing with the current materials, net of disagreeing ones
+    support = Column(Integer, default=1, nullable=False)
+    correction_count = Column(Integer, default=1, nullable=False)
+    confidence = Column(Float)
+    last_corrected_at = Column(DateTime)
+
+
 class MLTrainingMetadata(Base, BaseModel):
     """
     Metadata for ML model training sessions
@@ -3,8 +3,10 @@ Pack Calculation repository
 """
 
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, and_, or_, func, desc
-from typing import List, Optional, Dict
+from sqlalchemy import select, and_, or_, func, desc, update, bindparam, cast, column, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import DateTime, Integer
+from typing import Any, List, Optional, Dict, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
 
@@ -14,8 +16,10 @@ from .models import (
     PackRoom,
     PackItem,
     ItemMaterialMapping,
+    LearnedItemMatch,
     MLTrainingMetadata
 )
+from app.core.database_types import generate_uuid
 
 
 class PackCalculationRepository(SQLAlchemyRepository):
@@ -85,6 +89,28 @@ class PackCalculationRepository(SQLAlchemyRepository):
         )
         return result.scalars().all()
 
+    def insert_results(
+        self,
+        calculation: Optional[Dict],
+        rooms: List[Dict],
+        items: List[Dict]
+    ) -> None:
+        """
+        Write a calculation with its rooms and items, one batched insert per table
+
+        Rows carry client-generated ids, so no flush is needed to learn parent
+        ids. Runs in the current transaction - the caller commits.
+
+        Args:
+            calculation: Calculation row, or None when it already exists
+            rooms: Room rows referencing the calculation id
+            items: Item rows referencing their room ids
+        """
+        if calculation is not None:
+            self.bulk_insert([calculation])
+        self.bulk_insert(rooms, PackRoom)
+        self.bulk_insert(items, PackItem)
+
 
 class PackRoomRepository(SQLAlchemyRepository):
     """Repository for pack rooms"""
@@ -95,11 +121,10 @@ class PackRoomRepository(SQLAlchemyRepository):
 
     def delete_by_calculation_id(self, calculation_id):
         """Delete all rooms (and their items) for a calculation"""
-        rooms = self.db.query(PackRoom).filter(PackRoom.calculation_id == calculation_id).all()
-        for room in rooms:
-            # Delete items first (cascade should handle this, but explicit is better)
-            self.db.query(PackItem).filter(PackItem.room_id == room.id).delete()
-            self.db.delete(room)
+        room_ids = select(PackRoom.id).where(PackRoom.calculation_id == calculation_id)
+        # Items first: two set-based deletes instead of one per room
+        self.db.query(PackItem).filter(PackItem.room_id.in_(room_ids)).delete(synchronize_session=False)
+        self.db.query(PackRoom).filter(PackRoom.calculation_id == calculation_id).delete(synchronize_session=False)
         self.db.flush()  # Flush changes but don't commit - let the caller handle transaction
 
 
@@ -185,6 +210,57 @@ class ItemMaterialMappingRepository(SQLAlchemyRepository):
             }
             self.update(mapping_id, update_data)
 
+    def apply_usage_counts(self, counts: Dict[str, Tuple[int, datetime]]) -> int:
+        """
+        Add buffered usage counts in one statement
+
+        updated_at is left as is (overriding its onupdate) because usage is
+        not a content change and must not bump the mapping snapshot version.
+
+        Args:
+            counts: mapping_id -> (uses to add, last time used)
+
+        Returns:
+            Number of mappings updated
+        """
+        if not counts:
+            return 0
+        table = ItemMaterialMapping.__table__
+        rows = [(str(mapping_id), uses, last_used) for mapping_id, (uses, last_used) in counts.items()]
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            # UPDATE ... FROM (VALUES ...) in a single round trip
+            pending = values(
+                column("id"), column("uses", Integer), column("last_used", DateTime),
+                name="pending"
+            ).data(rows)
+            statement = (
+                update(table)
+                .where(table.c.id == cast(pending.c.id, table.c.id.type))
+                .values(
+                    usage_count=func.coalesce(table.c.usage_count, 0) + pending.c.uses,
+                    last_used_at=pending.c.last_used,
+                    updated_at=table.c.updated_at,
+                )
+            )
+            return self.db.execute(statement).rowcount
+
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("mapping_id"))
+            .values(
+                usage_count=func.coalesce(table.c.usage_count, 0) + bindparam("uses"),
+                last_used_at=bindparam("last_used"),
+                updated_at=table.c.updated_at,
+            )
+        )
+        self.db.execute(statement, [
+            {"mapping_id": mapping_id, "uses": uses, "last_used": last_used}
+            for mapping_id, uses, last_used in rows
+        ])
+        return len(rows)
+
     def count_similar_calculations(self, item_name: str, category: Optional[str] = None) -> int:
         """Count how many times similar items were calculated"""
         mapping = self.get_by_item_name(item_name)
@@ -224,3 +300,93 @@ class MLTrainingMetadataRepository(SQLAlchemyRepository):
             .limit(limit)
         )
         return result.scalars().all()
+
+
+class LearnedItemMatchRepository(SQLAlchemyRepository):
+    """Repository for item matches learned from corrections"""
+
+    # Columns written when compacting learned matches
+    FIELDS = ("normalized_name", "xactimate_materials", "support", "correction_count",
+              "confidence", "last_corrected_at")
+
+    def __init__(self, db: Session):
+        super().__init__(db, LearnedItemMatch)
+        self.db = db
+
+    def get_changed_since(self, since: Optional[datetime] = None) -> List[Tuple[Any, ...]]:
+        """
+        Learned matches written at or after `since` (all when None)
+
+        Returns:
+            (normalized_name, xactimate_materials, support, correction_count,
+            confidence, updated_at) tuples
+        """
+        statement = select(
+            LearnedItemMatch.normalized_name,
+            LearnedItemMatch.xactimate_materials,
+            LearnedItemMatch.support,
+            LearnedItemMatch.correction_count,
+            LearnedItemMatch.confidence,
+            LearnedItemMatch.updated_at,
+        )
+        if since is not None:
+            # Inclusive: rows written in the same clock tick as `since` are not missed
+            statement = statement.where(LearnedItemMatch.updated_at >= since)
+        return [tuple(row) for row in self.db.execute(statement).all()]
+
+    def upsert_matches(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Write learned matches, one row per normalized name
+
+        Args:
+            rows: Dicts with the FIELDS columns
+
+        Returns:
+            Number of matches written
+        """
+        if not rows:
+            return 0
+        table = LearnedItemMatch.__table__
+        now = func.now()
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            # INSERT ... ON CONFLICT DO UPDATE in a single round trip
+            statement = pg_insert(table).values([
+                dict(row, id=generate_uuid(), updated_at=now) for row in rows
+            ])
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.normalized_name],
+                set_={
+                    **{name: statement.excluded[name] for name in self.FIELDS if name != "normalized_name"},
+                    "updated_at": now,
+                },
+            )
+            self.db.execute(statement)
+            return len(rows)
+
+        existing = set(self.db.execute(
+            select(table.c.normalized_name)
+            .where(table.c.normalized_name.in_([row["normalized_name"] for row in rows]))
+        ).scalars())
+        updates = [row for row in rows if row["normalized_name"] in existing]
+        inserts = [row for row in rows if row["normalized_name"] not in existing]
+        if updates:
+            self.db.execute(
+                update(table)
+                .where(table.c.normalized_name == bindparam("match_name"))
+                .values(
+                    **{name: bindparam(f"new_{name}") for name in self.FIELDS if name != "normalized_name"},
+                    updated_at=now,
+                ),
+                [
+                    {"match_name": row["normalized_name"], **{f"new_{name}": value for name, value in row.items()}}
+                    for row in updates
+                ]
+            )
+        if inserts:
+            self.db.execute(
+                table.insert().values(updated_at=now),
+                [dict(row, id=generate_uuid()) for row in inserts]
+            )
+        return len(rows)
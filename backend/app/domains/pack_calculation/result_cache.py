@@ -0,0 +1,91 @@
+"""
+Pack calculation result cache
+
+Users often recalculate the same rooms and items after cosmetic changes
+(a new name, address or notes). The computed breakdown depends only on the
+room/item/building input, the matcher and the item mappings, so it is
+memoized in a bounded per-process LRU keyed by a canonical hash of that
+input plus the matcher and mapping snapshot versions. On a hit the service
+skips matching and material computation and only persists new records.
+
+Entries are deep-copied in and out, so callers may mutate what they get.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from app.core.config import settings
+
+# Request fields that only label the record and never affect the result
+RECORD_ONLY_FIELDS = {"calculation_name", "project_address", "notes"}
+
+
+def calculation_cache_key(kind: str, request: Any, versions: Tuple[Any, ...]) -> str:
+    """
+    Canonical key for a calculation input
+
+    Args:
+        kind: Calculation flow ("calculate" or "update"), which compute differently
+        request: PackCalculationRequest
+        versions: Versions of everything else the result depends on
+    """
+    payload = request.model_dump(mode="json", exclude=RECORD_ONLY_FIELDS)
+    canonical = json.dumps([kind, list(versions), payload], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CalculationResultCache:
+    """Bounded LRU of input hash -> computed calculation outcome"""
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """Cached outcome for key, computing it on a miss; returns (outcome, hit)"""
+        if self.max_size > 0:
+            with self._lock:
+                outcome = self._entries.get(key)
+                if outcome is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(outcome), True
+                self.misses += 1
+
+        outcome = compute()
+
+        if self.max_size > 0:
+            stored = copy.deepcopy(outcome)
+            with self._lock:
+                self._entries[key] = stored
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return outcome, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Process-wide cache used by PackCalculationService
+calculation_result_cache = CalculationResultCache(max_size=settings.PACK_RESULT_CACHE_SIZE)
@@ -124,6 +124,23 @@ class StrategiesUsed(BaseModel):
     fuzzy_matches: List[FuzzyMatch] = []
 
 
+class MatchTraceStep(BaseModel):
+    """One decision in an item's match path"""
+    phase: str  # materials, labor
+    stage: str  # contents, db_mapping, seed_exact, semantic, similarity, essential_rule, default, ...
+    result: Optional[str] = None
+    score: Optional[float] = None
+    detail: Optional[str] = None
+
+
+class ItemMatchTrace(BaseModel):
+    """Match decision path for one item (returned when tracing is requested)"""
+    room_name: str
+    item_name: str
+    quantity: int
+    steps: List[MatchTraceStep] = []
+
+
 class RoomBreakdown(BaseModel):
     """Room-level calculation breakdown"""
     room_id: UUID
@@ -181,6 +198,9 @@ class PackCalculationResult(BaseModel):
     created_at: datetime
     created_by_id: UUID
 
+    # Per-item match decisions, only when tracing was requested
+    trace: Optional[List[ItemMatchTrace]] = None
+
 
 class PackItemResponse(BaseModel):
     """Response for a single item"""
@@ -223,11 +243,18 @@ class PackCalculationDetailResponse(PackCalculationResult):
 
 
 # Correction schemas
+class ItemCorrectionInput(BaseModel):
+    """Corrected materials for one item, learned for future calculations"""
+    item_name: str
+    corrected_materials: Dict[str, float]  # {code: quantity_per_item}
+
+
 class CorrectionInput(BaseModel):
     """Input for correcting a calculation"""
     corrected_materials: Dict[str, float]  # {code: corrected_quantity}
     corrected_labor: Dict[str, float]
     correction_notes: str
+    item_corrections: List[ItemCorrectionInput] = []
 
 
 class MLMetricsResponse(BaseModel):
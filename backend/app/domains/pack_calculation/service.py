@@ -14,8 +14,15 @@ import os
 from pathlib import Path
 from difflib import SequenceMatcher
 
+from app.core.database_types import generate_uuid
+
 from .models import PackCalculation, PackRoom, PackItem
-from .intelligent_matcher import IntelligentItemMatcher
+from .intelligent_matcher import IntelligentItemMatcher, LearningMatcher, get_item_matcher
+from .match_cache import item_match_cache
+from .usage_counter import mapping_usage_counter
+from .mapping_snapshot import get_mapping_snapshot
+from .result_cache import calculation_cache_key, calculation_result_cache
+from .tracing import CalculationTrace, LABOR_PHASE
 from .contents_estimator import ContentsEstimator
 from .schemas import (
     PackCalculationRequest,
@@ -28,6 +35,7 @@ from .schemas import (
     PackRoomResponse,
     PackItemResponse,
     RoomBreakdown,
+    ItemMatchTrace,
 )
 from .repository import (
     PackCalculationRepository,
@@ -47,7 +55,7 @@ from .seed_item_mappings import (
 class PackCalculationService:
     """Service for pack-in/out calculations"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, matcher: Optional[IntelligentItemMatcher] = None):
         self.logger = logging.getLogger(__name__)
         self.db = db
         self.calc_repo = PackCalculationRepository(db)
@@ -57,14 +65,19 @@ class PackCalculationService:
         self.fuzzy_matching_used = False  # Track if fuzzy matching was used
         self.fuzzy_matches = []  # Track fuzzy match details: [{original, matched, materials}]
         self.contents_estimations = []  # Track contents estimation details
+        self.mapping_uses = []  # Ids of database mappings used, for usage counts
+        self.trace: Optional[CalculationTrace] = None  # Set for traced requests
 
-        # Initialize intelligent matcher
-        self.intelligent_matcher = IntelligentItemMatcher(ITEM_MAPPINGS)
+        # Shared, read-only matcher (built once per process)
+        self.intelligent_matcher = matcher or get_item_matcher()
+        # Item matches learned from user corrections, applied ahead of seed matching
+        self.learning_matcher = LearningMatcher(db)
 
     def calculate(
         self,
         request: PackCalculationRequest,
-        user_id: UUID
+        user_id: UUID,
+        trace: bool = False
     ) -> PackCalculationResult:
         """
         Main calculation flow
@@ -74,12 +87,101 @@ class PackCalculationService:
         4. Calculate protection and debris
         5. Save calculation
         6. Return result
+
+        Steps 1-4 are skipped when the same input was calculated before
+        (see result_cache). With trace, the response includes each item's
+        match decision path (see tracing).
+        """
+        self.trace = CalculationTrace() if trace else None
+        outcome = self._cached_outcome("calculate", request, self._compute_calculation)
+
+        calculation_id = generate_uuid()
+        calculation_data = dict(
+            outcome["calculation"],
+            id=calculation_id,
+            calculation_name=request.calculation_name,
+            project_address=request.project_address,
+            notes=request.notes,
+            created_by_id=str(user_id),
+        )
+        rooms_data = self._persist_outcome(outcome, calculation_id, calculation_data)
+        calculation = self.calc_repo.get_by_id(calculation_id)
+
+        # Format response with room breakdown
+        return self._with_trace(self.format_calculation_response(calculation, rooms_data))
+
+    def _with_trace(self, result: PackCalculationResult) -> PackCalculationResult:
+        """Attach the recorded match trace to a response, if tracing"""
+        if self.trace is not None:
+            result.trace = [ItemMatchTrace.model_validate(item) for item in self.trace.items]
+        return result
+
+    def _cached_outcome(
+        self,
+        kind: str,
+        request: PackCalculationRequest,
+        compute
+    ) -> Dict[str, Any]:
+        """
+        Computed rooms, items and totals for a request, from the result cache
+        when the same input was computed with the same matcher, mappings and
+        learned matches.
+        Traced requests always compute, so every decision gets recorded.
+        """
+        if self.trace is not None:
+            return compute(request)
+
+        versions = (
+            self.intelligent_matcher.fingerprint,
+            self.intelligent_matcher.version,
+            get_mapping_snapshot(self.db).version,
+            self.learning_matcher.version,
+        )
+        key = calculation_cache_key(kind, request, versions)
+        outcome, hit = calculation_result_cache.get_or_compute(key, lambda: compute(request))
+        if hit:
+            # Usage counts were recorded when the outcome was computed; count this use too
+            self.logger.debug("[PackCalc] Result cache hit for %s (%s)", kind, key[:12])
+            for mapping_id in outcome["mapping_uses"]:
+                mapping_usage_counter.increment(mapping_id)
+        return outcome
+
+    def _persist_outcome(
+        self,
+        outcome: Dict[str, Any],
+        calculation_id: str,
+        calculation_data: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Write computed rooms and items under a calculation (and the calculation
+        itself when given) with new ids; returns the room breakdown with room ids
+        """
+        room_rows: List[Dict[str, Any]] = []
+        item_rows: List[Dict[str, Any]] = []
+        rooms_data: List[Dict[str, Any]] = []
+        for (room, items), breakdown in zip(outcome["rooms"], outcome["rooms_data"]):
+            room_id = generate_uuid()
+            room_rows.append(dict(room, id=room_id, calculation_id=calculation_id))
+            item_rows.extend(dict(item, room_id=room_id) for item in items)
+            rooms_data.append({"room_id": room_id, **breakdown})
+
+        self.calc_repo.insert_results(calculation_data, room_rows, item_rows)
+        return rooms_data
+
+    def _compute_calculation(self, request: PackCalculationRequest) -> Dict[str, Any]:
         """
+        Compute a new calculation without writing anything
 
+        Returns:
+            Outcome with 'calculation' (record fields), 'rooms' ((room row,
+            item rows) pairs without ids), 'rooms_data' (room breakdown) and
+            'mapping_uses' (database mapping ids used)
+        """
         # Reset tracking for new calculation
         self.fuzzy_matching_used = False
         self.fuzzy_matches = []
         self.contents_estimations = []
+        self.mapping_uses = []
 
         # For now, implement basic rule-based calculation
         # TODO: Add strategy selection and AI integration
@@ -107,13 +209,9 @@ class PackCalculationService:
 
         # Create calculation record as dictionary
         calculation_data = {
-            "calculation_name": request.calculation_name,
-            "project_address": request.project_address,
-            "notes": request.notes,
             "building_type": request.building_info.building_type,
             "total_floors": total_floors,  # Auto-calculated from rooms
             "has_elevator": request.building_info.has_elevator,
-            "created_by_id": str(user_id),
             "ml_used": False,  # Basic version doesn't use ML yet
             "ml_confidence": 0.8,  # Default confidence
             "needs_review": False,
@@ -125,8 +223,9 @@ class PackCalculationService:
             },
         }
 
-        # Save calculation first to get ID
-        calculation = self.calc_repo.create(calculation_data)
+        # Rows get ids and are written in batches once the calculation is
+        # complete (see _persist_outcome)
+        room_rows: List[tuple] = []
 
         # Process each room
         all_materials = {}
@@ -138,7 +237,6 @@ class PackCalculationService:
         for room_input in request.rooms:
             # Create room record as dictionary
             room_data = {
-                "calculation_id": calculation["id"],
                 "room_name": room_input.room_name,
                 "floor_level": room_input.floor_level,
                 "input_method": room_input.input_method,
@@ -146,7 +244,8 @@ class PackCalculationService:
                 "image_url": room_input.image_url,
                 "ai_confidence": 0.8,
             }
-            room = self.room_repo.create(room_data)
+            item_rows: List[Dict[str, Any]] = []
+            room_rows.append((room_data, item_rows))
 
             # Process each item in room
             room_materials = {}
@@ -176,6 +275,9 @@ class PackCalculationService:
                     room_moving_hours += default_box_count * 0.10 * moving_mult
 
             for item_input in room_input.items:
+                if self.trace is not None:
+                    self.trace.begin_item(room_input.room_name, item_input.item_name, item_input.quantity)
+
                 # Get material mapping
                 item_materials = self._get_materials_for_item(item_input)
                 
@@ -193,7 +295,10 @@ class PackCalculationService:
                         for code, qty in wrap_consumables.items():
                             item_materials[code] = item_materials.get(code, 0) + qty
                 else:
-                    print(f"🚫 Skipping wrapping consumables for contents-only item: '{item_input.item_name}'")
+                    self.logger.debug(
+                        "[PackCalc] Skipping wrapping consumables for contents-only item: '%s'",
+                        item_input.item_name
+                    )
 
                 # Calculate labor for this item
                 packing_hours, moving_hours = self._calculate_item_labor(
@@ -219,7 +324,6 @@ class PackCalculationService:
 
                 # Create item record as dictionary
                 item_data = {
-                    "room_id": room["id"],
                     "item_name": item_input.item_name,
                     "item_category": item_input.item_category,
                     "quantity": item_input.quantity,
@@ -232,16 +336,15 @@ class PackCalculationService:
                     "confidence_score": 1.0,
                     "xactimate_materials": item_materials,
                 }
-                self.item_repo.create(item_data)
+                item_rows.append(item_data)
 
-            # Update room totals
-            room_update_data = {
+            # Room totals
+            room_data.update({
                 "xactimate_materials": room_materials,
                 "packing_hours": room_packing_hours,
                 "moving_hours": room_moving_hours,
                 "floor_multiplier": floor_mult.get("moving_down", 1.0),
-            }
-            room = self.room_repo.update(room["id"], room_update_data)
+            })
 
             # Store room data for breakdown
             # Build brief explanations per room
@@ -268,7 +371,6 @@ class PackCalculationService:
             )
 
             rooms_data.append({
-                "room_id": room["id"],
                 "room_name": room_input.room_name,
                 "floor_level": room_input.floor_level,
                 "materials": room_materials,
@@ -386,10 +488,13 @@ class PackCalculationService:
                 "pack_in_labor": pack_in_labor,
             },
         }
-        calculation = self.calc_repo.update(calculation["id"], calculation_update_data)
-
-        # Format response with room breakdown
-        return self.format_calculation_response(calculation, rooms_data)
+        calculation_data.update(calculation_update_data)
+        return {
+            "calculation": calculation_data,
+            "rooms": room_rows,
+            "rooms_data": rooms_data,
+            "mapping_uses": self.mapping_uses,
+        }
 
     def _calculate_total_floors_from_rooms(self, rooms: List) -> int:
         """Calculate total_floors automatically from room floor_levels"""
@@ -414,17 +519,15 @@ class PackCalculationService:
         self,
         calculation_id: UUID,
         request: PackCalculationRequest,
-        user_id: UUID
+        user_id: UUID,
+        trace: bool = False
     ) -> PackCalculationResult:
         """
         Update existing calculation with new inputs
         Preserves calculation_id and metadata, only updates calculation results
         """
-        # Reset tracking for update calculation
-        self.fuzzy_matching_used = False
-        self.fuzzy_matches = []
-        self.contents_estimations = []
-        
+        self.trace = CalculationTrace() if trace else None
+
         # Get existing calculation
         self.logger.info(
             f"[PackCalc] Service.update start id={calculation_id}"
@@ -436,11 +539,7 @@ class PackCalculationService:
             )
             raise ValueError(f"Calculation {calculation_id} not found")
 
-        # Calculate total_floors from room floor_levels automatically
-        total_floors = self._calculate_total_floors_from_rooms(request.rooms)
-        self.logger.debug(
-            f"[PackCalc] Update: Auto-calculated total_floors: {total_floors} from rooms"
-        )
+        outcome = self._cached_outcome("update", request, self._compute_update)
 
         # Delete old rooms and items
         self.logger.debug(
@@ -448,23 +547,63 @@ class PackCalculationService:
         )
         self.room_repo.delete_by_calculation_id(calculation_id)
 
-        # Reset fuzzy matching tracking
+        self.logger.info(
+            f"[PackCalc] Persisting updated aggregates for id={calculation_id}"
+        )
+        rooms_data = self._persist_outcome(outcome, str(calculation_id), None)
+        calculation_update_data = dict(
+            outcome["calculation"],
+            calculation_name=request.calculation_name,
+            project_address=request.project_address,
+        )
+        # Perform update; even if the ORM doesn't return the entity, fetch it after
+        _ = self.calc_repo.update(calculation_id, calculation_update_data)
+
+        # Fetch latest calculation snapshot to ensure consistency
+        calculation = self.calc_repo.get_by_id(calculation_id)
+        if not calculation:
+            self.logger.error(
+                f"[PackCalc] Updated calculation not found after update "
+                f"id={calculation_id}"
+            )
+            # Fall back to basic dict with id to avoid 404s
+            calculation = {"id": calculation_id, "calculation_name": request.calculation_name}
+
+        # Format response with room breakdown
+        self.logger.debug(
+            f"[PackCalc] Formatting response rooms_count={len(rooms_data)} "
+            f"id={calculation_id}"
+        )
+        return self._with_trace(self.format_calculation_response(calculation, rooms_data))
+
+    def _compute_update(self, request: PackCalculationRequest) -> Dict[str, Any]:
+        """Compute new results for an existing calculation without writing anything"""
+        # Reset tracking for update calculation
         self.fuzzy_matching_used = False
         self.fuzzy_matches = []
+        self.contents_estimations = []
+        self.mapping_uses = []
+
+        # Calculate total_floors from room floor_levels automatically
+        total_floors = self._calculate_total_floors_from_rooms(request.rooms)
+        self.logger.debug(
+            f"[PackCalc] Update: Auto-calculated total_floors: {total_floors} from rooms"
+        )
 
         # Process rooms and items (same as calculate)
         rooms_data = []
         all_materials = {}
         total_packing_hours = 0.0
         total_moving_hours = 0.0
+        room_rows: List[tuple] = []
 
         for room_input in request.rooms:
             room_data = {
                 "room_name": room_input.room_name,
                 "floor_level": room_input.floor_level,
-                "calculation_id": calculation_id,
             }
-            room = self.room_repo.create(room_data)
+            item_rows: List[Dict[str, Any]] = []
+            room_rows.append((room_data, item_rows))
 
             # Track room-level materials and labor
             room_materials = {}
@@ -493,6 +632,9 @@ class PackCalculationService:
 
             # Create items and calculate
             for item_input in room_input.items:
+                if self.trace is not None:
+                    self.trace.begin_item(room_input.room_name, item_input.item_name, item_input.quantity)
+
                 # Get materials
                 item_materials = self._get_materials_for_item(item_input)
                 # Add wrapping consumables based on item type/fragility
@@ -525,9 +667,8 @@ class PackCalculationService:
                     "floor_level": item_input.floor_level or room_input.floor_level,
                     "requires_disassembly": item_input.requires_disassembly,
                     "fragile": item_input.fragile,
-                    "room_id": room["id"],
                 }
-                self.item_repo.create(item_data)
+                item_rows.append(item_data)
 
             # Store room data for breakdown (same structure as calculate)
             building_info_dict = None
@@ -553,7 +694,6 @@ class PackCalculationService:
             )
 
             rooms_data.append({
-                "room_id": room["id"],
                 "room_name": room_input.room_name,
                 "floor_level": room_input.floor_level,
                 "materials": room_materials,
@@ -667,8 +807,6 @@ class PackCalculationService:
 
         # Update calculation with new results
         calculation_update_data = {
-            "calculation_name": request.calculation_name,
-            "project_address": request.project_address,
             "building_type": request.building_info.building_type if request.building_info else None,
             "total_floors": total_floors,  # Use auto-calculated total_floors
             "has_elevator": request.building_info.has_elevator if request.building_info else False,
@@ -697,29 +835,12 @@ class PackCalculationService:
                 "pack_in_labor": pack_in_labor,
             },
         }
-
-        self.logger.info(
-            f"[PackCalc] Persisting updated aggregates for id={calculation_id}"
-        )
-        # Perform update; even if the ORM doesn't return the entity, fetch it after
-        _ = self.calc_repo.update(calculation_id, calculation_update_data)
-
-        # Fetch latest calculation snapshot to ensure consistency
-        calculation = self.calc_repo.get_by_id(calculation_id)
-        if not calculation:
-            self.logger.error(
-                f"[PackCalc] Updated calculation not found after update "
-                f"id={calculation_id}"
-            )
-            # Fall back to basic dict with id to avoid 404s
-            calculation = {"id": calculation_id, "calculation_name": request.calculation_name}
-
-        # Format response with room breakdown
-        self.logger.debug(
-            f"[PackCalc] Formatting response rooms_count={len(rooms_data)} "
-            f"id={calculation_id}"
-        )
-        return self.format_calculation_response(calculation, rooms_data)
+        return {
+            "calculation": calculation_update_data,
+            "rooms": room_rows,
+            "rooms_data": rooms_data,
+            "mapping_uses": self.mapping_uses,
+        }
 
     def _build_room_explanations(
         self,
@@ -1345,29 +1466,52 @@ class PackCalculationService:
             adjusted[code] = new_qty
         return adjusted
 
-    def _normalize_item_name(self, item_name: str) -> Optional[str]:
+    def _normalize_item_name(
+        self,
+        item_name: str,
+        trace: Optional[CalculationTrace] = None
+    ) -> Optional[str]:
         """
         Normalize item name to match seed mapping keys using intelligent matching
 
-        Uses IntelligentItemMatcher for scalable matching without hardcoded rules
+        Uses IntelligentItemMatcher for scalable matching without hardcoded rules.
+        Results are memoized per matcher version (see match_cache), except
+        when tracing, where every decision is made and recorded.
         """
-        # Normalize input
         normalized_input = item_name.lower().strip()
-        
+        if trace is not None:
+            return self._match_item_name(item_name, normalized_input, trace)
+        return item_match_cache.get_or_compute(
+            self.intelligent_matcher,
+            normalized_input,
+            lambda: self._match_item_name(item_name, normalized_input)
+        )
+
+    def _match_item_name(
+        self,
+        item_name: str,
+        normalized_input: str,
+        trace: Optional[CalculationTrace] = None
+    ) -> Optional[str]:
+        """Run the full match pipeline for one item name"""
         # Skip matching if item has "contents" - contents should not match furniture
         has_contents = any(keyword in normalized_input for keyword in [
             '+ contents', '+contents', 'with contents', '& contents', 'and contents', ' contents'
         ])
         if has_contents:
-            print(f"🚫 Skipping furniture matching for contents-only item: '{item_name}'")
+            self.logger.debug("[PackCalc] Skipping furniture matching for contents-only item: '%s'", item_name)
+            if trace is not None:
+                trace.step("contents_skip", detail="contents-only items are not matched to furniture")
             return None
 
         # Direct match first
         if normalized_input in ITEM_MAPPINGS:
+            if trace is not None:
+                trace.step("seed_normalized", result=normalized_input)
             return normalized_input
 
         # Use intelligent matcher (semantic + similarity)
-        matched_key = self.intelligent_matcher.match(item_name)
+        matched_key = self.intelligent_matcher.match(item_name, trace=trace)
         if matched_key:
             return matched_key
 
@@ -1382,7 +1526,9 @@ class PackCalculationService:
         # Check essential fuzzy rules (fallback)
         for key_phrase, mapping_key in essential_fuzzy_rules.items():
             if key_phrase in normalized_input:
-                print(f"📋 Essential fuzzy rule match: '{item_name}' → '{mapping_key}'")
+                self.logger.debug("[PackCalc] Essential fuzzy rule match: '%s' -> '%s'", item_name, mapping_key)
+                if trace is not None:
+                    trace.step("essential_rule", result=mapping_key, detail=f"contains '{key_phrase}'")
                 return mapping_key
 
         # No match found
@@ -1432,22 +1578,22 @@ class PackCalculationService:
                 best_match = seed_key
 
         if best_match:
-            print(f"🔍 Similarity match: '{normalized_input}' → '{best_match}' (score: {best_score:.2f})")
+            self.logger.debug(
+                "[PackCalc] Similarity match: '%s' -> '%s' (score: %.2f)",
+                normalized_input, best_match, best_score
+            )
             return best_match
 
         return None
 
     def _get_materials_for_item(self, item_input) -> Dict[str, float]:
         """Get Xactimate materials for an item"""
+        trace = self.trace
         # Check if item has "+ contents" or "with contents" (check at end or anywhere)
         item_name_lower = item_input.item_name.lower()
         has_contents = any(keyword in item_name_lower for keyword in [
             '+ contents', '+contents', 'with contents', '& contents', 'and contents', ' contents'
         ])
-        
-        # Debug log
-        if has_contents:
-            print(f"🔍 Contents detected in: '{item_input.item_name}'")
 
         # Remove contents suffix for matching
         base_item_name = item_input.item_name
@@ -1458,7 +1604,9 @@ class PackCalculationService:
                     idx = item_name_lower.index(suffix)
                     base_item_name = item_input.item_name[:idx].strip()
                     break
-            print(f"📦 Detected contents: '{item_input.item_name}' → base item: '{base_item_name}'")
+            self.logger.debug(
+                "[PackCalc] Detected contents: '%s' -> base item: '%s'", item_input.item_name, base_item_name
+            )
 
         # If contents detected, ONLY use contents materials (no furniture materials)
         if has_contents:
@@ -1469,17 +1617,23 @@ class PackCalculationService:
                 furniture_type=furniture_type
             )
 
-            print(f"📦 Contents-only estimation: '{item_input.item_name}' → furniture: {furniture_type}")
-            print(f"   Contents estimation: {contents_estimate.get('reasoning', 'N/A')}")
-            print(f"   Boxes: {contents_estimate['boxes_needed']}, "
-                  f"Packing hours: {contents_estimate['packing_hours']}, "
-                  f"Confidence: {contents_estimate['confidence']:.0%}")
-
             # Use ONLY contents materials (no furniture PAD, WRAP, etc.)
             materials = dict(contents_estimate['line_items'])
-            
-            print(f"📦 Contents materials (NO furniture materials): {materials}")
-            print(f"   Expected box type: {contents_estimate.get('line_items', {}).keys()}")
+
+            self.logger.debug(
+                "[PackCalc] Contents-only estimation: '%s' -> furniture: %s, boxes: %s, "
+                "packing hours: %s, confidence: %.2f, materials: %s (%s)",
+                item_input.item_name, furniture_type, contents_estimate['boxes_needed'],
+                contents_estimate['packing_hours'], contents_estimate['confidence'],
+                materials, contents_estimate.get('reasoning', 'N/A')
+            )
+            if trace is not None:
+                trace.step(
+                    "contents",
+                    result=f"{furniture_type}_contents" if furniture_type else "contents",
+                    score=contents_estimate.get('confidence'),
+                    detail=contents_estimate.get('reasoning'),
+                )
 
             # Track contents estimation for display in Fuzzy Matching Details
             self.contents_estimations.append({
@@ -1500,21 +1654,36 @@ class PackCalculationService:
             return materials
 
         # If NO contents, proceed with furniture matching
-        # Try database mapping first
-        mapping = self.mapping_repo.get_by_item_name(base_item_name)
+        # Try database mapping first (in-memory snapshot of the mapping table)
+        mapping = get_mapping_snapshot(self.db).get(base_item_name)
+        learned = None if mapping else self.learning_matcher.get_learned_match(base_item_name)
 
         if mapping:
-            # Increment usage count
-            self.mapping_repo.increment_usage(mapping["id"])
+            # Increment usage count (buffered, written in batches)
+            mapping_usage_counter.increment(mapping["id"])
+            self.mapping_uses.append(mapping["id"])
             materials = dict(mapping["xactimate_materials"])
-            print(f"✅ Found DB mapping for '{base_item_name}': {materials}")
+            self.logger.debug("[PackCalc] Found DB mapping for '%s': %s", base_item_name, materials)
+            if trace is not None:
+                trace.step("db_mapping", result=mapping["item_name"])
+        elif learned:
+            # Learned from user corrections (see learned_overlay)
+            materials = dict(learned.materials)
+            self.logger.debug(
+                "[PackCalc] Found learned match for '%s' (confidence %.2f): %s",
+                base_item_name, learned.confidence, materials
+            )
+            if trace is not None:
+                trace.step("learned", score=learned.confidence, detail=f"corrections: {learned.correction_count}")
         elif base_item_name in ITEM_MAPPINGS:
             # Try exact match in seed data
             materials = dict(ITEM_MAPPINGS[base_item_name]["materials"])
-            print(f"✅ Found exact seed mapping for '{base_item_name}': {materials}")
+            self.logger.debug("[PackCalc] Found exact seed mapping for '%s': %s", base_item_name, materials)
+            if trace is not None:
+                trace.step("seed_exact", result=base_item_name)
         else:
             # Try fuzzy matching
-            normalized_key = self._normalize_item_name(base_item_name)
+            normalized_key = self._normalize_item_name(base_item_name, trace)
             if normalized_key and normalized_key in ITEM_MAPPINGS:
                 materials = dict(ITEM_MAPPINGS[normalized_key]["materials"])
                 self.fuzzy_matching_used = True  # Track fuzzy matching usage
@@ -1527,14 +1696,16 @@ class PackCalculationService:
                     "quantity": item_input.quantity
                 })
 
-                print(f"✅ Found fuzzy seed mapping: '{base_item_name}' → '{normalized_key}': {materials}")
+                self.logger.debug(
+                    "[PackCalc] Found fuzzy seed mapping: '%s' -> '%s': %s", base_item_name, normalized_key, materials
+                )
             else:
-                # Debug: show what we're looking for
-                print(f"⚠️ No mapping found for item: '{base_item_name}'")
-                print(f"   Available seed mappings (first 10): {list(ITEM_MAPPINGS.keys())[:10]}")
+                self.logger.debug("[PackCalc] No mapping found for item: '%s'", base_item_name)
 
                 # Default fallback - medium box
                 materials = {"CPS BX": 1, "CPS BWRAP": 10}
+                if trace is not None:
+                    trace.step("default", detail="no mapping found, using one medium box")
 
         return materials
 
@@ -1585,6 +1756,10 @@ class PackCalculationService:
         is_pack_out: bool = True
     ) -> tuple[float, float]:
         """Calculate packing and moving hours for an item"""
+        # Pack-in repeats the pack-out lookup, so only pack-out is traced
+        trace = self.trace if is_pack_out else None
+        if trace is not None:
+            trace.phase = LABOR_PHASE
         item_name_lower = item_input.item_name.lower()
         
         # Check if item has "contents" - if so, use ONLY contents labor, no furniture labor
@@ -1596,7 +1771,10 @@ class PackCalculationService:
             # Contents-only: use contents packing hours only (no furniture moving hours)
             if hasattr(item_input, '_contents_packing_hours'):
                 packing_hours = item_input._contents_packing_hours
-                print(f"📦 Contents-only labor: '{item_input.item_name}' → {packing_hours:.2f}h (contents only, no furniture)")
+                self.logger.debug(
+                    "[PackCalc] Contents-only labor: '%s' -> %.2fh (contents only, no furniture)",
+                    item_input.item_name, packing_hours
+                )
             else:
                 # Fallback: estimate contents packing (should have been set by _get_materials_for_item)
                 # Use ContentsEstimator to get packing hours
@@ -1606,39 +1784,53 @@ class PackCalculationService:
                     furniture_type=furniture_type
                 )
                 packing_hours = contents_estimate['packing_hours']
-                print(f"📦 Contents-only labor (fallback): '{item_input.item_name}' → {packing_hours:.2f}h")
+                self.logger.debug(
+                    "[PackCalc] Contents-only labor (fallback): '%s' -> %.2fh", item_input.item_name, packing_hours
+                )
+            if trace is not None:
+                trace.step("contents", detail=f"{packing_hours:.2f}h packing, contents only")
             # Contents don't need furniture moving - just boxes moving
             moving_hours = 0.1  # Minimal moving for boxes only
             return (packing_hours, moving_hours)
         
         # For furniture (no contents): try database mapping
-        mapping = self.mapping_repo.get_by_item_name(item_input.item_name)
+        mapping = get_mapping_snapshot(self.db).get(item_input.item_name)
 
         if mapping:
             packing_hours = mapping.get("packing_hours_base") or 0.3
             moving_hours = mapping.get("moving_hours_base") or 0.2
+            if trace is not None:
+                trace.step("db_mapping", result=mapping["item_name"])
         elif item_input.item_name in ITEM_MAPPINGS:
             # Try exact match in seed data
             item_data = ITEM_MAPPINGS[item_input.item_name]
             packing_hours = item_data.get("packing_hours", 0.3)
             moving_hours = item_data.get("moving_hours", 0.2)
+            if trace is not None:
+                trace.step("seed_exact", result=item_input.item_name)
         else:
             # Try fuzzy matching
-            normalized_key = self._normalize_item_name(item_input.item_name)
+            normalized_key = self._normalize_item_name(item_input.item_name, trace)
             if normalized_key and normalized_key in ITEM_MAPPINGS:
                 item_data = ITEM_MAPPINGS[normalized_key]
-                print(f"✅ Found fuzzy labor mapping: '{item_input.item_name}' → '{normalized_key}'")
+                self.logger.debug(
+                    "[PackCalc] Found fuzzy labor mapping: '%s' -> '%s'", item_input.item_name, normalized_key
+                )
                 packing_hours = item_data.get("packing_hours", 0.3)
                 moving_hours = item_data.get("moving_hours", 0.2)
             else:
                 # Default fallback
                 packing_hours = 0.3
                 moving_hours = 0.2
+                if trace is not None:
+                    trace.step("default", detail="no mapping found, using 0.3h packing / 0.2h moving")
 
         # Add contents packing hours if available (from contents estimator)
         # This handles cases where furniture AND contents are both packed
         if hasattr(item_input, '_contents_packing_hours'):
-            print(f"   Adding contents packing hours: {item_input._contents_packing_hours:.2f}h")
+            self.logger.debug(
+                "[PackCalc] Adding contents packing hours: %.2fh", item_input._contents_packing_hours
+            )
             packing_hours += item_input._contents_packing_hours
 
         return (packing_hours, moving_hours)
@@ -1885,7 +2077,7 @@ class PackCalculationService:
 
             # Debug log for unit mapping
             if not item_info:
-                print(f"⚠️ Code '{code}' not found in XACTIMATE_LINE_ITEMS")
+                self.logger.debug("[PackCalc] Code '%s' not found in XACTIMATE_LINE_ITEMS", code)
 
             return XactimateLineItem(
                 code=code,
@@ -1899,7 +2091,7 @@ class PackCalculationService:
 
         # Convert materials dict to XactimateLineItem list with descriptions
         pack_out_materials_dict = parse_json_field(calculation.get("xactimate_pack_out_materials"))
-        print(f"🔍 Pack out materials codes: {list(pack_out_materials_dict.keys())}")
+        self.logger.debug("[PackCalc] Pack out materials codes: %s", list(pack_out_materials_dict.keys()))
         pack_out_materials = [
             create_line_item(
                 code=code,
@@ -2011,7 +2203,10 @@ class PackCalculationService:
             if not isinstance(materials_dict, dict):
                 materials_dict = {}
             
-            print(f"🔍 Formatting room {room_data.get('room_name')}: materials_dict={materials_dict}, type={type(materials_dict)}")
+            self.logger.debug(
+                "[PackCalc] Formatting room %s: materials_dict=%s, type=%s",
+                room_data.get('room_name'), materials_dict, type(materials_dict)
+            )
             
             room_materials = [
                 create_line_item(code=code, quantity=qty, category="CPS")
@@ -2019,7 +2214,7 @@ class PackCalculationService:
                 if isinstance(code, str) and isinstance(qty, (int, float)) and qty > 0
             ]
             
-            print(f"🔍 Converted to {len(room_materials)} line items")
+            self.logger.debug("[PackCalc] Converted to %s line items", len(room_materials))
             
             # Create pack-out labor line item for this room
             pack_out_hours = room_data.get("pack_out_labor_hours", 0)
@@ -2089,7 +2284,7 @@ class PackCalculationService:
             BuildingInfo,
         )
         
-        print(f"🔍 format_detail_response START: calculation type={type(calculation)}")
+        self.logger.debug("[PackCalc] format_detail_response START: calculation type=%s", type(calculation))
 
         # Helper to parse JSON fields
         def parse_json_field(field_value):
@@ -2106,11 +2301,18 @@ class PackCalculationService:
         
         # Convert SQLAlchemy model to dict if needed, but keep original for direct relationship access
         if not isinstance(calculation, dict):
-            print(f"🔍 Converting calculation from {type(calculation)} to dict")
+            self.logger.debug("[PackCalc] Converting calculation from %s to dict", type(calculation))
             calculation_dict = self.calc_repo._convert_to_dict(calculation)
-            print(f"🔍 After conversion: type={type(calculation_dict)}, has rooms={calculation_dict.get('rooms') is not None}")
+            self.logger.debug(
+                "[PackCalc] After conversion: type=%s, has rooms=%s",
+                type(calculation_dict), calculation_dict.get('rooms') is not None
+            )
             if calculation_dict.get("rooms"):
-                print(f"🔍 Rooms count: {len(calculation_dict.get('rooms'))}, first room type={type(calculation_dict['rooms'][0]) if calculation_dict['rooms'] else 'N/A'}")
+                self.logger.debug(
+                    "[PackCalc] Rooms count: %s, first room type=%s",
+                    len(calculation_dict.get('rooms')),
+                    type(calculation_dict['rooms'][0]) if calculation_dict['rooms'] else 'N/A'
+                )
         else:
             calculation_dict = calculation
             
@@ -2119,27 +2321,35 @@ class PackCalculationService:
 
         # Prepare room breakdown data for basic response
         rooms_breakdown_data = []
-        print(f"🔍 format_detail_response: calculation type={type(calculation)}, has rooms={calculation.get('rooms') is not None}")
+        self.logger.debug(
+            "[PackCalc] format_detail_response: calculation type=%s, has rooms=%s",
+            type(calculation), calculation.get('rooms') is not None
+        )
         if calculation.get("rooms"):
-            print(f"🔍 Found {len(calculation.get('rooms'))} rooms in calculation")
+            self.logger.debug("[PackCalc] Found %s rooms in calculation", len(calculation.get('rooms')))
             
             # Try to get rooms from original SQLAlchemy object if available
             sqlalchemy_rooms = None
             if hasattr(original_calculation, 'rooms'):
                 sqlalchemy_rooms = list(original_calculation.rooms)
-                print(f"🔍 Got {len(sqlalchemy_rooms)} rooms from SQLAlchemy object")
+                self.logger.debug("[PackCalc] Got %s rooms from SQLAlchemy object", len(sqlalchemy_rooms))
             
             for idx, room_obj in enumerate(calculation["rooms"]):
-                print(f"🔍 Processing room {idx}: type={type(room_obj)}")
+                self.logger.debug("[PackCalc] Processing room %s: type=%s", idx, type(room_obj))
                 room = room_obj if isinstance(room_obj, dict) else self.calc_repo._convert_to_dict(room_obj)
                 
                 # Get corresponding SQLAlchemy room object if available
                 sqlalchemy_room = None
                 if sqlalchemy_rooms and idx < len(sqlalchemy_rooms):
                     sqlalchemy_room = sqlalchemy_rooms[idx]
-                    print(f"🔍 Got SQLAlchemy room object for room {idx}")
+                    self.logger.debug("[PackCalc] Got SQLAlchemy room object for room %s", idx)
                 
-                print(f"🔍 Room after conversion: type={type(room)}, keys={list(room.keys()) if isinstance(room, dict) else 'not dict'}, has items={room.get('items') is not None}")
+                self.logger.debug(
+                    "[PackCalc] Room after conversion: type=%s, keys=%s, has items=%s",
+                    type(room),
+                    list(room.keys()) if isinstance(room, dict) else 'not dict',
+                    room.get('items') is not None
+                )
 
                 # Aggregate materials from all items in the room
                 room_materials = {}
@@ -2152,7 +2362,10 @@ class PackCalculationService:
                 
                 # First, get materials directly from room if they exist
                 room_level_materials = parse_json_field(room.get("xactimate_materials"))
-                print(f"🔍 Room {room.get('room_name')}: room_level_materials={room_level_materials}")
+                self.logger.debug(
+                    "[PackCalc] Room %s: room_level_materials=%s",
+                    room.get('room_name'), room_level_materials
+                )
                 if room_level_materials:
                     for code, qty in room_level_materials.items():
                         if isinstance(code, str) and isinstance(qty, (int, float)):
@@ -2164,12 +2377,12 @@ class PackCalculationService:
                     # Use SQLAlchemy object's items relationship directly
                     try:
                         items_list = list(sqlalchemy_room.items) if sqlalchemy_room.items else []
-                        print(f"🔍 SQLAlchemy room has {len(items_list)} items")
+                        self.logger.debug("[PackCalc] SQLAlchemy room has %s items", len(items_list))
                         if items_list:
                             items = [self.calc_repo._convert_to_dict(item) for item in items_list]
-                            print(f"🔍 Converted {len(items)} items from SQLAlchemy")
+                            self.logger.debug("[PackCalc] Converted %s items from SQLAlchemy", len(items))
                     except Exception as e:
-                        print(f"🔍 Error accessing items from SQLAlchemy object: {e}")
+                        self.logger.debug("[PackCalc] Error accessing items from SQLAlchemy object: %s", e)
                         import traceback
                         traceback.print_exc()
                         items = None
@@ -2177,7 +2390,7 @@ class PackCalculationService:
                 # Fallback to dict items if SQLAlchemy didn't work
                 if not items and isinstance(room, dict):
                     items = room.get("items")
-                    print(f"🔍 Fallback: Got {len(items) if items else 0} items from dict")
+                    self.logger.debug("[PackCalc] Fallback: Got %s items from dict", len(items) if items else 0)
                 elif not items and hasattr(room, 'items'):
                     # If room is still a SQLAlchemy object, try to access items directly
                     try:
@@ -2185,23 +2398,37 @@ class PackCalculationService:
                         if items_list:
                             items = [self.calc_repo._convert_to_dict(item) for item in items_list]
                     except Exception as e:
-                        print(f"🔍 Error accessing items from room object: {e}")
+                        self.logger.debug("[PackCalc] Error accessing items from room object: %s", e)
                         items = None
                 
-                print(f"🔍 Room {room.get('room_name') if isinstance(room, dict) else getattr(room, 'room_name', 'Unknown')}: items={items}, type={type(items)}, items_len={len(items) if items else 0}")
+                self.logger.debug(
+                    "[PackCalc] Room %s: items=%s, type=%s, items_len=%s",
+                    room.get('room_name') if isinstance(room, dict) else getattr(room, 'room_name', 'Unknown'),
+                    items, type(items), len(items) if items else 0
+                )
                 if items and len(items) > 0:
                     item_count = len(items)
-                    print(f"🔍 Room {room.get('room_name')}: Processing {item_count} items")
+                    self.logger.debug("[PackCalc] Room %s: Processing %s items", room.get('room_name'), item_count)
                     for item_obj in items:
                         item = item_obj if isinstance(item_obj, dict) else self.calc_repo._convert_to_dict(item_obj)
-                        print(f"🔍 Item: {item.get('item_name')}, xactimate_materials_raw={item.get('xactimate_materials')}, type={type(item.get('xactimate_materials'))}, item_keys={list(item.keys()) if isinstance(item, dict) else 'N/A'}")
+                        self.logger.debug(
+                            "[PackCalc] Item: %s, xactimate_materials_raw=%s, type=%s, item_keys=%s",
+                            item.get('item_name'), item.get('xactimate_materials'),
+                            type(item.get('xactimate_materials')),
+                            list(item.keys()) if isinstance(item, dict) else 'N/A'
+                        )
                         
                         # Try to get materials from SQLAlchemy object directly if item_obj is not dict
                         if item.get("xactimate_materials") is None and not isinstance(item_obj, dict) and hasattr(item_obj, 'xactimate_materials'):
-                            print(f"🔍 Trying to get xactimate_materials from SQLAlchemy object directly")
+                            self.logger.debug(
+                                "[PackCalc] Trying to get xactimate_materials from SQLAlchemy object directly"
+                            )
                             try:
                                 sqlalchemy_materials = item_obj.xactimate_materials
-                                print(f"🔍 SQLAlchemy xactimate_materials: {sqlalchemy_materials}, type={type(sqlalchemy_materials)}")
+                                self.logger.debug(
+                                    "[PackCalc] SQLAlchemy xactimate_materials: %s, type=%s",
+                                    sqlalchemy_materials, type(sqlalchemy_materials)
+                                )
                                 if sqlalchemy_materials is not None:
                                     if isinstance(sqlalchemy_materials, dict):
                                         item["xactimate_materials"] = sqlalchemy_materials
@@ -2214,18 +2441,27 @@ class PackCalculationService:
                                             item["xactimate_materials"] = sqlalchemy_materials.data
                                         else:
                                             item["xactimate_materials"] = dict(sqlalchemy_materials) if sqlalchemy_materials else {}
-                                    print(f"🔍 Extracted materials from SQLAlchemy: {item.get('xactimate_materials')}")
+                                    self.logger.debug(
+                                        "[PackCalc] Extracted materials from SQLAlchemy: %s",
+                                        item.get('xactimate_materials')
+                                    )
                             except Exception as e:
-                                print(f"🔍 Error getting materials from SQLAlchemy: {e}")
+                                self.logger.debug("[PackCalc] Error getting materials from SQLAlchemy: %s", e)
                                 import traceback
                                 traceback.print_exc()
                         
                         item_materials = parse_json_field(item.get("xactimate_materials"))
-                        print(f"🔍 Item {item.get('item_name')}: parsed materials={item_materials}, len={len(item_materials) if item_materials else 0}")
+                        self.logger.debug(
+                            "[PackCalc] Item %s: parsed materials=%s, len=%s",
+                            item.get('item_name'), item_materials, len(item_materials) if item_materials else 0
+                        )
                         
                         # If materials are empty or None, try to recalculate them
                         if not item_materials or len(item_materials) == 0:
-                            print(f"🔍 Item {item.get('item_name')}: materials empty, attempting to recalculate")
+                            self.logger.debug(
+                                "[PackCalc] Item %s: materials empty, attempting to recalculate",
+                                item.get('item_name')
+                            )
                             try:
                                 # Reconstruct item input to recalculate materials
                                 from types import SimpleNamespace
@@ -2246,9 +2482,12 @@ class PackCalculationService:
                                     for code, qty in wrap_consumables.items():
                                         recalc_materials[code] = recalc_materials.get(code, 0) + qty
                                 item_materials = recalc_materials
-                                print(f"🔍 Item {item.get('item_name')}: recalculated materials={item_materials}, len={len(item_materials)}")
+                                self.logger.debug(
+                                    "[PackCalc] Item %s: recalculated materials=%s, len=%s",
+                                    item.get('item_name'), item_materials, len(item_materials)
+                                )
                             except Exception as e:
-                                print(f"🔍 Error recalculating materials: {e}")
+                                self.logger.debug("[PackCalc] Error recalculating materials: %s", e)
                                 import traceback
                                 traceback.print_exc()
                         
@@ -2256,7 +2495,7 @@ class PackCalculationService:
                             for code, qty in item_materials.items():
                                 if isinstance(code, str) and isinstance(qty, (int, float)):
                                     room_materials[code] = room_materials.get(code, 0) + float(qty)
-                                    print(f"🔍 Added {code}: {qty} to room_materials")
+                                    self.logger.debug("[PackCalc] Added %s: %s to room_materials", code, qty)
 
                         # Calculate pack-out and pack-in labor for this item
                         item_floor = item.get("floor_level") or room.get("floor_level", "MAIN_LEVEL")
@@ -2402,7 +2641,12 @@ class PackCalculationService:
                     "explanation_pack_in": expl_in,
                 }
 
-                print(f"🔍 Room breakdown for {room['room_name']}: items={item_count}, materials_dict={room_materials}, materials_count={len(room_materials)}, pack_out={room_pack_out_hours:.1f}h, pack_in={room_pack_in_hours:.1f}h")
+                self.logger.debug(
+                    "[PackCalc] Room breakdown for %s: items=%s, materials_dict=%s, materials_count=%s, "
+                    "pack_out=%.1fh, pack_in=%.1fh",
+                    room['room_name'], item_count, room_materials, len(room_materials),
+                    room_pack_out_hours, room_pack_in_hours
+                )
 
                 rooms_breakdown_data.append(room_breakdown)
 
@@ -2495,6 +2739,8 @@ class PackCalculationService:
             "materials": correction.corrected_materials,
             "labor": correction.corrected_labor,
         }
+        if correction.item_corrections:
+            corrected["items"] = [item.model_dump() for item in correction.item_corrections]
 
         # Simple magnitude calculation (average % difference)
         magnitude = 0.0
@@ -2519,6 +2765,10 @@ class PackCalculationService:
         }
         self.calc_repo.update(calculation_id, correction_update)
 
+        # Per-item corrections apply to the next calculation, without retraining
+        for item in correction.item_corrections:
+            self.learning_matcher.learn_materials(item.item_name, item.corrected_materials)
+
         # Check if retraining needed
         new_corrections = self.calc_repo.count_new_corrections_since_last_training()
         should_retrain = new_corrections >= 50
@@ -2528,4 +2778,5 @@ class PackCalculationService:
             "magnitude": magnitude,
             "should_retrain": should_retrain,
             "corrections_count": new_corrections,
+            "learned_items": len(correction.item_corrections),
         }
@@ -0,0 +1,65 @@
+"""
+Per-request match tracing for pack calculations
+
+The calculation hot path logs at debug level only, with lazily formatted
+messages, so regular requests pay neither formatting nor I/O. When a caller
+asks for a trace (``?trace=true``), the service records the decision path of
+every item instead: contents detection, database mapping, seed hits and the
+matcher's semantic and similarity decisions with their scores. The trace is
+returned in the response.
+
+Traced requests bypass the match and result caches, so every decision is
+made, and recorded, again.
+"""
+
+from typing import Any, Dict, List, Optional
+
+# Item lookup phases
+MATERIALS_PHASE = "materials"
+LABOR_PHASE = "labor"
+
+
+class CalculationTrace:
+    """Match decision path for each item of one calculation"""
+
+    def __init__(self):
+        self.items: List[Dict[str, Any]] = []
+        self.phase = MATERIALS_PHASE
+        self._current: Optional[Dict[str, Any]] = None
+
+    def begin_item(self, room_name: str, item_name: str, quantity: int):
+        """Start recording steps for the next item"""
+        self._current = {
+            "room_name": room_name,
+            "item_name": item_name,
+            "quantity": quantity,
+            "steps": [],
+        }
+        self.items.append(self._current)
+        self.phase = MATERIALS_PHASE
+
+    def step(
+        self,
+        stage: str,
+        result: Optional[str] = None,
+        score: Optional[float] = None,
+        detail: Optional[str] = None,
+    ):
+        """
+        Record one decision for the current item
+
+        Args:
+            stage: Decision made (e.g. "db_mapping", "seed_exact", "similarity")
+            result: Mapping or seed key it produced, if any
+            score: Confidence or similarity score, if the stage has one
+            detail: Short free-form context
+        """
+        if self._current is None:
+            return
+        self._current["steps"].append({
+            "phase": self.phase,
+            "stage": stage,
+            "result": result,
+            "score": round(score, 4) if score is not None else None,
+            "detail": detail,
+        })
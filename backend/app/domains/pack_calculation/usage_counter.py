@@ -0,0 +1,126 @@
+"""
+Write-behind usage counters for item material mappings
+
+Every item matched to a database mapping used to bump its usage_count with a
+read and an update, two queries per item inside the calculation. Uses are
+now counted in memory and a background thread writes them for all mappings
+in one batched UPDATE every PACK_USAGE_FLUSH_SECONDS, or sooner when many
+mappings are pending. Pending counts are flushed on application shutdown.
+
+Counts are per process and only reach the database on flush, so a crash can
+lose at most one interval of usage statistics.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database_factory import get_database_session
+
+from .repository import ItemMaterialMappingRepository
+
+logger = logging.getLogger(__name__)
+
+# Flush early once this many mappings have pending counts
+MAX_PENDING_MAPPINGS = 5000
+
+
+class UsageCounterBuffer:
+    """In-memory usage counts per mapping, written to the database in batches"""
+
+    def __init__(self, flush_interval: float = 30.0, max_pending: int = MAX_PENDING_MAPPINGS):
+        """
+        Args:
+            flush_interval: Seconds between background flushes; 0 or less
+                writes every increment immediately
+            max_pending: Number of pending mappings that triggers an early flush
+        """
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[str, Tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.flushed_mappings = 0
+        self.flush_errors = 0
+
+    def increment(self, mapping_id: Any, used_at: Optional[datetime] = None):
+        """Count one use of a mapping"""
+        used_at = used_at or datetime.now()
+        key = str(mapping_id)
+        with self._lock:
+            uses, _ = self._pending.get(key, (0, used_at))
+            self._pending[key] = (uses + 1, used_at)
+            pending = len(self._pending)
+            if self._thread is None and self.flush_interval > 0 and not self._stopping:
+                self._thread = threading.Thread(
+                    target=self._run, name="pack-usage-counter", daemon=True
+                )
+                self._thread.start()
+
+        if self.flush_interval <= 0 or self._stopping:
+            self.flush()
+        elif pending >= self.max_pending:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write all pending counts; returns the number of mappings updated"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            try:
+                with get_database_session() as session:
+                    ItemMaterialMappingRepository(session).apply_usage_counts(pending)
+            except Exception as e:
+                self._restore(pending)
+                self.flush_errors += 1
+                logger.warning(f"Failed to flush usage counts for {len(pending)} mappings: {e}")
+                return 0
+
+            self.flushed_mappings += len(pending)
+            return len(pending)
+
+    def _restore(self, pending: Dict[str, Tuple[int, datetime]]):
+        """Put counts of a failed flush back so the next flush retries them"""
+        with self._lock:
+            for key, (uses, used_at) in pending.items():
+                newer_uses, newer_used_at = self._pending.get(key, (0, used_at))
+                self._pending[key] = (uses + newer_uses, max(used_at, newer_used_at))
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self._stopping:
+                self.flush()
+
+    def stop(self, timeout: float = 10.0) -> int:
+        """Stop the background thread and flush what is pending"""
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffer metrics for monitoring"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "pending_mappings": pending,
+            "flushed_mappings": self.flushed_mappings,
+            "flush_errors": self.flush_errors,
+            "flush_interval": self.flush_interval,
+        }
+
+
+# Process-wide buffer used by PackCalculationService
+mapping_usage_counter = UsageCounterBuffer(flush_interval=settings.PACK_USAGE_FLUSH_SECONDS)
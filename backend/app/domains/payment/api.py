@@ -2,6 +2,7 @@
 Payment API endpoints
 """
 
+import json
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Optional
 from uuid import UUID
@@ -19,9 +20,13 @@ from .schemas import (
 from .service import PaymentService
 from .models import PaymentStatus, PaymentMethod, BillingCycle
 from app.core.database_factory import get_database
+from app.core.cache import get_cache
 
 router = APIRouter()
 
+# Dashboard statistics are recomputed at most this often per company
+DASHBOARD_STATS_CACHE_TTL = 60
+
 
 def get_payment_service():
     """Dependency to get payment service"""
@@ -261,11 +266,20 @@ async def get_billing_cycles():
 @router.get("/dashboard/stats")
 async def get_payment_dashboard_stats(
     company_id: Optional[UUID] = Query(None, description="Filter by company ID"),
+    refresh: bool = Query(False, description="Bypass the short-lived stats cache"),
     service: PaymentService = Depends(get_payment_service)
 ):
     """Get payment dashboard statistics"""
     try:
+        cache = get_cache()
+        cache_key = f"payments:dashboard:{company_id or 'all'}"
+        if not refresh:
+            cached = await cache.get(cache_key)
+            if cached:
+                return json.loads(cached)
+
         stats = service.get_payment_dashboard_stats(company_id)
+        await cache.set(cache_key, json.dumps(stats), DASHBOARD_STATS_CACHE_TTL)
         return stats
         
     except Exception as e:
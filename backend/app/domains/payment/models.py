@@ -2,7 +2,7 @@
 Payment and billing database models
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Enum, Numeric
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Enum, Numeric, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -49,7 +49,12 @@ class BillingCycle(str, enum.Enum):
 class Payment(Base):
     """Payment model for tracking payments"""
     __tablename__ = "payments"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Dashboard aggregates: filter by company/status/date, read amounts from the index
+        Index('ix_payments_company_status_date', 'company_id', 'status', 'payment_date',
+              postgresql_include=['amount', 'payment_method']),
+        {'extend_existing': True}
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
@@ -0,0 +1,164 @@
+"""
+Payment domain repository implementations for different database providers.
+"""
+
+from typing import Any, Dict, Optional
+from datetime import datetime
+from decimal import Decimal
+import logging
+import uuid
+
+from app.common.base_repository import SQLAlchemyRepository, SupabaseRepository
+from app.core.interfaces import DatabaseSession
+from .models import Payment, PaymentStatus
+
+logger = logging.getLogger(__name__)
+
+# Number of payments listed under recent activity
+RECENT_ACTIVITY_LIMIT = 5
+
+# Methods reported individually in the dashboard breakdown; the rest fold into 'other'
+BREAKDOWN_METHODS = ('credit_card', 'cash', 'check', 'bank_transfer')
+
+REFUNDED_STATUSES = (PaymentStatus.REFUNDED, PaymentStatus.PARTIAL_REFUND)
+
+
+def _money(value: Any) -> str:
+    """Format an aggregate amount the way the dashboard reports money"""
+    return f"{Decimal(str(value or 0)):.2f}"
+
+
+def _enum_value(value: Any) -> Any:
+    """Plain value of an enum column"""
+    return value.value if hasattr(value, 'value') else value
+
+
+def empty_dashboard_stats() -> Dict[str, Any]:
+    """Dashboard statistics for a company without payments"""
+    return {
+        'total_payments': 0,
+        'total_amount': '0.00',
+        'pending_payments': 0,
+        'completed_payments': 0,
+        'failed_payments': 0,
+        'refunded_payments': 0,
+        'this_month_amount': '0.00',
+        'this_month_count': 0,
+        'average_payment_amount': '0.00',
+        'payment_method_breakdown': {method: 0 for method in BREAKDOWN_METHODS + ('other',)},
+        'recent_activity': [],
+        'last_updated': datetime.now().isoformat()
+    }
+
+
+class PaymentSQLAlchemyRepository(SQLAlchemyRepository):
+    """SQLAlchemy-based payment repository for PostgreSQL/SQLite"""
+
+    def __init__(self, session: DatabaseSession):
+        super().__init__(session, Payment)
+
+    def get_dashboard_stats(self, company_id: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Compute payment dashboard statistics in the database.
+
+        Status counts, totals and the this-month window come from one pass of
+        conditional aggregates; the method breakdown is a GROUP BY and recent
+        activity a LIMIT query, both served by the company/status/date index.
+
+        Args:
+            company_id: Optional company filter
+
+        Returns:
+            Dictionary with the dashboard statistics
+        """
+        from sqlalchemy import select, func, case, and_
+
+        now = datetime.utcnow()
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        company_filter = []
+        if company_id:
+            company_filter.append(Payment.company_id == uuid.UUID(str(company_id)))
+
+        def count_where(*conditions):
+            return func.count(case((and_(*conditions), 1)))
+
+        this_month = Payment.payment_date >= month_start
+        totals_query = select(
+            func.count(Payment.id),
+            func.coalesce(func.sum(Payment.amount), 0),
+            func.avg(Payment.amount),
+            count_where(Payment.status == PaymentStatus.PENDING),
+            count_where(Payment.status == PaymentStatus.COMPLETED),
+            count_where(Payment.status == PaymentStatus.FAILED),
+            count_where(Payment.status.in_(REFUNDED_STATUSES)),
+            count_where(this_month),
+            func.coalesce(func.sum(case((this_month, Payment.amount), else_=0)), 0)
+        ).where(*company_filter)
+        (total_payments, total_amount, average_amount, pending, completed, failed,
+         refunded, this_month_count, this_month_amount) = self.db_session.execute(totals_query).one()
+
+        breakdown = {method: 0 for method in BREAKDOWN_METHODS + ('other',)}
+        method_query = (
+            select(Payment.payment_method, func.count(Payment.id))
+            .where(*company_filter)
+            .group_by(Payment.payment_method)
+        )
+        for method, count in self.db_session.execute(method_query).all():
+            key = _enum_value(method)
+            breakdown[key if key in breakdown else 'other'] += count
+
+        recent_query = (
+            select(Payment.id, Payment.payment_number, Payment.amount, Payment.payment_method,
+                   Payment.status, Payment.payment_date, Payment.customer_name)
+            .where(*company_filter)
+            .order_by(Payment.payment_date.desc())
+            .limit(RECENT_ACTIVITY_LIMIT)
+        )
+        recent_activity = [
+            {
+                'id': str(row.id),
+                'payment_number': row.payment_number,
+                'amount': _money(row.amount),
+                'payment_method': _enum_value(row.payment_method),
+                'status': _enum_value(row.status),
+                'payment_date': row.payment_date.isoformat() if row.payment_date else None,
+                'customer_name': row.customer_name
+            }
+            for row in self.db_session.execute(recent_query).all()
+        ]
+
+        return {
+            'total_payments': total_payments,
+            'total_amount': _money(total_amount),
+            'pending_payments': pending,
+            'completed_payments': completed,
+            'failed_payments': failed,
+            'refunded_payments': refunded,
+            'this_month_amount': _money(this_month_amount),
+            'this_month_count': this_month_count,
+            'average_payment_amount': _money(average_amount),
+            'payment_method_breakdown': breakdown,
+            'recent_activity': recent_activity,
+            'last_updated': datetime.now().isoformat()
+        }
+
+
+class PaymentSupabaseRepository(SupabaseRepository):
+    """Supabase-based payment repository"""
+
+    def __init__(self, session: DatabaseSession):
+        super().__init__(session, "payments", Payment)
+
+    def get_dashboard_stats(self, company_id: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Aggregates are not available through the REST API; the dashboard
+        falls back to empty statistics for Supabase.
+        """
+        return empty_dashboard_stats()
+
+
+def get_payment_repository(session: DatabaseSession):
+    """Factory function to get appropriate payment repository based on database type"""
+    if hasattr(session, 'query') or hasattr(session, 'execute'):
+        return PaymentSQLAlchemyRepository(session)
+    return PaymentSupabaseRepository(session)
@@ -10,6 +10,7 @@ from decimal import Decimal
 
 from app.common.base_service import BaseService
 from .models import Payment, BillingSchedule, PaymentRefund, PaymentStatus
+from .repository import get_payment_repository
 from .schemas import PaymentCreate, BillingScheduleCreate, PaymentRefundCreate, PaymentFilter, BillingScheduleFilter
 
 logger = logging.getLogger(__name__)
@@ -22,13 +23,11 @@ class PaymentService(BaseService[Payment, UUID]):
     
     def get_repository(self):
         """Get the payment repository"""
-        # This would be implemented when we create the payment repository
-        pass
+        return get_payment_repository
     
     def _get_repository_instance(self, session):
         """Get repository instance with the given session"""
-        # This would be implemented when we create the payment repository
-        pass
+        return get_payment_repository(session)
     
     def generate_payment_number(self) -> str:
         """
@@ -323,33 +322,16 @@ class PaymentService(BaseService[Payment, UUID]):
         Returns:
             Dictionary with various statistics
         """
+        session = self.database.get_readonly_session()
         try:
-            # This would calculate real statistics from the database
-            # For now, return mock data
-            return {
-                'total_payments': 0,
-                'total_amount': '0.00',
-                'pending_payments': 0,
-                'completed_payments': 0,
-                'failed_payments': 0,
-                'refunded_payments': 0,
-                'this_month_amount': '0.00',
-                'this_month_count': 0,
-                'average_payment_amount': '0.00',
-                'payment_method_breakdown': {
-                    'credit_card': 0,
-                    'cash': 0,
-                    'check': 0,
-                    'bank_transfer': 0,
-                    'other': 0
-                },
-                'recent_activity': [],
-                'last_updated': datetime.now().isoformat()
-            }
+            repository = self._get_repository_instance(session)
+            return repository.get_dashboard_stats(company_id)
             
         except Exception as e:
             logger.error(f"Error getting payment dashboard stats: {e}")
             raise
+        finally:
+            session.close()
     
     def process_recurring_payments(self, limit: int = 100) -> Dict[str, Any]:
         """
@@ -11,6 +11,7 @@ from app.common.base_service import TransactionalService
 from app.domains.receipt.repository import get_receipt_repository, get_receipt_template_repository
 from app.core.interfaces import DatabaseProvider
 from app.core.database_factory import get_database
+from app.common.utils.document_totals import line_amount, round_money, to_decimal
 
 logger = logging.getLogger(__name__)
 
@@ -371,10 +372,15 @@ class ReceiptService(TransactionalService[Dict[str, Any], str]):
         }
 
         for item in items[:10]:  # Limit to first 10 items for summary
+            # Priced lines are rounded like the invoice calculator; fixed amounts are used as stored
+            if item.get('rate') is not None:
+                amount = line_amount(item)
+            else:
+                amount = round_money(to_decimal(item.get('amount')))
             summary['items'].append({
                 'name': item.get('name', item.get('description', '')),
                 'quantity': item.get('quantity', 0),
-                'amount': item.get('amount', 0)
+                'amount': float(amount)
             })
 
         if len(items) > 10:
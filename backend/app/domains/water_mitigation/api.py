@@ -311,6 +311,7 @@ def list_photos(
     page_size: int = 50,
     sort_by: str = 'captured_date',
     sort_order: str = 'desc',
+    count: str = Query("exact", pattern="^(exact|estimated|none)$"),
     service: WaterMitigationService = Depends(get_wm_service)
 ):
     """List photos for job with pagination and optional category filtering
@@ -323,18 +324,20 @@ def list_photos(
         page_size: Number of items per page (default: 50, max: 200)
         sort_by: Field to sort by (default: captured_date)
         sort_order: Sort order 'asc' or 'desc' (default: desc)
+        count: Total count mode: exact, estimated, or none (use has_more)
     """
     # Limit page_size to prevent excessive queries
     page_size = min(page_size, 200)
     page = max(page, 1)
 
     # Get paginated photos
-    photos, total = service.photo_repo.find_by_job_paginated(
+    photos, page_info = service.photo_repo.find_by_job_paginated(
         job_id=job_id,
         page=page,
         page_size=page_size,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        count_mode=count
     )
 
     # Apply filters (note: filtering after pagination may reduce actual items returned)
@@ -348,15 +351,15 @@ def list_photos(
             # Filter by multiple categories (OR logic)
             photos = [p for p in photos if getattr(p, 'category', None) in categories]
 
-    # Calculate total pages
-    total_pages = math.ceil(total / page_size) if total > 0 else 1
-
+    total = page_info["total"]
     return {
         "items": [service.photo_repo._convert_to_dict(photo) for photo in photos],
         "total": total,
         "page": page,
         "page_size": page_size,
-        "total_pages": total_pages
+        "total_pages": max(page_info["total_pages"], 1) if total is not None else None,
+        "has_more": page_info["has_more"],
+        "total_estimated": page_info["total_estimated"]
     }
 
 
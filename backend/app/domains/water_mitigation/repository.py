@@ -2,13 +2,13 @@
 Water Mitigation repository
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from sqlalchemy import and_, desc, func, or_
 from sqlalchemy.orm import joinedload
 
-from app.common.base_repository import SQLAlchemyRepository
+from app.common.base_repository import COUNT_EXACT, SQLAlchemyRepository
 from app.core.interfaces import DatabaseSession
 
 from .models import (
@@ -245,12 +245,13 @@ class WMPhotoRepository(SQLAlchemyRepository[WMPhoto, UUID]):
         page: int = 1,
         page_size: int = 50,
         sort_by: str = 'captured_date',
-        sort_order: str = 'desc'
-    ) -> tuple[List[WMPhoto], int]:
+        sort_order: str = 'desc',
+        count_mode: str = COUNT_EXACT
+    ) -> tuple[List[WMPhoto], Dict[str, Any]]:
         """Find photos for a job with pagination
 
         Returns:
-            Tuple of (photos, total_count)
+            Tuple of (photos, page info) as returned by paginate_query
         """
         # Base query (exclude trashed photos by default)
         query = self.db_session.query(WMPhoto).filter(
@@ -258,19 +259,13 @@ class WMPhotoRepository(SQLAlchemyRepository[WMPhoto, UUID]):
             WMPhoto.is_trashed.is_(False)
         )
 
-        # Get total count
-        total = query.count()
-
         # Apply sorting
         if sort_order.lower() == 'asc':
             order_clause = getattr(WMPhoto, sort_by).asc()
         else:
             order_clause = getattr(WMPhoto, sort_by).desc()
 
-        # Apply pagination
-        photos = query.order_by(order_clause).limit(page_size).offset((page - 1) * page_size).all()
-
-        return photos, total
+        return self.paginate(query.order_by(order_clause), page, page_size, count_mode)
 
     def count_by_job(self, job_id: UUID) -> int:
         """Count photos for a job (exclude trashed)"""
@@ -257,10 +257,12 @@ class PhotoResponse(BaseModel):
 class PhotoListResponse(BaseModel):
     """Paginated photo list response"""
     items: List[PhotoResponse]
-    total: int
+    total: Optional[int] = None  # None when count mode is 'none'
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    has_more: bool = False
+    total_estimated: bool = False
 
     class Config:
         from_attributes = True
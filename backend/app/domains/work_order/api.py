@@ -142,16 +142,17 @@ async def get_work_orders(
                 offset=offset
             )
             
-            # Get total count without pagination
-            all_work_orders = service.get_all(filters=filters)
-            total = len(all_work_orders)
+            # Get total count without pagination (COUNT(*) instead of loading every row)
+            total = service.count(filters=filters)
         
         # Populate staff names
         work_orders = populate_staff_names(work_orders, staff_service)
         
         # Ensure cost fields are calculated for each work order
+        document_types = service.load_document_types() if work_orders else []
+        trades = service.load_trades(service.referenced_trade_ids(work_orders)) if work_orders else None
         for wo in work_orders:
-            service.ensure_cost_fields(wo)
+            service.ensure_cost_fields(wo, document_types, trades)
             
             # Ensure cost fields are numeric for serialization
             cost_fields = ['base_fee', 'final_cost', 'tax_amount', 'discount_amount', 'credits_applied']
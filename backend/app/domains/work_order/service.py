@@ -329,7 +329,9 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
             raise
     
     def calculate_cost(self, document_type: str, trade_ids: List[str], company_id: str, 
-                      additional_costs: List[Dict[str, Any]] = None, apply_tax: bool = False, tax_rate: Optional[float] = None) -> Dict[str, Any]:
+                      additional_costs: List[Dict[str, Any]] = None, apply_tax: bool = False, tax_rate: Optional[float] = None,
+                      document_types: Optional[List[Any]] = None,
+                      trades: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Calculate work order cost based on document type, trades, and additional costs
         
@@ -338,13 +340,17 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
             trade_ids: List of trade IDs
             company_id: Company ID
             additional_costs: List of additional cost items
+            document_types: Preloaded document types (see load_document_types); queried if omitted
+            trades: Preloaded trades by ID (see load_trades); the referenced
+                trades are queried in one query if omitted
             
         Returns:
             Cost breakdown dictionary
         """
         logger.info(f"calculate_cost called with trade_ids: {trade_ids}, company_id: {company_id}")
         try:
-            session = self.database.get_session()
+            # Only opened when something was not preloaded
+            session = None
             try:
                 base_fee = 0.0
                 trade_costs = []
@@ -353,9 +359,13 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
                 if document_type:
                     from app.domains.document_types import service as dt_service
                     
-                    # Get all document types and find the matching one
-                    document_types = dt_service.get_document_types(session, active_only=True)
-                    for doc_type in document_types:
+                    # Get all active document types and find the matching one
+                    if document_types is None:
+                        session = session or self.database.get_session()
+                        active_types = dt_service.get_document_types(session, active_only=True)
+                    else:
+                        active_types = [dt for dt in document_types if getattr(dt, 'is_active', True)]
+                    for doc_type in active_types:
                         # Match by code (e.g., 'work_order', 'estimate', etc.)
                         if hasattr(doc_type, 'code') and doc_type.code == document_type:
                             if hasattr(doc_type, 'base_fee') and doc_type.base_fee is not None:
@@ -380,23 +390,13 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
                 
                 # Get trades (for information only, not for cost calculation)
                 if trade_ids:
-                    if 'dt_service' not in locals():
-                        from app.domains.document_types import service as dt_service
-                    from uuid import UUID as uuid_UUID
+                    trade_uuids = self._parse_trade_ids(trade_ids)
+                    if trades is None:
+                        session = session or self.database.get_session()
+                        trades = self._query_trades(session, trade_uuids)
                     
-                    for trade_id in trade_ids:
-                        logger.info(f"Fetching trade with ID: {trade_id}")
-                        # Convert string to UUID object if needed
-                        if isinstance(trade_id, str):
-                            try:
-                                trade_uuid = uuid_UUID(trade_id)
-                            except ValueError:
-                                logger.error(f"Invalid UUID format: {trade_id}")
-                                continue
-                        else:
-                            trade_uuid = trade_id
-                        
-                        trade = dt_service.get_trade(session, trade_uuid)
+                    for trade_uuid in trade_uuids:
+                        trade = trades.get(str(trade_uuid))
                         logger.info(f"Trade data: {trade}")
                         if trade:
                             trade_name = trade.name if hasattr(trade, 'name') else 'Unknown'
@@ -462,7 +462,8 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
                 }
                 
             finally:
-                session.close()
+                if session is not None:
+                    session.close()
                 
         except Exception as e:
             logger.error(f"Error calculating cost: {e}")
@@ -541,11 +542,15 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
             # Get work orders from parent class
             work_orders = super().get_all(filters=filters, order_by=order_by, limit=limit, offset=offset)
             
+            # Load document types and trades once for the whole list instead of once per row
+            document_types = self.load_document_types() if work_orders else []
+            trades = self.load_trades(self.referenced_trade_ids(work_orders)) if work_orders else None
+            
             # Enrich each work order with document type name
             for work_order in work_orders:
-                self.enrich_document_type_name(work_order)
+                self.enrich_document_type_name(work_order, document_types)
                 # Also ensure cost fields
-                self.ensure_cost_fields(work_order)
+                self.ensure_cost_fields(work_order, document_types, trades)
             
             return work_orders
             
@@ -575,12 +580,83 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
             logger.error(f"Error getting work order by ID {entity_id}: {e}")
             return None
     
-    def enrich_document_type_name(self, work_order: Dict[str, Any]) -> Dict[str, Any]:
+    def load_document_types(self) -> List[Any]:
+        """
+        Load all document types (including inactive) in a single query
+        
+        Returns:
+            List of document type models, or an empty list if the lookup fails
+        """
+        try:
+            session = self.database.get_session()
+            try:
+                from app.domains.document_types import service as dt_service
+                
+                document_types = dt_service.get_document_types(session, active_only=False)
+                logger.info(f"Loaded {len(document_types)} document types")
+                return document_types
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Error loading document types: {e}")
+            return []
+    
+    def load_trades(self, trade_ids: List[Any]) -> Optional[Dict[str, Any]]:
+        """
+        Load the given trades in a single query
+        
+        Args:
+            trade_ids: Trade IDs (strings or UUIDs; duplicates and invalid IDs are skipped)
+            
+        Returns:
+            Trade models keyed by ID string, or None if the lookup fails
+        """
+        try:
+            session = self.database.get_session()
+            try:
+                trades = self._query_trades(session, self._parse_trade_ids(trade_ids))
+                logger.info(f"Loaded {len(trades)} trades")
+                return trades
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Error loading trades: {e}")
+            return None
+    
+    @staticmethod
+    def referenced_trade_ids(work_orders: List[Dict[str, Any]]) -> List[Any]:
+        """Every trade ID referenced by the given work orders"""
+        return [trade_id for work_order in work_orders for trade_id in work_order.get('trades') or []]
+    
+    @staticmethod
+    def _parse_trade_ids(trade_ids: List[Any]) -> List[UUID]:
+        """Trade IDs as UUIDs in their original order"""
+        trade_uuids = []
+        for trade_id in trade_ids:
+            # Convert string to UUID object if needed
+            if isinstance(trade_id, str):
+                try:
+                    trade_id = UUID(trade_id)
+                except ValueError:
+                    logger.error(f"Invalid UUID format: {trade_id}")
+                    continue
+            trade_uuids.append(trade_id)
+        return trade_uuids
+    
+    @staticmethod
+    def _query_trades(session, trade_uuids: List[UUID]) -> Dict[str, Any]:
+        from app.domains.document_types import service as dt_service
+        
+        return {str(trade.id): trade for trade in dt_service.get_trades_by_ids(session, trade_uuids)}
+    
+    def enrich_document_type_name(self, work_order: Dict[str, Any],
+                                  document_types: Optional[List[Any]] = None) -> Dict[str, Any]:
         """
         Enrich work order with document type name from document types table
         
         Args:
             work_order: Work order dictionary
+            document_types: Preloaded document types (see load_document_types); queried if omitted
             
         Returns:
             Work order with document_type_name field added
@@ -588,34 +664,24 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
         try:
             if work_order and work_order.get('document_type'):
                 doc_type_code = work_order['document_type']
-                logger.info(f"Looking up document type with code: {doc_type_code}")
+                logger.debug(f"Looking up document type with code: {doc_type_code}")
+                
+                if document_types is None:
+                    document_types = self.load_document_types()
+                
+                found = False
+                for doc_type in document_types:
+                    if hasattr(doc_type, 'code'):
+                        # Case-insensitive comparison for better matching
+                        if doc_type.code.upper() == doc_type_code.upper():
+                            work_order['document_type_name'] = doc_type.name
+                            found = True
+                            break
                 
-                session = self.database.get_session()
-                try:
-                    from app.domains.document_types import service as dt_service
-                    
-                    # Get all document types (including inactive) and find the matching one by code
-                    document_types = dt_service.get_document_types(session, active_only=False)
-                    logger.info(f"Found {len(document_types)} document types in database")
-                    
-                    found = False
-                    for doc_type in document_types:
-                        if hasattr(doc_type, 'code'):
-                            logger.debug(f"Comparing '{doc_type.code}' with '{doc_type_code}'")
-                            # Case-insensitive comparison for better matching
-                            if doc_type.code.upper() == doc_type_code.upper():
-                                work_order['document_type_name'] = doc_type.name
-                                logger.info(f"Found document type name: {doc_type.name} for code: {doc_type_code}")
-                                found = True
-                                break
-                    
-                    # If no match found, use the code as the name
-                    if not found:
-                        logger.warning(f"No document type found for code: {doc_type_code}")
-                        work_order['document_type_name'] = work_order['document_type']
-                        
-                finally:
-                    session.close()
+                # If no match found, use the code as the name
+                if not found:
+                    logger.warning(f"No document type found for code: {doc_type_code}")
+                    work_order['document_type_name'] = work_order['document_type']
                     
         except Exception as e:
             logger.error(f"Error enriching document type name: {e}")
@@ -625,12 +691,16 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
                 
         return work_order
     
-    def ensure_cost_fields(self, work_order: Dict[str, Any]) -> Dict[str, Any]:
+    def ensure_cost_fields(self, work_order: Dict[str, Any],
+                           document_types: Optional[List[Any]] = None,
+                           trades: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Ensure work order has cost fields calculated
         
         Args:
             work_order: Work order dictionary
+            document_types: Preloaded document types passed through to calculate_cost
+            trades: Preloaded trades passed through to calculate_cost
             
         Returns:
             Work order with cost fields
@@ -683,7 +753,9 @@ class WorkOrderService(BaseService[WorkOrder, UUID]):
                 work_order.get('company_id'),
                 work_order.get('additional_costs', []),
                 apply_tax=apply_tax,
-                tax_rate=tax_rate
+                tax_rate=tax_rate,
+                document_types=document_types,
+                trades=trades
             )
             logger.info(f"Calculated cost breakdown: {cost_breakdown}")
             
@@ -2,11 +2,12 @@
 Xactimate domain API endpoints
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.orm import Session
 
 from app.core.database_factory import get_db
+from app.common.utils.bulk_import import ImportFormatError, detect_format
 from .service import XactimateCategoryService, XactimateItemService, XactimateComponentService, XactimateUnifiedService
 from .schemas import (
     XactimateCategoryResponse, XactimateCategoryCreate, XactimateCategoryUpdate,
@@ -105,6 +106,8 @@ async def search_items(
     include_components: bool = Query(False),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$",
+                       description="Total count mode: exact, estimated, or none (use has_more)"),
     db: Session = Depends(get_db)
 ):
     """Search Xactimate items with advanced filters"""
@@ -121,7 +124,8 @@ async def search_items(
         has_components=has_components,
         include_components=include_components,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        count_mode=count
     )
     
     return service.search(search_request)
@@ -180,6 +184,21 @@ async def create_item(item_data: XactimateItemCreate, db: Session = Depends(get_
     return service.create_with_components(item_data)
 
 
+@router.post("/items/import", response_model=Dict[str, Any])
+async def import_price_list(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$", description="Defaults to the file extension"),
+    db: Session = Depends(get_db)
+):
+    """Import a monthly price list from a CSV or JSONL file"""
+    try:
+        fmt = detect_format(file.filename, file.content_type, format)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    service = XactimateItemService(db)
+    return service.import_price_list(file.file, fmt)
+
+
 @router.put("/items/{item_id}", response_model=XactimateItemResponse)
 async def update_item(
     item_id: int, 
@@ -278,6 +297,7 @@ async def unified_search(
     company_id: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
+    include_counts: bool = Query(True, description="Return total counts (skip for faster paging)"),
     db: Session = Depends(get_db)
 ):
     """Unified search across both Xactimate and Custom line items"""
@@ -289,7 +309,8 @@ async def unified_search(
         item_type=item_type,
         company_id=company_id,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        include_counts=include_counts
     )
     
     return service.unified_search(search_request)
\ No newline at end of file
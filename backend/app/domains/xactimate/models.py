@@ -4,7 +4,7 @@ Xactimate domain models
 
 from sqlalchemy import (
     Column, String, Integer, DateTime, Text, 
-    ForeignKey, DECIMAL, Boolean, Index
+    ForeignKey, DECIMAL, Boolean, Index, text
 )
 from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
@@ -52,7 +52,12 @@ class XactimateItem(Base):
         Index('idx_xactimate_items_category', 'category_code'),
         Index('idx_xactimate_items_code', 'item_code'),
         Index('idx_xactimate_items_date', 'price_year', 'price_month'),
+        # Latest price per item code (DISTINCT ON / ROW_NUMBER)
+        Index('idx_xactimate_items_code_period', 'item_code', text('price_year DESC'), text('price_month DESC')),
         Index('idx_xactimate_items_search', 'description'),
+        # Per-branch ORDER BY category, item ... LIMIT in unified search
+        Index('idx_xactimate_items_cat_item', 'category_code', 'item_code'),
+        # PostgreSQL also has a pg_trgm GIN index on description (migration only)
         {'extend_existing': True}
     )
     
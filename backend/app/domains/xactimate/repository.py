@@ -6,10 +6,10 @@ import asyncio
 import logging
 from typing import List, Optional, Tuple, Dict, Any
 from sqlalchemy.orm import Session, selectinload, joinedload
-from sqlalchemy import and_, or_, func, desc, asc, text
+from sqlalchemy import or_, func, desc, asc
 from decimal import Decimal
 
-from app.common.base_repository import BaseRepository, SQLAlchemyRepository, SupabaseRepository
+from app.common.base_repository import BaseRepository, SQLAlchemyRepository, SupabaseRepository, paginate_query
 from app.core.interfaces import DatabaseSession, DatabaseException
 from .models import XactimateCategory, XactimateItem, XactimateComponent
 from .schemas import XactimateSearchRequest
@@ -17,6 +17,11 @@ from .schemas import XactimateSearchRequest
 logger = logging.getLogger(__name__)
 
 
+def _dialect_name(session) -> str:
+    """Name of the SQL dialect behind a (wrapped) SQLAlchemy session"""
+    return session.get_bind().dialect.name
+
+
 class XactimateCategoryRepositoryMixin:
     """Mixin with Xactimate category-specific methods"""
     
@@ -158,7 +163,7 @@ class XactimateItemRepositoryMixin:
         """Get items by category with pagination"""
         raise NotImplementedError("Subclasses must implement get_by_category")
     
-    def search(self, search_request: XactimateSearchRequest) -> Tuple[List[XactimateItem], int]:
+    def search(self, search_request: XactimateSearchRequest) -> Tuple[List[XactimateItem], Dict[str, Any]]:
         """Advanced search with multiple filters"""
         raise NotImplementedError("Subclasses must implement search")
     
@@ -207,8 +212,13 @@ class XactimateItemSQLAlchemyRepository(SQLAlchemyRepository, XactimateItemRepos
         entities = query.all()
         return [self._convert_to_dict(entity) for entity in entities]
     
-    def search(self, search_request: XactimateSearchRequest) -> Tuple[List[Dict[str, Any]], int]:
-        """Advanced search with multiple filters"""
+    def search(self, search_request: XactimateSearchRequest) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Advanced search with multiple filters
+
+        Returns:
+            (items, page info) as returned by paginate_query
+        """
         query = self.db_session.query(XactimateItem)
 
         # Apply filters
@@ -248,16 +258,10 @@ class XactimateItemSQLAlchemyRepository(SQLAlchemyRepository, XactimateItemRepos
                     XactimateComponent.id.is_(None)
                 )
 
-        # Get total count
-        total_count = query.count()
-
-        # Apply pagination and ordering
         query = query.order_by(
             XactimateItem.category_code,
             XactimateItem.item_code
-        ).offset(
-            (search_request.page - 1) * search_request.page_size
-        ).limit(search_request.page_size)
+        )
 
         # Always include category relationship for proper grouping
         query = query.options(selectinload(XactimateItem.category))
@@ -266,33 +270,49 @@ class XactimateItemSQLAlchemyRepository(SQLAlchemyRepository, XactimateItemRepos
         if search_request.include_components:
             query = query.options(selectinload(XactimateItem.components))
 
-        entities = query.all()
+        entities, page_info = paginate_query(
+            query, search_request.page, search_request.page_size, search_request.count_mode
+        )
         items = [self._convert_to_dict(entity) for entity in entities]
 
-        return items, total_count
+        return items, page_info
     
     def get_latest_by_item_codes(self, item_codes: List[str]) -> List[Dict[str, Any]]:
-        """Get latest version of items by item codes"""
-        # Subquery to get the latest date for each item_code
-        latest_subquery = self.db_session.query(
-            XactimateItem.item_code,
-            func.max(XactimateItem.price_year).label('max_year'),
-            func.max(XactimateItem.price_month).label('max_month')
-        ).filter(
-            XactimateItem.item_code.in_(item_codes)
-        ).group_by(XactimateItem.item_code).subquery()
+        """
+        Get the newest price row (by year, then month) for each item code
         
-        # Join with original table to get full records
-        query = self.db_session.query(XactimateItem).join(
-            latest_subquery,
-            and_(
-                XactimateItem.item_code == latest_subquery.c.item_code,
-                XactimateItem.price_year == latest_subquery.c.max_year,
-                XactimateItem.price_month == latest_subquery.c.max_month
-            )
-        ).options(selectinload(XactimateItem.components))
+        One query served by the (item_code, price_year DESC, price_month DESC)
+        index: DISTINCT ON on PostgreSQL, ROW_NUMBER() elsewhere.
+        """
+        item_codes = list(dict.fromkeys(code for code in item_codes if code))
+        if not item_codes:
+            return []
         
-        entities = query.all()
+        newest_first = (
+            desc(XactimateItem.price_year),
+            desc(XactimateItem.price_month),
+            desc(XactimateItem.id)
+        )
+        
+        if _dialect_name(self.db_session) == 'postgresql':
+            query = self.db_session.query(XactimateItem).filter(
+                XactimateItem.item_code.in_(item_codes)
+            ).distinct(XactimateItem.item_code).order_by(XactimateItem.item_code, *newest_first)
+        else:
+            ranked = self.db_session.query(
+                XactimateItem.id.label('id'),
+                func.row_number().over(
+                    partition_by=XactimateItem.item_code,
+                    order_by=newest_first
+                ).label('row_number')
+            ).filter(
+                XactimateItem.item_code.in_(item_codes)
+            ).subquery()
+            query = self.db_session.query(XactimateItem).join(
+                ranked, XactimateItem.id == ranked.c.id
+            ).filter(ranked.c.row_number == 1).order_by(XactimateItem.item_code)
+        
+        entities = query.options(selectinload(XactimateItem.components)).all()
         return [self._convert_to_dict(entity) for entity in entities]
     
     def get_price_history(self, item_code: str) -> List[Dict[str, Any]]:
@@ -376,122 +396,148 @@ class XactimateUnifiedRepository:
     def __init__(self, db: Session):
         self.db = db
     
+    def _xactimate_branch(self, search_filter, category: Optional[str]):
+        """SELECT over xactimate_items shaped like a unified row"""
+        from sqlalchemy import select, literal, cast, null, String, Integer, Boolean
+        
+        statement = select(
+            (literal('xactimate_') + cast(XactimateItem.id, String)).label('id'),
+            literal('XACTIMATE').label('type'),
+            XactimateItem.category_code.label('cat'),
+            XactimateItem.item_code.label('item'),
+            XactimateItem.description.label('description'),
+            XactimateItem.includes_description.label('includes'),
+            literal('EA').label('unit'),
+            XactimateItem.untaxed_unit_price.label('untaxed_unit_price'),
+            XactimateItem.labor_cost.label('lab'),
+            XactimateItem.material_cost.label('mat'),
+            XactimateItem.equipment_cost.label('equ'),
+            XactimateItem.labor_burden.label('labor_burden'),
+            XactimateItem.market_conditions.label('market_condition'),
+            literal(True, Boolean).label('is_active'),
+            literal(1, Integer).label('version'),
+            cast(null(), String).label('company_id'),
+            XactimateItem.created_at.label('created_at'),
+            XactimateItem.updated_at.label('updated_at')
+        )
+        conditions = []
+        if search_filter is not None:
+            conditions.append(search_filter(XactimateItem.description))
+        if category:
+            conditions.append(XactimateItem.category_code == category)
+        return statement.where(*conditions), conditions
+    
+    def _custom_branch(self, search_filter, category: Optional[str], company_id: Optional[str]):
+        """SELECT over custom line_items shaped like a unified row"""
+        from sqlalchemy import select, literal, cast, String
+        from app.domains.line_items.models import LineItem, LineItemType
+        
+        statement = select(
+            cast(LineItem.id, String).label('id'),
+            literal('CUSTOM').label('type'),
+            LineItem.cat.label('cat'),
+            LineItem.item.label('item'),
+            LineItem.description.label('description'),
+            LineItem.includes.label('includes'),
+            LineItem.unit.label('unit'),
+            LineItem.untaxed_unit_price.label('untaxed_unit_price'),
+            LineItem.lab.label('lab'),
+            LineItem.mat.label('mat'),
+            LineItem.equ.label('equ'),
+            LineItem.labor_burden.label('labor_burden'),
+            LineItem.market_condition.label('market_condition'),
+            LineItem.is_active.label('is_active'),
+            LineItem.version.label('version'),
+            cast(LineItem.company_id, String).label('company_id'),
+            LineItem.created_at.label('created_at'),
+            LineItem.updated_at.label('updated_at')
+        )
+        conditions = [LineItem.type == LineItemType.CUSTOM, LineItem.is_active == True]
+        if search_filter is not None:
+            conditions.append(search_filter(LineItem.description))
+        if category:
+            conditions.append(LineItem.cat == category)
+        if company_id:
+            conditions.append(or_(LineItem.company_id == company_id, LineItem.company_id.is_(None)))
+        return statement.where(*conditions), conditions
+    
     def unified_search(self, search_term: Optional[str] = None, 
                       category: Optional[str] = None,
                       item_type: Optional[str] = None,
                       company_id: Optional[str] = None,
-                      page: int = 1, page_size: int = 50) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
-        """Unified search across both Xactimate and Custom line items"""
+                      page: int = 1, page_size: int = 50,
+                      include_counts: bool = True) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Unified search across both Xactimate and Custom line items
         
-        # Build conditions for unified search
-        conditions = []
-        if search_term:
-            search_term_like = f"%{search_term}%"
-            conditions.append(f"description ILIKE '{search_term_like}'")
+        Each branch is a bound-parameter SELECT that is ordered and limited
+        to offset + page_size rows before the UNION ALL, so the database never
+        sorts more than the requested window from either catalog. With a
+        search term, rows are ordered by trigram word similarity on
+        PostgreSQL (served by the pg_trgm GIN indexes on description);
+        otherwise by type, category and item code.
         
-        if category:
-            conditions.append(f"cat = '{category}'")
+        Args:
+            include_counts: Run the per-type COUNT query. When False, counts
+                are None and 'has_more' tells whether another page exists.
         
-        # Build WHERE clause
-        where_clause = ""
-        if conditions:
-            where_clause = "WHERE " + " AND ".join(conditions)
+        Returns:
+            (items, counts) where counts has total_count, xactimate_count,
+            custom_count and has_more
+        """
+        from sqlalchemy import select, literal, literal_column, union_all, func as sa_func
         
-        # Determine which types to include
         include_xactimate = item_type in [None, "ALL", "XACTIMATE"]
         include_custom = item_type in [None, "ALL", "CUSTOM"]
+        if not include_xactimate and not include_custom:
+            return [], {'total_count': 0, 'xactimate_count': 0, 'custom_count': 0, 'has_more': False}
         
-        union_parts = []
+        search_term = search_term.strip() if search_term else None
+        search_filter = None
+        rank = None
+        if search_term:
+            pattern = f"%{search_term}%"
+            search_filter = lambda column: column.ilike(pattern)
+            if _dialect_name(self.db) == 'postgresql':
+                rank = lambda column: sa_func.word_similarity(search_term, column)
         
-        # Xactimate part
-        if include_xactimate:
-            xactimate_sql = f"""
-                SELECT
-                    'xactimate_' || id::text as id,
-                    'XACTIMATE' as type,
-                    category_code as cat,
-                    item_code as item,
-                    description,
-                    includes_description as includes,
-                    'EA' as unit,
-                    untaxed_unit_price,
-                    labor_cost as lab,
-                    material_cost as mat,
-                    equipment_cost as equ,
-                    labor_burden,
-                    market_conditions as market_condition,
-                    true as is_active,
-                    1 as version,
-                    NULL::UUID as company_id,
-                    created_at,
-                    updated_at
-                FROM xactimate_items
-                {where_clause}
-            """
-            union_parts.append(xactimate_sql)
+        offset = (page - 1) * page_size
+        # One extra row tells whether another page exists without counting
+        window = offset + page_size + 1
         
-        # Custom part
+        selects = {}
+        if include_xactimate:
+            selects['xactimate_count'] = self._xactimate_branch(search_filter, category)
         if include_custom:
-            custom_conditions = conditions.copy()
-            if company_id:
-                custom_conditions.append(f"(company_id = '{company_id}' OR company_id IS NULL)")
-            custom_conditions.append("type = 'CUSTOM' AND is_active = true")
-            
-            custom_where = "WHERE " + " AND ".join(custom_conditions) if custom_conditions else ""
-            
-            custom_sql = f"""
-                SELECT
-                    id::text,
-                    type::text,
-                    cat,
-                    item,
-                    description,
-                    includes,
-                    unit,
-                    untaxed_unit_price,
-                    lab,
-                    mat,
-                    equ,
-                    labor_burden,
-                    market_condition,
-                    is_active,
-                    version,
-                    company_id::text,
-                    created_at,
-                    updated_at
-                FROM line_items
-                {custom_where}
-            """
-            union_parts.append(custom_sql)
-        
-        if not union_parts:
-            return [], {'total_count': 0, 'xactimate_count': 0, 'custom_count': 0}
+            selects['custom_count'] = self._custom_branch(search_filter, category, company_id)
         
-        # Combine with UNION ALL
-        full_query = " UNION ALL ".join(union_parts)
-        
-        # Add ordering and pagination
-        offset = (page - 1) * page_size
-        paginated_query = f"""
-            WITH unified_results AS ({full_query})
-            SELECT * FROM unified_results
-            ORDER BY type, cat, item
-            LIMIT {page_size} OFFSET {offset}
-        """
+        branches = []
+        count_queries = {}
+        for name, (statement, conditions) in selects.items():
+            columns = statement.selected_columns
+            ordering = [columns.cat, columns.item]
+            if rank:
+                rank_column = rank(columns.description)
+                ordering.insert(0, rank_column.desc())
+            else:
+                rank_column = literal_column('0')
+            limited = statement.add_columns(rank_column.label('rank')) \
+                .order_by(*ordering) \
+                .limit(window)
+            # Wrapped so the per-branch ORDER BY/LIMIT is valid inside UNION ALL on every dialect
+            branches.append(select(limited.subquery(name.replace('_count', '_page'))))
+            count_queries[name] = select(sa_func.count()) \
+                .select_from(statement.get_final_froms()[0]) \
+                .where(*conditions).scalar_subquery()
         
-        # Count query
-        count_query = f"""
-            WITH unified_results AS ({full_query})
-            SELECT 
-                COUNT(*) as total_count,
-                SUM(CASE WHEN type = 'XACTIMATE' THEN 1 ELSE 0 END) as xactimate_count,
-                SUM(CASE WHEN type = 'CUSTOM' THEN 1 ELSE 0 END) as custom_count
-            FROM unified_results
-        """
+        unified = union_all(*branches).subquery('unified_results')
+        paginated_query = select(unified).order_by(
+            unified.c.rank.desc(), unified.c.type, unified.c.cat, unified.c.item
+        ).limit(page_size + 1).offset(offset)
         
-        # Execute queries
-        results = self.db.execute(text(paginated_query)).fetchall()
-        count_result = self.db.execute(text(count_query)).fetchone()
+        results = self.db.execute(paginated_query).fetchall()
+        has_more = len(results) > page_size
+        results = results[:page_size]
         
         # Convert results to dictionaries
         items = []
@@ -517,11 +563,16 @@ class XactimateUnifiedRepository:
                 'updated_at': row.updated_at
             })
         
-        counts = {
-            'total_count': count_result.total_count or 0,
-            'xactimate_count': count_result.xactimate_count or 0,
-            'custom_count': count_result.custom_count or 0
-        }
+        counts = {'total_count': None, 'xactimate_count': None, 'custom_count': None, 'has_more': has_more}
+        if include_counts:
+            # Both counts in one round trip, straight from the base tables
+            count_row = self.db.execute(select(*[
+                count_queries.get(name, literal(0)).label(name)
+                for name in ('xactimate_count', 'custom_count')
+            ])).one()
+            counts['xactimate_count'] = count_row.xactimate_count or 0
+            counts['custom_count'] = count_row.custom_count or 0
+            counts['total_count'] = counts['xactimate_count'] + counts['custom_count']
         
         return items, counts
 
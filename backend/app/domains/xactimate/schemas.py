@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any
 from decimal import Decimal
 from datetime import datetime
+import json
 
 
 class XactimateComponentBase(BaseModel):
@@ -100,6 +101,19 @@ class XactimateItemCreate(XactimateItemBase):
     components: Optional[List[XactimateComponentCreate]] = []
 
 
+class XactimateItemImportRow(XactimateItemBase):
+    """One row of a price list import, matched on (item_code, price_year, price_month)"""
+    untaxed_unit_price: Optional[Decimal] = Field(None, ge=0)  # Defaults to the sum of the costs
+    components: Optional[List[XactimateComponentCreate]] = None  # None keeps existing components
+
+    @validator('components', pre=True)
+    def parse_components(cls, v):
+        """CSV files carry components as a JSON array in one column"""
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
+
 class XactimateItemUpdate(BaseModel):
     """Schema for updating Xactimate items"""
     item_code: Optional[str] = Field(None, max_length=50)
@@ -149,15 +163,18 @@ class XactimateSearchRequest(BaseModel):
     include_components: bool = False
     page: int = Field(1, ge=1)
     page_size: int = Field(50, ge=1, le=500)
+    count_mode: str = Field("exact", pattern="^(exact|estimated|none)$")  # How total_count is computed
 
 
 class XactimateSearchResponse(BaseModel):
     """Schema for Xactimate search responses"""
     items: List[XactimateItemResponse]
-    total_count: int
+    total_count: Optional[int] = None  # None when count_mode is 'none'
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    has_more: bool = False
+    total_estimated: bool = False
 
 
 class XactimateCategoryStatsResponse(BaseModel):
@@ -212,14 +229,16 @@ class UnifiedSearchRequest(BaseModel):
     company_id: Optional[str] = None
     page: int = Field(1, ge=1)
     page_size: int = Field(50, ge=1, le=500)
+    include_counts: bool = True  # False skips the COUNT query; use has_more to page
 
 
 class UnifiedSearchResponse(BaseModel):
     """Unified search response for both types"""
     items: List[UnifiedLineItemResponse]
-    total_count: int
+    total_count: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
-    xactimate_count: int
-    custom_count: int
\ No newline at end of file
+    total_pages: Optional[int] = None
+    xactimate_count: Optional[int] = None
+    custom_count: Optional[int] = None
+    has_more: bool = False
\ No newline at end of file
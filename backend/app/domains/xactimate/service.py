@@ -2,22 +2,39 @@
 Xactimate domain service
 """
 
-from typing import List, Optional, Tuple, Dict, Any
+from typing import BinaryIO, List, Optional, Tuple, Dict, Any
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from decimal import Decimal
+import logging
 import math
 
 from app.common.base_service import BaseService
+from app.common.utils.bulk_import import (
+    BulkUpserter, ImportReport, IMPORT_CHUNK_SIZE, iter_records, iter_valid_chunks
+)
+from app.domains.line_items.autocomplete import line_item_autocomplete
 from .models import XactimateCategory, XactimateItem, XactimateComponent
 from .repository import XactimateCategoryRepository, XactimateItemRepository, XactimateComponentRepository, XactimateUnifiedRepository
 from .schemas import (
     XactimateCategoryCreate, XactimateCategoryUpdate, XactimateCategoryResponse,
-    XactimateItemCreate, XactimateItemUpdate, XactimateItemResponse,
+    XactimateItemCreate, XactimateItemUpdate, XactimateItemResponse, XactimateItemImportRow,
     XactimateComponentCreate, XactimateComponentUpdate, XactimateComponentResponse,
     XactimateSearchRequest, XactimateSearchResponse,
     UnifiedSearchRequest, UnifiedSearchResponse, UnifiedLineItemResponse
 )
 
+logger = logging.getLogger(__name__)
+
+PRICE_LIST_KEY_COLUMNS = ('item_code', 'price_year', 'price_month')
+PRICE_LIST_COST_COLUMNS = ('labor_cost', 'material_cost', 'equipment_cost', 'labor_burden', 'market_conditions')
+PRICE_LIST_IMPORT_COLUMNS = (
+    'category_code', 'description', *PRICE_LIST_COST_COLUMNS, 'untaxed_unit_price',
+    'life_expectancy_years', 'depreciation_rate', 'max_depreciation',
+    'includes_description', 'excludes_description', 'note_description',
+    'quality_description', 'reference_description', 'has_life_expectancy_data'
+)
+
 
 class XactimateCategoryService(BaseService[XactimateCategory, str]):
     """Service for Xactimate categories"""
@@ -102,6 +119,78 @@ class XactimateItemService(BaseService[XactimateItem, int]):
         item_with_components = self.repository.get_by_id(item_id)
         return XactimateItemResponse.from_orm(item_with_components)
     
+    def import_price_list(self, stream: BinaryIO, fmt: str) -> Dict[str, Any]:
+        """
+        Import a price list from a CSV or JSONL stream.
+
+        Items are upserted by (item_code, price_year, price_month). Rows that
+        carry components replace the item's components; rows without them
+        keep the existing ones. Components are written chunk by chunk, so
+        memory stays bounded by the chunk size. Invalid rows are skipped and
+        reported.
+        """
+        report = ImportReport()
+        category_codes = {code for (code,) in self.db.query(XactimateCategory.category_code)}
+        upserter = BulkUpserter(
+            self.db, XactimateItem,
+            key_columns=PRICE_LIST_KEY_COLUMNS,
+            columns=PRICE_LIST_IMPORT_COLUMNS
+        )
+
+        try:
+            for chunk in iter_valid_chunks(iter_records(stream, fmt), XactimateItemImportRow, report):
+                rows = []
+                components: Dict[Tuple, List[Dict[str, Any]]] = {}
+                for row_number, row in chunk:
+                    if row.category_code not in category_codes:
+                        report.add_error(row_number, [f"category_code: unknown category '{row.category_code}'"])
+                        continue
+                    values = row.dict(exclude={'components'})
+                    if values['untaxed_unit_price'] is None:
+                        values['untaxed_unit_price'] = sum(
+                            (values[column] or Decimal('0') for column in PRICE_LIST_COST_COLUMNS), Decimal('0')
+                        )
+                    rows.append(values)
+                    if row.components is not None:
+                        key = tuple(values[column] for column in PRICE_LIST_KEY_COLUMNS)
+                        components[key] = [component.dict() for component in row.components]
+                upserter.write(rows)
+                if components:
+                    # The items must exist before their components can reference them
+                    upserter.flush()
+                    self._replace_components(upserter.resolve_ids(list(components)), components)
+
+            report.inserted, report.updated = upserter.finish()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        if report.inserted or report.updated:
+            line_item_autocomplete.reset()
+        logger.info(
+            f"Imported price list: {report.inserted} inserted, {report.updated} updated, "
+            f"{report.failed} failed"
+        )
+        return report.to_dict()
+
+    def _replace_components(self, item_ids: Dict[Tuple, int],
+                            components: Dict[Tuple, List[Dict[str, Any]]]) -> None:
+        """Swap the components of imported items in chunked deletes and executemany inserts"""
+        ids = list(item_ids.values())
+        for start in range(0, len(ids), IMPORT_CHUNK_SIZE):
+            self.db.query(XactimateComponent)\
+                .filter(XactimateComponent.item_id.in_(ids[start:start + IMPORT_CHUNK_SIZE]))\
+                .delete(synchronize_session=False)
+
+        rows = [
+            dict(component, item_id=item_ids[key])
+            for key, item_components in components.items() if key in item_ids
+            for component in item_components
+        ]
+        for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+            self.db.execute(insert(XactimateComponent), rows[start:start + IMPORT_CHUNK_SIZE])
+
     def get_by_item_code(self, item_code: str, include_components: bool = True) -> Optional[XactimateItemResponse]:
         """Get item by code with optional components"""
         item = self.repository.get_by_item_code(item_code, include_components)
@@ -116,17 +205,16 @@ class XactimateItemService(BaseService[XactimateItem, int]):
     
     def search(self, search_request: XactimateSearchRequest) -> XactimateSearchResponse:
         """Search items with advanced filters"""
-        items, total_count = self.repository.search(search_request)
-        
-        # Calculate pagination info
-        total_pages = math.ceil(total_count / search_request.page_size)
+        items, page_info = self.repository.search(search_request)
         
         return XactimateSearchResponse(
             items=[XactimateItemResponse.from_orm(item) for item in items],
-            total_count=total_count,
+            total_count=page_info['total'],
             page=search_request.page,
             page_size=search_request.page_size,
-            total_pages=total_pages
+            total_pages=page_info['total_pages'],
+            has_more=page_info['has_more'],
+            total_estimated=page_info['total_estimated']
         )
     
     def get_latest_by_item_codes(self, item_codes: List[str]) -> List[XactimateItemResponse]:
@@ -203,7 +291,8 @@ class XactimateUnifiedService:
             item_type=search_request.item_type,
             company_id=search_request.company_id,
             page=search_request.page,
-            page_size=search_request.page_size
+            page_size=search_request.page_size,
+            include_counts=search_request.include_counts
         )
         
         # Convert to response objects
@@ -212,7 +301,9 @@ class XactimateUnifiedService:
             items.append(UnifiedLineItemResponse(**item_data))
         
         # Calculate pagination
-        total_pages = math.ceil(counts['total_count'] / search_request.page_size)
+        total_pages = None
+        if counts['total_count'] is not None:
+            total_pages = math.ceil(counts['total_count'] / search_request.page_size)
         
         return UnifiedSearchResponse(
             items=items,
@@ -221,5 +312,6 @@ class XactimateUnifiedService:
             page_size=search_request.page_size,
             total_pages=total_pages,
             xactimate_count=counts['xactimate_count'],
-            custom_count=counts['custom_count']
+            custom_count=counts['custom_count'],
+            has_more=counts['has_more']
         )
\ No newline at end of file
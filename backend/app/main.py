@@ -65,6 +65,8 @@ from app.domains.receipt.api import router as receipt_router
 from app.domains.water_mitigation.api import router as water_mitigation_router
 from app.domains.reconstruction_estimate.api import router as reconstruction_estimate_router
 from app.domains.pack_calculation.api import router as pack_calculation_router
+from app.domains.pack_calculation.usage_counter import mapping_usage_counter
+from app.domains.pack_calculation.learned_overlay import learned_overlay
 from app.domains.analytics.api import router as analytics_router
 from app.domains.file.service import initialize_storage
 from app.core.config import settings
@@ -155,6 +157,14 @@ async def lifespan(app: FastAPI):
                 stop_scheduler()
                 logger.info("Integration services stopped")
 
+            # Write buffered usage counts and learned matches before the database goes away
+            flushed = mapping_usage_counter.stop()
+            if flushed:
+                logger.info(f"Flushed usage counts for {flushed} item mappings")
+            compacted = learned_overlay.stop()
+            if compacted:
+                logger.info(f"Compacted {compacted} learned item matches")
+
             db_factory.reset()
             # Services cleanup handled individually
             logger.info("Application shutdown completed")
@@ -0,0 +1,154 @@
+"""
+Line Item Search Benchmark
+
+Measures line item search on a throwaway SQLite database filled with
+synthetic line items: the ILIKE fallback against the FTS5 index (search plus
+exact count for a page of 20), and the cost the index sync triggers add to
+line item updates and deletes.
+
+Usage:
+    python benchmark_line_item_search.py                 # 200,000 items
+    python benchmark_line_item_search.py --items 50000
+    python benchmark_line_item_search.py --terms "dry pat" "DRY1234"
+"""
+
+import sys
+import time
+import uuid
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Callable, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine, select, update, delete
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 - registers every model, so relationships resolve
+from app.common.base_repository import paginate_query
+from app.core.database_factory import Base
+from app.domains.line_items.models import LineItem
+from app.domains.line_items.search import (
+    apply_text_search, ensure_sqlite_search_index, get_search_backend, reset_search_backend_cache
+)
+
+WORDS = (
+    "drywall patch paint ceiling wall floor carpet tile baseboard trim door window insulation "
+    "roof shingle gutter vinyl laminate plank cabinet counter sink faucet toilet pipe drain water "
+    "mitigation dehumidifier fan air mover demolition haul debris texture primer sealer stain"
+).split()
+CATEGORIES = ["DRY", "PNT", "FCC", "WTR", "RFG"]
+
+DEFAULT_TERMS = ["paint ceiling primer", "dry pat", "DRY1234", "dehum"]
+
+
+def fill_line_items(engine, count: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    Base.metadata.create_all(engine, tables=[LineItem.__table__])
+    batch = []
+    with engine.begin() as conn:
+        for i in range(count):
+            batch.append({
+                'id': str(uuid.uuid4()),
+                'type': 'CUSTOM',
+                'cat': rng.choice(CATEGORIES),
+                'item': f"{rng.choice(CATEGORIES)}{i}",
+                'description': " ".join(rng.sample(WORDS, 4)),
+                'includes': " ".join(rng.sample(WORDS, 6)),
+                'is_active': True,
+                'version': 1,
+            })
+            if len(batch) == 10000:
+                conn.execute(LineItem.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(LineItem.__table__.insert(), batch)
+
+
+def timed(fn: Callable, repeat: int) -> float:
+    """Average milliseconds per call after one warm-up call"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def search_page(session: Session, term: str) -> int:
+    query = apply_text_search(session.query(LineItem).filter(LineItem.is_active == True), term)
+    _, page_info = paginate_query(query, 1, 20, "exact")
+    return page_info["total"]
+
+
+def bench_searches(session: Session, terms: List[str], repeat: int) -> dict:
+    return {term: (timed(lambda: search_page(session, term), repeat), search_page(session, term)) for term in terms}
+
+
+def bench_writes(engine, operations: int) -> dict:
+    with engine.connect() as conn:
+        ids = [row[0] for row in conn.execute(select(LineItem.id).limit(operations * 2))]
+    table = LineItem.__table__
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for line_item_id in ids[:operations]:
+            conn.execute(update(table).where(table.c.id == line_item_id).values(description="benchmark update"))
+    updates = (time.perf_counter() - start) / operations * 1000
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for line_item_id in ids[operations:]:
+            conn.execute(delete(table).where(table.c.id == line_item_id))
+    deletes = (time.perf_counter() - start) / operations * 1000
+    return {"update": updates, "delete": deletes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark line item search on SQLite")
+    parser.add_argument('--items', type=int, default=200000, help="Synthetic line items to create")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per search term")
+    parser.add_argument('--writes', type=int, default=500, help="Updates and deletes to time")
+    parser.add_argument('--terms', nargs='+', default=DEFAULT_TERMS, help="Search terms")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/line_items_benchmark.db")
+        print(f"Creating {args.items} line items...")
+        fill_line_items(engine, args.items)
+
+        reset_search_backend_cache()
+        session = Session(engine)
+        print(f"\nBackend: {get_search_backend(engine)}")
+        baseline = bench_searches(session, args.terms, args.repeat)
+        baseline_writes = bench_writes(engine, args.writes)
+
+        start = time.perf_counter()
+        if not ensure_sqlite_search_index(engine):
+            print("[ERROR] Could not create the FTS5 index (SQLite built without FTS5?)")
+            return 1
+        print(f"Built FTS5 index in {time.perf_counter() - start:.1f} s")
+        print(f"Backend: {get_search_backend(engine)}")
+        indexed = bench_searches(session, args.terms, args.repeat)
+        indexed_writes = bench_writes(engine, args.writes)
+        session.close()
+
+        print(f"\nSearch + exact count, page of 20 ({args.items} items):")
+        for term in args.terms:
+            (before, before_total), (after, after_total) = baseline[term], indexed[term]
+            print(f"  {term!r:24} ILIKE {before:8.1f} ms ({before_total} matches)"
+                  f"   FTS5 {after:8.1f} ms ({after_total} matches)")
+
+        print(f"\nWrites with index sync triggers ({args.writes} each, per row):")
+        for operation in ("update", "delete"):
+            print(f"  {operation:7} without index {baseline_writes[operation]:.3f} ms"
+                  f"   with index {indexed_writes[operation]:.3f} ms")
+
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Pack Item Matcher Golden Set Check
+
+Replays a fixed set of item names through IntelligentItemMatcher and reports
+every input whose result differs from the recorded one. Run it after changing
+the matcher; an optimization must leave the golden set unchanged.
+
+The golden set (golden/pack_item_matcher.jsonl) holds:
+- every seed key, random keyword combinations and typo variants matched
+  against ITEM_MAPPINGS, with the similarity candidate, its score and the
+  full match() result
+- the first 1,500 of those inputs matched against a synthetic 1,500-key
+  seed set, which exercises similarity matching beyond the shipped keys
+
+It was recorded with the matcher from before the similarity index was added.
+After an intended behaviour change (including edits to ITEM_MAPPINGS),
+re-record it with --update and review the diff.
+
+Usage:
+    python check_matcher_golden.py             # Compare against the golden set
+    python check_matcher_golden.py --update    # Re-record the current results
+    python check_matcher_golden.py --generate  # Draw new inputs and record them
+"""
+
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.domains.pack_calculation.intelligent_matcher import IntelligentItemMatcher
+from app.domains.pack_calculation.seed_item_mappings import ITEM_MAPPINGS
+
+GOLDEN_PATH = Path(__file__).parent / "golden" / "pack_item_matcher.jsonl"
+
+RANDOM_SEED = 7
+RANDOM_INPUTS = 6000
+SYNTHETIC_KEYS = 1500
+SYNTHETIC_INPUTS = 1500
+
+EXTRA_WORDS = [
+    'antique', 'old', 'kids', 'heavy', 'glass', 'with', 'of', 'the', 'box', 'boxes', 'misc',
+    'stuff', 'grandfather', 'clock', 'treadmill', 'bike', 'umbrella', '',
+]
+
+
+def generate_golden_inputs() -> Dict[str, Any]:
+    """Draw the inputs and the synthetic seed keys (deterministic for RANDOM_SEED)"""
+    rng = random.Random(RANDOM_SEED)
+    vocab = [word for keywords in IntelligentItemMatcher.CATEGORY_KEYWORDS.values()
+             for keyword in keywords for word in keyword.split()]
+    vocab += [word for key in ITEM_MAPPINGS for word in key.split('_')]
+    vocab += EXTRA_WORDS
+
+    def typo(word: str) -> str:
+        if len(word) < 3:
+            return word
+        i = rng.randrange(len(word))
+        op = rng.random()
+        if op < .33:
+            return word[:i] + word[i + 1:]
+        if op < .66:
+            return word[:i] + rng.choice('abcdefghijklmnopqrstuvwxyz') + word[i:]
+        return word[:i] + rng.choice('aeiou') + word[i + 1:]
+
+    inputs = [key.replace('_', ' ') for key in ITEM_MAPPINGS] + ['', 'a', 'x y z']
+    for _ in range(RANDOM_INPUTS):
+        words = [rng.choice(vocab) for _ in range(rng.randint(1, 5))]
+        if rng.random() < .5:
+            words = [typo(word) for word in words]
+        inputs.append(' '.join(words).strip())
+
+    synthetic_keys = list(dict.fromkeys(
+        f"{rng.choice(vocab)}_{rng.choice(vocab)}_{i % 7}" for i in range(SYNTHETIC_KEYS)
+    ))
+    return {"inputs": inputs, "synthetic_keys": synthetic_keys}
+
+
+def record_results(inputs: List[str], synthetic_keys: List[str],
+                   matcher_class=IntelligentItemMatcher) -> Iterator[Dict[str, Any]]:
+    """Golden set records for the given inputs"""
+    yield {"synthetic_keys": synthetic_keys}
+
+    matcher = matcher_class(ITEM_MAPPINGS)
+    for text in inputs:
+        key, score = matcher._similarity_match(text)
+        yield {"seeds": "items", "input": text, "similar": [key, score], "match": matcher.match(text)}
+
+    synthetic = matcher_class({key: {} for key in synthetic_keys})
+    for text in inputs[:SYNTHETIC_INPUTS]:
+        key, score = synthetic._similarity_match(text)
+        yield {"seeds": "synthetic", "input": text, "similar": [key, score]}
+
+
+def load_golden() -> List[Dict[str, Any]]:
+    with GOLDEN_PATH.open(encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_golden(records: Iterator[Dict[str, Any]]) -> int:
+    GOLDEN_PATH.parent.mkdir(exist_ok=True)
+    count = 0
+    with GOLDEN_PATH.open('w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    return count - 1
+
+
+def check_golden(records: List[Dict[str, Any]]) -> int:
+    """Print every record the current matcher disagrees with; returns the count"""
+    header, cases = records[0], records[1:]
+    matchers = {
+        "items": IntelligentItemMatcher(ITEM_MAPPINGS),
+        "synthetic": IntelligentItemMatcher({key: {} for key in header["synthetic_keys"]}),
+    }
+
+    differences = 0
+    for case in cases:
+        matcher = matchers[case["seeds"]]
+        actual = {"similar": list(matcher._similarity_match(case["input"]))}
+        if "match" in case:
+            actual["match"] = matcher.match(case["input"])
+        expected = {name: case[name] for name in actual}
+        if actual != expected:
+            differences += 1
+            print(f"[DIFF] {case['seeds']} {case['input']!r}: expected {expected}, got {actual}")
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the pack item matcher against its golden set")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--update', action='store_true', help="Re-record results for the stored inputs")
+    group.add_argument('--generate', action='store_true', help="Draw new inputs and record their results")
+    args = parser.parse_args()
+
+    if args.generate:
+        generated = generate_golden_inputs()
+        written = write_golden(record_results(generated["inputs"], generated["synthetic_keys"]))
+        print(f"[OK] Recorded {written} golden cases in {GOLDEN_PATH}")
+        return 0
+
+    if not GOLDEN_PATH.exists():
+        print(f"[ERROR] {GOLDEN_PATH} not found; create it with --generate")
+        return 1
+    records = load_golden()
+
+    if args.update:
+        inputs = [case["input"] for case in records[1:] if case["seeds"] == "items"]
+        written = write_golden(record_results(inputs, records[0]["synthetic_keys"]))
+        print(f"[OK] Re-recorded {written} golden cases in {GOLDEN_PATH}")
+        return 0
+
+    differences = check_golden(records)
+    if differences:
+        print(f"[ERROR] {differences} of {len(records) - 1} golden cases differ")
+        return 1
+    print(f"[OK] All {len(records) - 1} golden cases match")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Dashboard Rollup Rebuild Script
+
+Recomputes the per-company, per-day dashboard rollups from invoices, estimates
+and work orders. Run once after deploying the rollups table, and again after
+bulk imports or manual data fixes that bypass the ORM.
+
+Usage:
+    python rebuild_dashboard_rollups.py                                # Rebuild everything
+    python rebuild_dashboard_rollups.py --start 2025-01-01             # From a date onwards
+    python rebuild_dashboard_rollups.py --start 2025-01-01 --end 2025-03-31
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from datetime import date
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.database_factory import get_database
+from app.domains.dashboard.rollup_service import DashboardRollupService
+
+
+def parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild dashboard rollups")
+    parser.add_argument('--start', type=parse_date, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument('--end', type=parse_date, help="Last day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if args.start and args.end and args.start > args.end:
+        parser.error("--start must be on or before --end")
+
+    service = DashboardRollupService(get_database())
+    if not service.enabled:
+        print("[ERROR] Dashboard rollups require a SQLite/PostgreSQL database")
+        return 1
+
+    print(f"Rebuilding dashboard rollups ({args.start or 'beginning'} - {args.end or 'today'})...")
+    written = service.rebuild(args.start, args.end)
+    for metric, rows in written.items():
+        print(f"[OK] {metric}: {rows} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
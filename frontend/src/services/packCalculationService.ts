@@ -302,9 +302,9 @@ export const mlMetricsAPI = {
     return response.data;
   },
 
-  // Trigger ML retraining (Admin)
-  triggerRetraining: async (): Promise<{ message: string; status: string }> => {
-    const response = await api.post(`${API_BASE_URL}/ml/trigger-retraining`);
+  // Compact learned item matches to the database now (Admin)
+  compactLearnedMatches: async (): Promise<{ message: string; status: string }> => {
+    const response = await api.post(`${API_BASE_URL}/ml/compact-learned-matches`);
     return response.data;
   },
 };